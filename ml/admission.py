@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Admission Control
+
+Bounds the work the ML server takes on at once, so a traffic spike sheds
+some requests quickly instead of slowing every request down.
+
+Each admission-controlled endpoint has a priority class. Interactive
+(dashboard) endpoints outrank bulk scoring. A request runs when a slot is
+free in the server-wide pool (max_concurrency) and its endpoint is under
+its own concurrency limit, if it has one. Otherwise it waits in one
+bounded queue, ordered by priority and then arrival. Freed slots go to
+the highest-priority waiter that can run.
+
+Requests are shed with a fast response instead of waiting:
+
+    429  the endpoint is at its limit and already has as many requests
+         waiting as it can run (endpoint_limit)
+    503  the queue is full (queue_full), a higher-priority request took the
+         place of a queued one (evicted), the request waited longer than
+         its class allows (timed_out), or its X-Request-Deadline passed
+         before it could start (deadline_exceeded)
+
+The admitted request's priority rank stays in a context variable
+(current_priority) so the inference executor can start queued interactive
+work ahead of bulk work too.
+
+The controller lives on the event loop: no locks, and acquire/release must
+be called from the loop's thread.
+"""
+
+import json
+import time
+import asyncio
+import itertools
+import contextvars
+from bisect import insort
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from metrics import MetricsRegistry, RouteTemplates, current_timing
+
+# Priority classes, highest first
+PRIORITIES = ('interactive', 'bulk')
+
+# Client deadline, as Unix time in seconds
+DEADLINE_HEADER = b'x-request-deadline'
+
+
+_current_priority: contextvars.ContextVar[int] = contextvars.ContextVar('admission_priority', default=0)
+
+
+def current_priority() -> int:
+    """Priority rank of the request being handled (0, the highest, outside admission control)"""
+    return _current_priority.get()
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted"""
+
+    def __init__(self, status_code: int, outcome: str, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.outcome = outcome
+        self.detail = detail
+
+
+def parse_limits(value: str) -> Dict[str, int]:
+    """Parse an ADMISSION_LIMITS setting ('/score/stream=1,/predict/batch/{model}=4')"""
+    limits = {}
+    for entry in value.split(','):
+        if not entry.strip():
+            continue
+        endpoint, _, limit = entry.rpartition('=')
+        if not endpoint.strip():
+            raise ValueError(f"Invalid admission limit '{entry}', expected <endpoint>=<limit>")
+        limits[endpoint.strip()] = int(limit)
+    return limits
+
+
+class _Waiter:
+    """A queued request; sorts by priority, then arrival"""
+
+    __slots__ = ('rank', 'seq', 'endpoint', 'future')
+
+    def __init__(self, rank: int, seq: int, endpoint: str, future: 'asyncio.Future[Optional[str]]'):
+        self.rank = rank
+        self.seq = seq
+        self.endpoint = endpoint
+        self.future = future
+
+    def __lt__(self, other: '_Waiter') -> bool:
+        return (self.rank, self.seq) < (other.rank, other.seq)
+
+
+class AdmissionController:
+    """Server-wide slot pool, per-endpoint limits and a bounded priority wait queue"""
+
+    def __init__(self, max_concurrency: int, max_queue: int, endpoint_limits: Dict[str, int],
+                 max_wait: Dict[str, float], retry_after: int = 1):
+        unknown = [p for p in max_wait if p not in PRIORITIES]
+        if unknown:
+            raise ValueError(f"Unknown priority classes {unknown}, expected {PRIORITIES}")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.endpoint_limits = {endpoint: limit for endpoint, limit in endpoint_limits.items() if limit > 0}
+        self.max_wait = max_wait
+        self.retry_after = retry_after
+
+        self.in_flight = 0
+        self.endpoint_in_flight: Dict[str, int] = {}
+        self._waiting: List[_Waiter] = []
+        self._endpoint_waiting: Dict[str, int] = {}
+        self._seq = itertools.count()
+        # (priority, outcome) -> requests
+        self.decisions: Dict[Tuple[str, str], int] = {}
+
+    def _runnable(self, endpoint: str) -> bool:
+        if self.in_flight >= self.max_concurrency:
+            return False
+        limit = self.endpoint_limits.get(endpoint)
+        return limit is None or self.endpoint_in_flight.get(endpoint, 0) < limit
+
+    def _start(self, endpoint: str) -> None:
+        self.in_flight += 1
+        self.endpoint_in_flight[endpoint] = self.endpoint_in_flight.get(endpoint, 0) + 1
+
+    def _dequeue(self, waiter: _Waiter) -> None:
+        self._waiting.remove(waiter)
+        self._endpoint_waiting[waiter.endpoint] -= 1
+
+    def _record(self, priority: str, outcome: str) -> None:
+        self.decisions[(priority, outcome)] = self.decisions.get((priority, outcome), 0) + 1
+
+    def _reject(self, priority: str, status_code: int, outcome: str, detail: str) -> AdmissionRejected:
+        self._record(priority, outcome)
+        return AdmissionRejected(status_code, outcome, detail)
+
+    async def acquire(self, endpoint: str, priority: str, deadline: Optional[float] = None) -> None:
+        """Wait for a slot for one request; raises AdmissionRejected if the request is shed"""
+
+        if deadline is not None and deadline <= time.time():
+            raise self._reject(priority, 503, 'deadline_exceeded', "Request deadline has already passed")
+
+        # Nothing queued can use a free slot (release() hands slots out as
+        # they free up), so a runnable request never overtakes a waiter
+        if self._runnable(endpoint):
+            self._start(endpoint)
+            self._record(priority, 'admitted')
+            return
+
+        limit = self.endpoint_limits.get(endpoint)
+        if limit is not None and self.endpoint_in_flight.get(endpoint, 0) >= limit \
+                and self._endpoint_waiting.get(endpoint, 0) >= limit:
+            raise self._reject(priority, 429, 'endpoint_limit', f"Too many concurrent requests to {endpoint}")
+
+        rank = PRIORITIES.index(priority)
+        if len(self._waiting) >= self.max_queue:
+            worst = self._waiting[-1] if self._waiting else None
+            if worst is None or worst.rank <= rank:
+                raise self._reject(priority, 503, 'queue_full', "Server is at capacity, retry later")
+            # Make room by shedding the newest request of the lowest class
+            self._dequeue(worst)
+            worst.future.set_result('evicted')
+
+        waiter = _Waiter(rank, next(self._seq), endpoint, asyncio.get_running_loop().create_future())
+        insort(self._waiting, waiter)
+        self._endpoint_waiting[endpoint] = self._endpoint_waiting.get(endpoint, 0) + 1
+
+        timeout = self.max_wait.get(priority, 0.0)
+        deadline_bound = deadline is not None and deadline - time.time() < timeout
+        if deadline_bound:
+            timeout = max(0.0, deadline - time.time())
+        try:
+            outcome = await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except asyncio.TimeoutError:
+            if not waiter.future.done():
+                self._dequeue(waiter)
+                if deadline_bound:
+                    raise self._reject(priority, 503, 'deadline_exceeded', "Request deadline passed while queued")
+                raise self._reject(priority, 503, 'timed_out', "Server is at capacity, retry later")
+            outcome = waiter.future.result()
+        except asyncio.CancelledError:
+            # Client went away: give back a slot granted meanwhile, else leave the queue
+            if waiter.future.done():
+                if waiter.future.result() is None:
+                    self.release(endpoint)
+            else:
+                self._dequeue(waiter)
+            raise
+
+        if outcome == 'evicted':
+            raise self._reject(priority, 503, 'evicted', "Server is at capacity, retry later")
+        self._record(priority, 'admitted')
+
+    def release(self, endpoint: str) -> None:
+        """Free a request's slot and hand free slots to the highest-priority waiters that can run"""
+        self.in_flight -= 1
+        self.endpoint_in_flight[endpoint] -= 1
+        for waiter in list(self._waiting):
+            if self.in_flight >= self.max_concurrency:
+                break
+            if self._runnable(waiter.endpoint):
+                self._dequeue(waiter)
+                self._start(waiter.endpoint)
+                waiter.future.set_result(None)
+
+    def waiting(self) -> Dict[str, int]:
+        """Queued requests per priority class"""
+        counts = {priority: 0 for priority in PRIORITIES}
+        for waiter in self._waiting:
+            counts[PRIORITIES[waiter.rank]] += 1
+        return counts
+
+    def stats(self) -> Dict[str, Any]:
+        """Slot, queue and decision counters for /health"""
+        decisions: Dict[str, Dict[str, int]] = {}
+        for (priority, outcome), count in sorted(self.decisions.items()):
+            decisions.setdefault(priority, {})[outcome] = count
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "endpoint_in_flight": {e: n for e, n in self.endpoint_in_flight.items() if n},
+            "waiting": self.waiting(),
+            "decisions": decisions
+        }
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying an AdmissionController to the endpoints listed
+    in `priorities` (route template -> priority class). Shed requests get a
+    JSON error and Retry-After before their body is read.
+    """
+
+    def __init__(self, app: Any, controller: AdmissionController, priorities: Dict[str, str],
+                 registry: MetricsRegistry):
+        unknown = sorted({p for p in priorities.values() if p not in PRIORITIES})
+        if unknown:
+            raise ValueError(f"Unknown priority classes {unknown}, expected {PRIORITIES}")
+        self.app = app
+        self.controller = controller
+        self.priorities = priorities
+        self._endpoint = RouteTemplates()
+        self.decisions = registry.counter(
+            'fundn3xus_admission_decisions_total', 'Admission decisions by endpoint, priority and outcome',
+            ['endpoint', 'priority', 'outcome'])
+        self.wait = registry.histogram(
+            'fundn3xus_admission_wait_seconds', 'Time admitted requests waited for a slot', ['priority'])
+        self.in_flight = registry.gauge(
+            'fundn3xus_admission_in_flight', 'Admitted requests running, by endpoint', ['endpoint'])
+        self.waiting = registry.gauge(
+            'fundn3xus_admission_waiting', 'Requests waiting for a slot, by priority', ['priority'])
+        registry.add_collector(self._collect)
+
+    def _collect(self) -> None:
+        for endpoint in self.priorities:
+            self.in_flight.set(endpoint, value=self.controller.endpoint_in_flight.get(endpoint, 0))
+        for priority, count in self.controller.waiting().items():
+            self.waiting.set(priority, value=count)
+
+    async def _send_rejection(self, send: Callable[..., Any], error: AdmissionRejected) -> None:
+        body = json.dumps({"detail": error.detail}).encode()
+        headers = [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]
+        if error.status_code in (429, 503):
+            headers.append((b'retry-after', str(self.controller.retry_after).encode()))
+        await send({'type': 'http.response.start', 'status': error.status_code, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        endpoint = self._endpoint(scope)
+        priority = self.priorities.get(endpoint)
+        if priority is None:
+            await self.app(scope, receive, send)
+            return
+
+        deadline = None
+        for name, value in scope['headers']:
+            if name == DEADLINE_HEADER:
+                try:
+                    deadline = float(value)
+                except ValueError:
+                    await self._send_rejection(send, AdmissionRejected(
+                        400, 'invalid', "X-Request-Deadline must be a Unix time in seconds"))
+                    return
+
+        start = time.perf_counter()
+        try:
+            await self.controller.acquire(endpoint, priority, deadline)
+        except AdmissionRejected as e:
+            self.decisions.inc(endpoint, priority, e.outcome)
+            await self._send_rejection(send, e)
+            return
+        self.decisions.inc(endpoint, priority, 'admitted')
+        self.wait.observe(priority, value=time.perf_counter() - start)
+        current_timing().mark('admission')
+
+        token = _current_priority.set(PRIORITIES.index(priority))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_priority.reset(token)
+            self.controller.release(endpoint)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Loan Affordability Grid
+
+The largest loan a profile can carry, and what it costs, for every
+combination of annual interest rate, term and down-payment fraction,
+computed as one rates x terms x down-payment-fractions array per output.
+Each cell's principal is the smallest of three limits:
+
+    payment        what the monthly payment budget repays over the term:
+                   expenses plus the payment may take at most
+                   max_expense_ratio of monthly income
+    affordability  the purchase price may not exceed the affordability
+                   model's predicted amount
+    savings        the down payment has to come out of savings
+
+The index of the limit that binds is returned per cell, so a client can
+tell "a longer term would help" from "more savings would help".
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+# Order of the limits in the binding matrix
+GRID_CONSTRAINTS = ('payment', 'affordability', 'savings')
+
+# Grid used when a request doesn't give its own: the rates lenders
+# currently offer and the terms the affordability page lets users pick
+DEFAULT_RATES = (0.06, 0.07, 0.08, 0.09, 0.10, 0.11, 0.12, 0.13, 0.14)
+DEFAULT_TERMS = (12, 24, 36, 48, 60, 84, 120, 180, 240, 360)
+DEFAULT_DOWN_PAYMENT_FRACTIONS = (0.0, 0.1, 0.2, 0.3)
+
+# Expenses plus the loan payment may take this share of monthly income,
+# leaving the rest for taxes and saving
+DEFAULT_MAX_EXPENSE_RATIO = 0.7
+
+
+class LoanGridError(ValueError):
+    """Raised for grids that can't be built (out-of-range rates, terms or fractions, too many cells)"""
+
+
+def annuity_factors(annual_rates: np.ndarray, terms: np.ndarray) -> np.ndarray:
+    """
+    Principal repaid by a payment of 1 per month (rates x terms), i.e. the
+    present value of an annuity: (1 - (1 + i)^-n) / i at monthly rate i, n
+    at a zero rate.
+    """
+    monthly = np.asarray(annual_rates, dtype=np.float64)[:, None] / 12
+    months = np.asarray(terms, dtype=np.float64)[None, :]
+    # log1p/expm1 stay accurate at the small monthly rates of cheap loans
+    safe = np.where(monthly > 0, monthly, 1.0)
+    return np.where(monthly > 0, -np.expm1(-months * np.log1p(safe)) / safe, months)
+
+
+def payment_budget(monthly_income: float, monthly_expenses: float, max_expense_ratio: float) -> float:
+    """Monthly payment the profile can take on: income headroom under max_expense_ratio after expenses"""
+    return max(0.0, monthly_income * max_expense_ratio - monthly_expenses)
+
+
+def validate_grid(rates: List[float], terms: List[int], down_payment_fractions: List[float], max_cells: int) -> None:
+    if any(not 0 <= rate <= 1 for rate in rates):
+        raise LoanGridError("Rates are annual fractions between 0 and 1, e.g. 0.085 for 8.5%")
+    if any(not 1 <= term <= 600 for term in terms):
+        raise LoanGridError("Terms are in months, between 1 and 600")
+    if any(not 0 <= fraction < 1 for fraction in down_payment_fractions):
+        raise LoanGridError("Down-payment fractions must be at least 0 and below 1")
+    n_cells = len(rates) * len(terms) * len(down_payment_fractions)
+    if n_cells > max_cells:
+        raise LoanGridError(f"Grid has {n_cells} cells; the limit is {max_cells}")
+
+
+def affordability_grid(affordability_amount: float, budget: float, savings: float, rates: List[float],
+                       terms: List[int], down_payment_fractions: List[float]) -> Dict[str, np.ndarray]:
+    """
+    rates x terms x down-payment-fractions arrays: max_principal,
+    monthly_payment, max_price, down_payment, total_interest, and binding
+    (index into GRID_CONSTRAINTS).
+    """
+    factors = annuity_factors(np.asarray(rates), np.asarray(terms))[:, :, None]
+    fractions = np.asarray(down_payment_fractions, dtype=np.float64)[None, None, :]
+    financed = 1 - fractions
+
+    with np.errstate(divide='ignore'):
+        savings_limit = np.where(fractions > 0, savings * financed / fractions, np.inf)
+    limits = np.stack(np.broadcast_arrays(
+        budget * factors,
+        max(affordability_amount, 0.0) * financed,
+        savings_limit
+    ))
+    binding = np.argmin(limits, axis=0)
+    principal = np.take_along_axis(limits, binding[None], axis=0)[0]
+
+    payment = principal / factors
+    price = principal / financed
+    months = np.asarray(terms, dtype=np.float64)[None, :, None]
+    return {
+        "max_principal": principal,
+        "monthly_payment": payment,
+        "max_price": price,
+        "down_payment": price - principal,
+        "total_interest": payment * months - principal,
+        "binding": binding
+    }
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Admission control benchmark: interactive latency under a bulk flood
+
+Starts server.py twice, with ADMISSION_ENABLED=false and =true, and runs
+the same mixed load against each for --seconds:
+
+- bulk clients posting 10,000-profile columnar batches back to back
+- interactive clients calling /predict/scenario back to back
+
+Reports per-class throughput, p50/p95/p99 latency of successful requests
+and status counts. Without admission control every request is accepted
+and interactive latency grows with the bulk backlog. With it, bulk
+requests beyond ADMISSION_BULK_LIMIT are shed with 429, so interactive
+calls keep their latency.
+
+Other server settings come from the environment, e.g.:
+    ADMISSION_BULK_LIMIT=1 python bench/bench_admission.py
+
+Usage: python bench/bench_admission.py [--bulk-clients 8] [--interactive-clients 8] [--seconds 20]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from typing import Any, Dict, List
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_concurrency import free_port, load_payloads, percentiles, start_server, wait_ready
+
+INTERACTIVE_ENDPOINT = '/predict/scenario'
+BULK_ENDPOINT = '/predict/columnar/financial-health'
+
+
+async def run_mix(url: str, args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    payloads = load_payloads(args.bulk_rows, seed=42)
+    # Encoded once, so the client's own CPU goes to sending requests
+    batch = json.dumps({field: [p[field] for p in payloads] for field in payloads[0]}).encode()
+    results = {cls: {"latencies": [], "statuses": {}} for cls in ('interactive', 'bulk')}
+    stop = time.perf_counter() + args.seconds
+
+    clients = args.bulk_clients + args.interactive_clients
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=120) as client:
+
+        async def worker(cls: str, client_id: int) -> None:
+            i = 0
+            while time.perf_counter() < stop:
+                if cls == 'bulk':
+                    request = client.post(BULK_ENDPOINT, content=batch, headers={'content-type': 'application/json'})
+                else:
+                    request = client.post(INTERACTIVE_ENDPOINT, json=payloads[(client_id * 997 + i) % len(payloads)])
+                start = time.perf_counter()
+                try:
+                    response = await request
+                    status = response.status_code
+                except httpx.TransportError:
+                    status = 0
+                statuses = results[cls]["statuses"]
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == 200:
+                    results[cls]["latencies"].append(time.perf_counter() - start)
+                elif status in (429, 503):
+                    # Shed: back off as a well-behaved client would
+                    await asyncio.sleep(float(response.headers.get('retry-after', 1)) / 10)
+                i += 1
+
+        await asyncio.gather(
+            *(worker('bulk', c) for c in range(args.bulk_clients)),
+            *(worker('interactive', c) for c in range(args.interactive_clients))
+        )
+    return results
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    print(f"{args.bulk_clients} bulk clients ({args.bulk_rows} profiles each), "
+          f"{args.interactive_clients} interactive clients, {args.seconds}s per run")
+    print(f"{'admission':>9} {'class':<12} {'ok/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  statuses")
+    for enabled in ('false', 'true'):
+        port = free_port()
+        url = f"http://127.0.0.1:{port}"
+        server = start_server(port, {'ADMISSION_ENABLED': enabled, 'PREDICTION_CACHE_ENABLED': 'false'})
+        try:
+            await wait_ready(url)
+            results = await run_mix(url, args)
+        finally:
+            server.terminate()
+            server.wait()
+        for cls, result in results.items():
+            latency = percentiles(result["latencies"])
+            statuses = {str(k): v for k, v in sorted(result["statuses"].items())}
+            print(f"{enabled:>9} {cls:<12} {len(result['latencies']) / args.seconds:>8.1f} {latency['p50']!s:>9} "
+                  f"{latency['p95']!s:>9} {latency['p99']!s:>9}  {statuses}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Interactive latency under bulk load, admission control off vs on")
+    parser.add_argument('--bulk-clients', type=int, default=8)
+    parser.add_argument('--bulk-rows', type=int, default=10000, help="Profiles per bulk request")
+    parser.add_argument('--interactive-clients', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=20)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Loan affordability grid benchmark: vectorized vs one cell at a time
+
+Times amortization.affordability_grid() against a loop that computes each
+rate x term x down-payment cell with the textbook EMI formula, the way
+the affordability page did for its one selected term. Both must agree
+before timings are reported. Grid sizes are the default grid (9 rates x
+10 terms x 4 down payments) and larger ones with more rates.
+
+Usage: python bench/bench_affordability_grid.py [--rates 9,50,250] [--repeats 20]
+"""
+
+import os
+import sys
+import time
+import argparse
+from typing import Callable, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_concurrency import ML_DIR
+
+sys.path.insert(0, ML_DIR)
+from amortization import DEFAULT_DOWN_PAYMENT_FRACTIONS, DEFAULT_TERMS, affordability_grid
+
+AMOUNT = 250000.0
+BUDGET = 1750.0
+SAVINGS = 25000.0
+
+
+def per_cell(rates: List[float], terms: List[int], fractions: List[float]) -> np.ndarray:
+    """Max principal per cell, one EMI-style computation at a time"""
+    principal = np.empty((len(rates), len(terms), len(fractions)))
+    for i, rate in enumerate(rates):
+        monthly = rate / 12
+        for j, term in enumerate(terms):
+            factor = (1 - (1 + monthly) ** -term) / monthly if monthly > 0 else term
+            for k, fraction in enumerate(fractions):
+                limits = [BUDGET * factor, AMOUNT * (1 - fraction)]
+                if fraction > 0:
+                    limits.append(SAVINGS * (1 - fraction) / fraction)
+                principal[i, j, k] = min(limits)
+    return principal
+
+
+def best_ms(fn: Callable[[], object], repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized affordability grid vs per-cell loop")
+    parser.add_argument('--rates', default='9,50,250', help="Comma-separated numbers of rates (0-15%)")
+    parser.add_argument('--repeats', type=int, default=20, help="Best of this many runs")
+    args = parser.parse_args()
+
+    terms = list(DEFAULT_TERMS)
+    fractions = list(DEFAULT_DOWN_PAYMENT_FRACTIONS)
+    print(f"{'cells':>7} {'vectorized ms':>14} {'per-cell ms':>12} {'speedup':>8}")
+    for n_rates in (int(n) for n in args.rates.split(',')):
+        rates = np.linspace(0, 0.15, n_rates).tolist()
+        grid: Dict[str, np.ndarray] = affordability_grid(AMOUNT, BUDGET, SAVINGS, rates, terms, fractions)
+        if not np.allclose(grid["max_principal"], per_cell(rates, terms, fractions)):
+            raise RuntimeError("Vectorized grid differs from the per-cell computation")
+        vectorized = best_ms(lambda: affordability_grid(AMOUNT, BUDGET, SAVINGS, rates, terms, fractions), args.repeats)
+        looped = best_ms(lambda: per_cell(rates, terms, fractions), args.repeats)
+        cells = n_rates * len(terms) * len(fractions)
+        print(f"{cells:>7} {vectorized:>14.3f} {looped:>12.3f} {looped / vectorized:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
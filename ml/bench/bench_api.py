@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Load-test suite for the ML prediction API
+
+Drives every /predict/* endpoint at each concurrency level (and each batch
+size for /predict/batch/{model}) and records throughput and latency
+percentiles. Two transports:
+
+- asgi: the FastAPI app in this process through httpx's ASGI transport.
+  No sockets or HTTP parsing, so it isolates the app's own cost (client
+  and server share one event loop).
+- http: a real uvicorn server on a free local port (or --url), so the
+  numbers include the network stack and HTTP parsing.
+
+Profiles are a seeded sample of dataset.csv, so two runs with the same
+arguments send the same requests in the same order. The prediction cache
+is disabled unless --cache is given, so every request runs the models.
+
+Results are written as JSON (--output) together with the git commit,
+machine and library versions. --compare checks a run against a saved
+baseline and exits 1 when p99 latency or throughput regressed by more
+than --threshold:
+
+    python bench/bench_api.py --output baseline.json
+    ... change code ...
+    python bench/bench_api.py --output candidate.json --compare baseline.json
+
+Usage: python bench/bench_api.py [--transports asgi,http] [--concurrency 1,16,64]
+                                 [--batch-sizes 16,256] [--requests 300] [--output results.json]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_concurrency import ML_DIR, free_port, load_payloads, start_server, wait_ready
+
+SINGLE_ENDPOINTS = [
+    '/predict/investment-risk',
+    '/predict/affordability',
+    '/predict/financial-health',
+    '/predict/scenario',
+    '/predict/all'
+]
+BATCH_ENDPOINTS = ['/predict/batch/financial-health']
+
+# Scenario identity when comparing runs
+ScenarioKey = Tuple[str, str, int, int]
+
+
+def server_env(args: argparse.Namespace) -> Dict[str, str]:
+    """Server settings for a benchmark run (applied to both transports)"""
+    return {
+        'LOG_LEVEL': 'warning',
+        'DEVELOPMENT_MODE': 'false',
+        'PREDICTION_CACHE_ENABLED': 'true' if args.cache else 'false',
+        'FAST_RESPONSES': 'true' if args.fast_responses else 'false'
+    }
+
+
+def latency_summary(samples: List[float]) -> Dict[str, Optional[float]]:
+    if not samples:
+        return {"mean": None, "p50": None, "p95": None, "p99": None, "max": None}
+    ms = np.array(samples) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "mean": round(float(ms.mean()), 3),
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+        "max": round(float(ms.max()), 3)
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, endpoint: str, payloads: List[Dict[str, Any]],
+                       concurrency: int, batch_size: int, requests: int, warmup: int) -> Dict[str, Any]:
+    """
+    Closed loop: `concurrency` clients send back-to-back requests until
+    `requests` have been sent. Request i always carries the same profiles.
+    """
+
+    def body(i: int) -> Any:
+        if batch_size == 1:
+            return payloads[i % len(payloads)]
+        start = (i * batch_size) % len(payloads)
+        return [payloads[(start + j) % len(payloads)] for j in range(batch_size)]
+
+    for i in range(warmup):
+        await client.post(endpoint, json=body(i))
+
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    next_request = 0
+
+    async def worker() -> None:
+        nonlocal next_request
+        while next_request < requests:
+            i = next_request
+            next_request += 1
+            start = time.perf_counter()
+            try:
+                status = (await client.post(endpoint, json=body(i))).status_code
+            except httpx.TransportError:
+                status = 0
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "batch_size": batch_size,
+        "requests": requests,
+        "ok": len(latencies),
+        "errors": requests - len(latencies),
+        "status_counts": {str(k): v for k, v in sorted(statuses.items())},
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "profiles_per_s": round(len(latencies) * batch_size / elapsed, 1),
+        "latency_ms": latency_summary(latencies)
+    }
+
+
+def scenarios(args: argparse.Namespace) -> List[Tuple[str, int, int, int]]:
+    """(endpoint, concurrency, batch size, request count) for every run"""
+    runs = []
+    for concurrency in args.concurrency:
+        for endpoint in args.endpoints:
+            if endpoint.startswith('/predict/batch/'):
+                for batch_size in args.batch_sizes:
+                    runs.append((endpoint, concurrency, batch_size, args.batch_requests))
+            else:
+                runs.append((endpoint, concurrency, 1, args.requests))
+    return runs
+
+
+async def run_suite(transport: str, client: httpx.AsyncClient, payloads: List[Dict[str, Any]],
+                    args: argparse.Namespace) -> List[Dict[str, Any]]:
+    results = []
+    for endpoint, concurrency, batch_size, requests in scenarios(args):
+        result = await run_scenario(client, endpoint, payloads, concurrency, batch_size, requests, args.warmup)
+        result = {"transport": transport, **result}
+        results.append(result)
+        lat = result['latency_ms']
+        print(f"{transport:>5} {endpoint:<34} {concurrency:>5} {batch_size:>6} {result['throughput_rps']:>9} "
+              f"{lat['p50']!s:>9} {lat['p95']!s:>9} {lat['p99']!s:>9}  {result['status_counts']}")
+    return results
+
+
+async def run_asgi(payloads: List[Dict[str, Any]], args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Benchmark the app in this process"""
+    os.environ.update(server_env(args))
+    os.chdir(ML_DIR)
+    sys.path.insert(0, ML_DIR)
+    import server
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    # lifespan_context runs the startup handlers (model loading, executor)
+    async with server.app.router.lifespan_context(server.app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app),
+                                     base_url='http://bench', limits=limits, timeout=120) as client:
+            return await run_suite('asgi', client, payloads, args)
+
+
+async def run_http(payloads: List[Dict[str, Any]], args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Benchmark a uvicorn server over real HTTP"""
+    server = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        url = f"http://127.0.0.1:{port}"
+        server = start_server(port, server_env(args))
+
+    try:
+        await wait_ready(url)
+        limits = httpx.Limits(max_connections=max(args.concurrency) + 1,
+                              max_keepalive_connections=max(args.concurrency) + 1)
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=120) as client:
+            return await run_suite('http', client, payloads, args)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ML_DIR, capture_output=True, text=True, timeout=10)
+        commit = out.stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--', '.'], cwd=ML_DIR,
+                               capture_output=True, text=True, timeout=30).stdout.strip()
+        return f"{commit}{'-dirty' if dirty else ''}" if commit else None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_metadata(args: argparse.Namespace) -> Dict[str, Any]:
+    """What is needed to tell whether two result files are comparable"""
+    import fastapi
+    import xgboost
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "versions": {"fastapi": fastapi.__version__, "xgboost": xgboost.__version__, "numpy": np.__version__},
+        "server_env": server_env(args) if args.url is None else None,
+        "target_url": args.url,
+        "arguments": {
+            "transports": args.transports,
+            "endpoints": args.endpoints,
+            "concurrency": args.concurrency,
+            "batch_sizes": args.batch_sizes,
+            "requests": args.requests,
+            "batch_requests": args.batch_requests,
+            "warmup": args.warmup,
+            "profiles": args.profiles,
+            "seed": args.seed,
+            "cache": args.cache,
+            "fast_responses": args.fast_responses
+        }
+    }
+
+
+def scenario_key(result: Dict[str, Any]) -> ScenarioKey:
+    return (result['transport'], result['endpoint'], result['concurrency'], result['batch_size'])
+
+
+def compare(baseline: Dict[str, Any], candidate: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Regressions of candidate against baseline: p99 latency up or throughput
+    down by more than threshold (a fraction) on any scenario both ran.
+    """
+
+    previous = {scenario_key(r): r for r in baseline['results']}
+    regressions = []
+    print(f"\n{'scenario':<58} {'rps':>17} {'p99 ms':>19}")
+    for result in candidate['results']:
+        key = scenario_key(result)
+        base = previous.get(key)
+        if base is None or not base['ok'] or not result['ok']:
+            continue
+
+        rps_change = result['throughput_rps'] / base['throughput_rps'] - 1
+        p99_change = result['latency_ms']['p99'] / base['latency_ms']['p99'] - 1
+        flags = []
+        if rps_change < -threshold:
+            flags.append(f"throughput {rps_change:+.0%}")
+        if p99_change > threshold:
+            flags.append(f"p99 {p99_change:+.0%}")
+
+        label = f"{key[0]} {key[1]} c={key[2]} b={key[3]}"
+        print(f"{label:<58} {base['throughput_rps']:>7} -> {result['throughput_rps']:<7} "
+              f"{base['latency_ms']['p99']:>8} -> {result['latency_ms']['p99']:<8} {'REGRESSION' if flags else ''}")
+        if flags:
+            regressions.append(f"{label}: {', '.join(flags)}")
+    return regressions
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    payloads = load_payloads(args.profiles, seed=args.seed)
+    report = {"meta": run_metadata(args), "results": []}
+
+    print(f"{os.cpu_count()} CPU cores, {len(payloads)} profiles (seed {args.seed}), "
+          f"prediction cache {'on' if args.cache else 'off'}, fast responses {'on' if args.fast_responses else 'off'}")
+    print(f"{'':>5} {'endpoint':<34} {'conc':>5} {'batch':>6} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  statuses")
+    for transport in args.transports:
+        runner = run_asgi if transport == 'asgi' else run_http
+        report['results'].extend(await runner(payloads, args))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ML API load-test suite")
+    parser.add_argument('--transports', default='asgi,http', help="Comma-separated: asgi, http")
+    parser.add_argument('--url', help="Target an already running server for the http transport")
+    parser.add_argument('--endpoints', default=','.join(SINGLE_ENDPOINTS + BATCH_ENDPOINTS),
+                        help="Comma-separated endpoints to drive")
+    parser.add_argument('--concurrency', default='1,16,64', help="Comma-separated concurrency levels")
+    parser.add_argument('--batch-sizes', default='16,256', help="Profiles per request for batch endpoints")
+    parser.add_argument('--requests', type=int, default=300, help="Requests per single-profile scenario")
+    parser.add_argument('--batch-requests', type=int, default=50, help="Requests per batch scenario")
+    parser.add_argument('--warmup', type=int, default=10, help="Unmeasured requests before each scenario")
+    parser.add_argument('--profiles', type=int, default=2000, help="Profiles sampled from dataset.csv")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--cache', action='store_true', help="Leave the prediction cache on")
+    parser.add_argument('--fast-responses', action='store_true', help="Run the server with FAST_RESPONSES=true")
+    parser.add_argument('--output', help="Write results as JSON")
+    parser.add_argument('--compare', help="Baseline results JSON to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Allowed relative p99 increase / throughput drop for --compare")
+    args = parser.parse_args()
+
+    args.transports = [t for t in args.transports.split(',') if t]
+    unknown = set(args.transports) - {'asgi', 'http'}
+    if unknown:
+        parser.error(f"Unknown transports: {', '.join(sorted(unknown))}")
+    args.endpoints = [e for e in args.endpoints.split(',') if e]
+    args.concurrency = [int(c) for c in args.concurrency.split(',')]
+    args.batch_sizes = [int(b) for b in args.batch_sizes.split(',')]
+    # The asgi transport changes into ML_DIR to import the server
+    args.output = os.path.abspath(args.output) if args.output else None
+    args.compare = os.path.abspath(args.compare) if args.compare else None
+
+    report = asyncio.run(main_async(args))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions above {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
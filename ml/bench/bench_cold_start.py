@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: joblib vs native model registry
+
+Each measurement runs in a fresh Python process, loads the models and
+reports load time and resident memory added by the models (RSS after
+loading minus RSS after importing the libraries). Cases:
+
+- joblib: unpickle all four legacy .pkl files
+- native: load all four models from the UBJSON registry
+- native (lazy, 1 model): what a worker serving a single model pays
+
+If MODELS_DIR has no manifest yet, the legacy models are exported to a
+temporary registry first.
+
+Usage: python bench/bench_cold_start.py [--runs 5]
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+import statistics
+
+ML_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ML_DIR)
+
+# Runs inside the child process; prints one JSON line
+CHILD_SCRIPT = r'''
+import os, sys, time, json, warnings
+warnings.filterwarnings('ignore')
+sys.path.insert(0, {ml_dir!r})
+
+def rss_mb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+import joblib, xgboost, sklearn
+import model_registry
+base_rss = rss_mb()
+start = time.perf_counter()
+
+mode, models_dir, only = {mode!r}, {models_dir!r}, {only!r}
+if mode == 'joblib':
+    for name, filename in model_registry.LEGACY_MODEL_FILES.items():
+        if not only or name == only:
+            joblib.load(os.path.join(models_dir, filename))
+else:
+    store = model_registry.open_registry(models_dir)
+    if only:
+        store[only]
+    else:
+        store.load_all()
+
+print(json.dumps({{"seconds": time.perf_counter() - start, "rss_mb": rss_mb() - base_rss}}))
+'''
+
+
+def measure(mode: str, models_dir: str, only: str, runs: int) -> dict:
+    seconds, rss = [], []
+    for _ in range(runs):
+        script = CHILD_SCRIPT.format(ml_dir=ML_DIR, mode=mode, models_dir=models_dir, only=only)
+        out = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        seconds.append(result['seconds'])
+        rss.append(result['rss_mb'])
+    return {"load_ms": statistics.median(seconds) * 1000, "rss_mb": statistics.median(rss)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model cold-start benchmark")
+    parser.add_argument('--models-dir', default=os.getenv('MODELS_DIR', os.path.join(ML_DIR, 'models')))
+    parser.add_argument('--runs', type=int, default=5, help="Fresh processes per case (median reported)")
+    args = parser.parse_args()
+
+    import model_registry
+
+    legacy_dir = args.models_dir
+    native_dir = args.models_dir
+    tmp = None
+    if model_registry.read_manifest(native_dir) is None:
+        import joblib
+        import warnings
+        warnings.filterwarnings('ignore')
+        tmp = tempfile.TemporaryDirectory()
+        native_dir = tmp.name
+        trained = {
+            name: joblib.load(os.path.join(legacy_dir, filename))
+            for name, filename in model_registry.LEGACY_MODEL_FILES.items()
+        }
+        model_registry.export_models(trained, native_dir)
+        print(f"(exported legacy models to temporary registry {native_dir})")
+
+    cases = [
+        ("joblib (4 models)", 'joblib', legacy_dir, ''),
+        ("native (4 models)", 'native', native_dir, ''),
+        ("joblib (1 model)", 'joblib', legacy_dir, 'health_score'),
+        ("native lazy (1 model)", 'native', native_dir, 'health_score'),
+    ]
+    print(f"{'case':<24} {'load (ms)':>10} {'model RSS (MB)':>15}")
+    for label, mode, models_dir, only in cases:
+        result = measure(mode, models_dir, only, args.runs)
+        print(f"{label:<24} {result['load_ms']:>10.1f} {result['rss_mb']:>15.1f}")
+
+    if tmp is not None:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Batch input format benchmark: rows vs columnar JSON vs Arrow IPC
+
+Scores the same profiles (sampled from dataset.csv) through
+/predict/batch/{model} (a JSON list of objects) and /predict/columnar/{model}
+(columnar JSON, and Arrow IPC in and out when pyarrow is installed), calling
+the ASGI app directly. Reports the median server latency and the share spent
+outside the models, taken from the Server-Timing header. Row batches above
+MAX_BATCH_SIZE are skipped.
+
+Usage: python bench/bench_columnar.py [--sizes 1000,10000,100000] [--model financial-health] [--repeats 5]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_concurrency import ML_DIR, load_payloads
+
+ARROW_STREAM_TYPE = 'application/vnd.apache.arrow.stream'
+
+
+async def call(app: Any, path: str, body: bytes, content_type: str,
+               accept: str = 'application/json') -> Tuple[int, Dict[str, str]]:
+    """One POST straight through the ASGI app; returns the status and response headers"""
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'POST', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'query_string': b'', 'root_path': '', 'client': ('127.0.0.1', 1), 'server': ('bench', 80),
+        'headers': [(b'host', b'bench'), (b'content-type', content_type.encode()),
+                    (b'accept', accept.encode()), (b'content-length', str(len(body)).encode())]
+    }
+    sent = False
+    result: Dict[str, Any] = {}
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal sent
+        if sent:
+            return {'type': 'http.disconnect'}
+        sent = True
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message['type'] == 'http.response.start':
+            result['status'] = message['status']
+            result['headers'] = {k.decode(): v.decode() for k, v in message['headers']}
+
+    await app(scope, receive, send)
+    return result['status'], result['headers']
+
+
+def model_ms(server_timing: str) -> float:
+    """Feature build + model time from a Server-Timing header, in ms"""
+    stages = dict(entry.split(';dur=') for entry in server_timing.split(', '))
+    return sum(float(stages.get(stage, 0)) for stage in ('features', 'predict'))
+
+
+def bodies(payloads: List[Dict[str, Any]]) -> Dict[str, Tuple[bytes, str, str]]:
+    """Request body, Content-Type and Accept per input format"""
+    columns = {field: [p[field] for p in payloads] for field in payloads[0]}
+    formats = {
+        'rows json': (json.dumps(payloads).encode(), 'application/json', 'application/json'),
+        'columnar json': (json.dumps(columns).encode(), 'application/json', 'application/json')
+    }
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return formats
+    table = pa.table({field: np.asarray(values) for field, values in columns.items()})
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    formats['arrow'] = (sink.getvalue(), ARROW_STREAM_TYPE, ARROW_STREAM_TYPE)
+    return formats
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    os.environ.update({'LOG_LEVEL': 'warning', 'DEVELOPMENT_MODE': 'false'})
+    os.chdir(ML_DIR)
+    sys.path.insert(0, ML_DIR)
+    import server
+
+    print(f"{os.cpu_count()} CPU cores, model {args.model}, median of {args.repeats} requests")
+    print(f"{'profiles':>9} {'format':<14} {'body KB':>9} {'latency ms':>11} {'models ms':>10} {'other ms':>9} {'profiles/s':>11}")
+    async with server.app.router.lifespan_context(server.app):
+        for size in args.sizes:
+            # dataset.csv has 15,000 rows; larger batches repeat them
+            payloads = load_payloads(size, seed=42)
+            payloads = (payloads * -(-size // len(payloads)))[:size]
+            for name, (body, content_type, accept) in bodies(payloads).items():
+                if name == 'rows json' and size > server.MAX_BATCH_SIZE:
+                    continue
+                path = f"/predict/batch/{args.model}" if name == 'rows json' else f"/predict/columnar/{args.model}"
+                latencies: List[float] = []
+                models: List[float] = []
+                for _ in range(args.repeats + 1):
+                    start = time.perf_counter()
+                    status, headers = await call(server.app, path, body, content_type, accept)
+                    latencies.append(time.perf_counter() - start)
+                    models.append(model_ms(headers['server-timing']))
+                    if status != 200:
+                        raise RuntimeError(f"{path} ({name}) returned {status}")
+                # The first request warms up; it is not counted
+                latency = float(np.median(latencies[1:])) * 1000
+                model = float(np.median(models[1:]))
+                print(f"{size:>9} {name:<14} {len(body) / 1024:>9.0f} {latency:>11.1f} {model:>10.1f} "
+                      f"{latency - model:>9.1f} {size / latency * 1000:>11.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch input format benchmark")
+    parser.add_argument('--sizes', default='1000,10000,100000', help="Comma-separated batch sizes")
+    parser.add_argument('--model', default='financial-health', help="Batch endpoint slug")
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+    args.sizes = [int(s) for s in args.sizes.split(',')]
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark for the ML API server
+
+Starts server.py under uvicorn on a free local port (or targets --url) and
+drives one prediction endpoint with 50, 200 and 1000 concurrent clients.
+A side prober hits /health throughout to show whether inference is
+stalling the event loop. Reports p50/p95/p99 latency and 503 counts.
+
+Server settings come from the environment, e.g.:
+    INFERENCE_WORKERS=2 INFERENCE_QUEUE_SIZE=32 python bench/bench_concurrency.py
+
+Usage: python bench/bench_concurrency.py [--clients 50,200,1000] [--requests-per-client 5]
+"""
+
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+import pandas as pd
+
+ML_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_payloads(n: int, seed: Optional[int] = None) -> List[Dict[str, float]]:
+    """Request bodies drawn from dataset.csv: the first n rows, or a seeded random sample"""
+    if seed is None:
+        df = pd.read_csv(os.path.join(ML_DIR, 'dataset.csv'), nrows=n)
+    else:
+        df = pd.read_csv(os.path.join(ML_DIR, 'dataset.csv'))
+        df = df.sample(n=min(n, len(df)), random_state=seed).reset_index(drop=True)
+    df['expenses'] = df['expenses'] / 12  # API takes monthly expenses
+    fields = ['age', 'income', 'expenses', 'savings', 'debt', 'employment_years',
+              'credit_score', 'num_dependents', 'investment_amount', 'property_value']
+    for field in ('age', 'employment_years', 'credit_score', 'num_dependents'):
+        df[field] = df[field].round().astype(int)
+    return df[fields].to_dict('records')
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, env: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    """Run server.py under uvicorn without reload; env overrides the server settings"""
+    return subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'server:app', '--host', '127.0.0.1',
+         '--port', str(port), '--log-level', 'warning'],
+        cwd=ML_DIR,
+        env={**os.environ, 'LOG_LEVEL': 'warning', 'DEVELOPMENT_MODE': 'false', **(env or {})}
+    )
+
+
+async def wait_ready(url: str, timeout: float = 120) -> None:
+    """Wait for /readyz, so measurements start after the server's warmup"""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{url}/readyz")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not become ready")
+
+
+def percentiles(samples: List[float]) -> Dict[str, Optional[float]]:
+    if not samples:
+        return {"p50": None, "p95": None, "p99": None}
+    p50, p95, p99 = np.percentile(np.array(samples) * 1000, [50, 95, 99])
+    return {"p50": round(float(p50), 2), "p95": round(float(p95), 2), "p99": round(float(p99), 2)}
+
+
+async def run_level(url: str, endpoint: str, payloads: List[Dict[str, float]],
+                    clients: int, requests_per_client: int) -> Dict[str, object]:
+    """Run one concurrency level and summarize it"""
+
+    latencies: List[float] = []
+    health_latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    done = asyncio.Event()
+
+    limits = httpx.Limits(max_connections=clients + 1, max_keepalive_connections=clients + 1)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+
+        async def worker(client_id: int) -> None:
+            for i in range(requests_per_client):
+                payload = payloads[(client_id * requests_per_client + i) % len(payloads)]
+                start = time.perf_counter()
+                try:
+                    status = (await client.post(endpoint, json=payload)).status_code
+                except httpx.TransportError:
+                    status = 0
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == 200:
+                    latencies.append(time.perf_counter() - start)
+
+        async def prober() -> None:
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get('/health')
+                health_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.05)
+
+        probe_task = asyncio.create_task(prober())
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(c) for c in range(clients)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+
+    return {
+        "clients": clients,
+        "requests": clients * requests_per_client,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency_ms": percentiles(latencies),
+        "health_latency_ms": percentiles(health_latencies),
+        "status_counts": {str(k): v for k, v in sorted(statuses.items())}
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    server = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        url = f"http://127.0.0.1:{port}"
+        server = start_server(port)
+
+    try:
+        await wait_ready(url)
+        payloads = load_payloads(1000)
+        print(f"{'clients':>8} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'health p99':>11}  statuses")
+        for clients in [int(c) for c in args.clients.split(',')]:
+            result = await run_level(url, args.endpoint, payloads, clients, args.requests_per_client)
+            lat, health = result['latency_ms'], result['health_latency_ms']
+            print(f"{clients:>8} {result['throughput_rps']:>8} {lat['p50']!s:>8} {lat['p95']!s:>8} "
+                  f"{lat['p99']!s:>8} {health['p99']!s:>11}  {result['status_counts']}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ML API concurrency benchmark")
+    parser.add_argument('--url', help="Target an already running server instead of starting one")
+    parser.add_argument('--endpoint', default='/predict/financial-health')
+    parser.add_argument('--clients', default='50,200,1000', help="Comma-separated concurrency levels")
+    parser.add_argument('--requests-per-client', type=int, default=5)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Explanation latency benchmark for /explain/{model}
+
+Runs the app in-process (httpx ASGI transport, so no network) and times,
+per model and batch size:
+
+- exact: TreeSHAP contributions for profiles the cache has not seen
+- approx: the Saabas approximation for unseen profiles
+- cached: the same exact request again, answered from the cache
+
+Every timed request uses fresh profiles (a seeded dataset.csv sample)
+except the cached one. Reports the median of --repeats requests.
+
+Usage: python bench/bench_explain.py [--sizes 1,50,1000] [--repeats 5]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+from typing import Any, Dict, List
+
+import httpx
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_concurrency import ML_DIR, load_payloads
+
+MODELS = ['investment-risk', 'affordability', 'financial-health', 'scenario']
+
+
+async def timed_post(client: httpx.AsyncClient, path: str, body: Any) -> float:
+    start = time.perf_counter()
+    response = await client.post(path, json=body)
+    elapsed = time.perf_counter() - start
+    response.raise_for_status()
+    return elapsed * 1000
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    os.environ.update({'LOG_LEVEL': 'warning', 'DEVELOPMENT_MODE': 'false', 'WARMUP_ENABLED': 'false'})
+    os.chdir(ML_DIR)
+    sys.path.insert(0, ML_DIR)
+    import server
+
+    sizes = [int(s) for s in args.sizes.split(',')]
+    payloads = load_payloads(15000, seed=42)
+    next_row = 0
+
+    def fresh(n: int) -> List[Dict[str, Any]]:
+        nonlocal next_row
+        rows = [payloads[(next_row + i) % len(payloads)] for i in range(n)]
+        next_row += n
+        return rows
+
+    print(f"median of {args.repeats} requests, ms")
+    print(f"{'model':<17} {'profiles':>8} {'exact':>9} {'approx':>9} {'cached':>9}")
+    async with server.app.router.lifespan_context(server.app):
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            for model in MODELS:
+                for size in sizes:
+                    timings: Dict[str, List[float]] = {"exact": [], "approx": [], "cached": []}
+                    for _ in range(args.repeats):
+                        profiles = fresh(size)
+                        timings["exact"].append(await timed_post(client, f"/explain/{model}", profiles))
+                        timings["cached"].append(await timed_post(client, f"/explain/{model}", profiles))
+                        timings["approx"].append(await timed_post(client, f"/explain/{model}?method=approx", fresh(size)))
+                    medians = {name: float(np.median(values)) for name, values in timings.items()}
+                    print(f"{model:<17} {size:>8} {medians['exact']:>9.1f} {medians['approx']:>9.1f} {medians['cached']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/explain/{model} latency: exact, approx and cached")
+    parser.add_argument('--sizes', default='1,50,1000', help="Comma-separated batch sizes")
+    parser.add_argument('--repeats', type=int, default=5)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Feature assembly micro-benchmark
+
+Compares the original per-request pandas path (dict -> DataFrame -> column
+selection) with the precompiled NumPy FeatureAssembler, for single-profile
+requests and for batches.
+
+Usage: python bench/bench_features.py [--repeat 2000] [--batch-sizes 1,64,4096]
+"""
+
+import os
+import sys
+import time
+import argparse
+from types import SimpleNamespace
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+ML_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ML_DIR)
+
+from feature_schema import FeatureAssembler, MODEL_FEATURES
+
+
+def load_profiles(n: int) -> List[SimpleNamespace]:
+    """Load n profiles from dataset.csv in the shape the API receives"""
+    df = pd.read_csv(os.path.join(ML_DIR, 'dataset.csv'), nrows=n)
+    df['expenses'] = df['expenses'] / 12  # API takes monthly expenses
+    fields = ['age', 'income', 'expenses', 'savings', 'debt', 'employment_years',
+              'credit_score', 'num_dependents', 'investment_amount', 'property_value']
+    return [SimpleNamespace(**row) for row in df[fields].to_dict('records')]
+
+
+def legacy_features(profile: SimpleNamespace) -> pd.DataFrame:
+    """The pre-FeatureAssembler create_feature_dataframe, kept for comparison"""
+    savings_rate = profile.savings / (profile.income + 1)
+    debt_to_income = profile.debt / (profile.income + 1)
+    expense_ratio = (profile.expenses * 12) / (profile.income + 1)
+    return pd.DataFrame([{
+        'age': profile.age,
+        'income': profile.income,
+        'expenses': profile.expenses * 12,
+        'savings': profile.savings,
+        'debt': profile.debt,
+        'employment_years': profile.employment_years,
+        'credit_score': profile.credit_score,
+        'num_dependents': profile.num_dependents,
+        'investment_amount': profile.investment_amount or 0,
+        'property_value': profile.property_value or 0,
+        'savings_rate': savings_rate,
+        'debt_to_income': debt_to_income,
+        'expense_ratio': expense_ratio
+    }])
+
+
+def time_per_call(fn: Callable[[], object], repeat: int) -> float:
+    """Mean wall time of fn() in microseconds"""
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Feature assembly micro-benchmark")
+    parser.add_argument('--repeat', type=int, default=2000, help="Iterations per measurement")
+    parser.add_argument('--batch-sizes', default='1,64,4096', help="Comma-separated batch sizes")
+    args = parser.parse_args()
+
+    batch_sizes = [int(b) for b in args.batch_sizes.split(',')]
+    profiles = load_profiles(max(batch_sizes))
+    assembler = FeatureAssembler()
+    model_name = 'investment_risk'
+    columns = MODEL_FEATURES[model_name]
+
+    # Both paths must produce the same model input
+    legacy = legacy_features(profiles[0])[columns].to_numpy(dtype=np.float32)
+    fast = assembler.select(assembler.build(profiles[:1]), model_name)
+    assert np.array_equal(legacy, fast), "FeatureAssembler disagrees with legacy path"
+
+    print(f"{'batch':>6} {'legacy (us)':>14} {'numpy (us)':>12} {'speedup':>8}")
+    for batch_size in batch_sizes:
+        batch = profiles[:batch_size]
+        repeat = max(1, args.repeat // batch_size)
+
+        # Legacy path built one DataFrame per profile (one per HTTP request)
+        legacy_us = time_per_call(
+            lambda: [legacy_features(p)[columns] for p in batch], repeat
+        )
+        fast_us = time_per_call(
+            lambda: assembler.select(assembler.build(batch), model_name), repeat
+        )
+        print(f"{batch_size:>6} {legacy_us:>14.1f} {fast_us:>12.1f} {legacy_us / fast_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
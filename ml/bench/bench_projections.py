@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo projection benchmark
+
+Times projections.project() for every scenario category, per path count,
+split into the simulation and the percentile bands. The engine is pure
+NumPy and runs in the calling thread, so this is the single-core cost of
+the simulate stage of /predict/projection. Reports the median of
+--repeats runs, each with a fresh seed.
+
+Usage: python bench/bench_projections.py [--paths 1000,10000,20000] [--years 30] [--repeats 7]
+"""
+
+import os
+import sys
+import time
+import argparse
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_concurrency import ML_DIR
+
+sys.path.insert(0, ML_DIR)
+from projections import DEFAULT_PERCENTILES, SCENARIO_STRATEGIES, ProjectionAssumptions, percentile_bands, simulate
+
+# Annual income and expenses, like /predict/projection derives from a profile
+BALANCES = {'income': 85000, 'expenses': 3200 * 12, 'savings': 25000, 'investments': 10000, 'debt': 15000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo projection engine latency")
+    parser.add_argument('--paths', default='1000,10000,20000', help="Comma-separated path counts")
+    parser.add_argument('--years', type=int, default=30)
+    parser.add_argument('--repeats', type=int, default=7)
+    args = parser.parse_args()
+
+    assumptions = ProjectionAssumptions()
+    names = list(SCENARIO_STRATEGIES)
+    print(f"{len(names)} scenarios x {args.years} years, median of {args.repeats} runs, ms")
+    print(f"{'paths':>7} {'simulate':>9} {'bands':>7} {'total':>7}")
+    for paths in (int(p) for p in args.paths.split(',')):
+        # Untimed first run: allocator and sort setup
+        percentile_bands(simulate(BALANCES, SCENARIO_STRATEGIES, assumptions, args.years, paths, 0),
+                         names, list(DEFAULT_PERCENTILES))
+        timings: Dict[str, List[float]] = {"simulate": [], "bands": []}
+        for seed in range(1, args.repeats + 1):
+            start = time.perf_counter()
+            history = simulate(BALANCES, SCENARIO_STRATEGIES, assumptions, args.years, paths, seed)
+            simulated = time.perf_counter()
+            percentile_bands(history, names, list(DEFAULT_PERCENTILES))
+            timings["simulate"].append((simulated - start) * 1000)
+            timings["bands"].append((time.perf_counter() - simulated) * 1000)
+        total = float(np.median([s + b for s, b in zip(timings["simulate"], timings["bands"])]))
+        print(f"{paths:>7} {np.median(timings['simulate']):>9.1f} {np.median(timings['bands']):>7.1f} {total:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Recommendation rules benchmark: per-row checks vs the vectorized rule set
+
+Builds feature matrices from dataset.csv profiles (repeated past its
+15,000 rows) and times, per batch size:
+
+- per-row: the previous implementation, one Python `if` chain per profile
+- rules: HEALTH_RULES.recommend() on a prebuilt feature matrix
+- frame: HEALTH_RULES.recommend_frame() on a DataFrame, features included
+
+Outputs are checked to be identical before timing.
+
+Usage: python bench/bench_recommendations.py [--sizes 1000,10000,100000] [--repeats 7]
+"""
+
+import os
+import sys
+import time
+import argparse
+from typing import Any, Callable, List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_concurrency import ML_DIR, load_payloads
+
+sys.path.insert(0, ML_DIR)
+from scoring import feature_assembler, HEALTH_RULES
+
+
+def per_row(features: np.ndarray) -> List[List[str]]:
+    """The per-profile checks the rules replaced"""
+    low_savings = (feature_assembler.column(features, 'savings_rate') < 0.1).tolist()
+    high_debt = (feature_assembler.column(features, 'debt_to_income') > 0.3).tolist()
+    low_credit = (feature_assembler.column(features, 'credit_score') < 700).tolist()
+    recommendations = []
+    for i in range(len(features)):
+        row = []
+        if low_savings[i]:
+            row.append("Increase your savings rate to at least 10% of income")
+        if high_debt[i]:
+            row.append("Work on reducing debt-to-income ratio below 30%")
+        if low_credit[i]:
+            row.append("Focus on improving credit score through timely payments")
+        if not row:
+            row.append("Maintain your excellent financial habits!")
+        recommendations.append(row)
+    return recommendations
+
+
+def best_ms(fn: Callable[[], Any], repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-row vs vectorized recommendation rules")
+    parser.add_argument('--sizes', default='1000,10000,100000', help="Comma-separated batch sizes")
+    parser.add_argument('--repeats', type=int, default=7, help="Best of this many runs")
+    args = parser.parse_args()
+
+    payloads = load_payloads(15000, seed=42)
+    print(f"{len(HEALTH_RULES.rules)} rules, best of {args.repeats} runs")
+    print(f"{'profiles':>9} {'per-row ms':>11} {'rules ms':>9} {'frame ms':>9} {'speedup':>8} {'profiles/s (rules)':>19}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        frame = pd.DataFrame((payloads * -(-size // len(payloads)))[:size])
+        features = feature_assembler.build_columns({c: frame[c].to_numpy(dtype=np.float64) for c in frame})
+
+        expected = per_row(features)
+        if HEALTH_RULES.recommend(features).tolist() != expected or HEALTH_RULES.recommend_frame(frame).tolist() != expected:
+            raise RuntimeError("Rule set output differs from the per-row checks")
+
+        row_ms = best_ms(lambda: per_row(features), args.repeats)
+        rules_ms = best_ms(lambda: HEALTH_RULES.recommend(features), args.repeats)
+        frame_ms = best_ms(lambda: HEALTH_RULES.recommend_frame(frame), args.repeats)
+        print(f"{size:>9} {row_ms:>11.2f} {rules_ms:>9.2f} {frame_ms:>9.2f} {row_ms / rules_ms:>7.1f}x "
+              f"{size / rules_ms * 1000:>19.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Response serialization benchmark: default vs fast response mode
+
+Calls the ASGI app directly (no HTTP client or sockets) and times each
+prediction endpoint with FAST_RESPONSES off and on, alternating the two
+modes round by round so drift affects both equally. The prediction cache
+is on by default and warmed first, so inference drops out and what is left
+is the per-request cost of the framework: routing, input validation,
+response validation and JSON encoding. --no-cache runs the models on every
+request to show the saving next to the full request latency.
+
+Usage: python bench/bench_responses.py [--requests 2000] [--rounds 5] [--batch-sizes 16,256] [--no-cache]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from typing import Any, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_concurrency import ML_DIR, load_payloads
+
+SINGLE_ENDPOINTS = [
+    '/predict/investment-risk',
+    '/predict/affordability',
+    '/predict/financial-health',
+    '/predict/scenario',
+    '/predict/all'
+]
+BATCH_ENDPOINT = '/predict/batch/financial-health'
+
+
+async def call(app: Any, path: str, body: bytes) -> int:
+    """One POST straight through the ASGI app; returns the status code"""
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'POST', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'query_string': b'', 'root_path': '', 'client': ('127.0.0.1', 1), 'server': ('bench', 80),
+        'headers': [(b'host', b'bench'), (b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode())]
+    }
+    sent = False
+    status = 0
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal sent
+        if sent:
+            return {'type': 'http.disconnect'}
+        sent = True
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await app(scope, receive, send)
+    return status
+
+
+async def time_requests(app: Any, path: str, bodies: List[bytes], requests: int) -> List[float]:
+    latencies = []
+    for i in range(requests):
+        start = time.perf_counter()
+        status = await call(app, path, bodies[i % len(bodies)])
+        latencies.append(time.perf_counter() - start)
+        if status != 200:
+            raise RuntimeError(f"{path} returned {status}")
+    return latencies
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    os.environ.update({'LOG_LEVEL': 'warning', 'DEVELOPMENT_MODE': 'false',
+                       'PREDICTION_CACHE_ENABLED': 'false' if args.no_cache else 'true'})
+    os.chdir(ML_DIR)
+    sys.path.insert(0, ML_DIR)
+    import server
+    from fast_responses import JSON_ENCODER
+
+    payloads = load_payloads(args.profiles, seed=42)
+    cases = [(path, 1, [json.dumps(p).encode() for p in payloads]) for path in SINGLE_ENDPOINTS]
+    for size in args.batch_sizes:
+        bodies = [json.dumps(payloads[i:i + size]).encode() for i in range(0, len(payloads) - size + 1, size)]
+        cases.append((BATCH_ENDPOINT, size, bodies))
+
+    print(f"{os.cpu_count()} CPU cores, prediction cache {'off' if args.no_cache else 'on'}, "
+          f"fast mode encoder: {JSON_ENCODER}")
+    print(f"{'endpoint':<34} {'batch':>6} {'default p50 us':>15} {'fast p50 us':>12} {'saved us':>9} {'saved':>7}")
+    async with server.app.router.lifespan_context(server.app):
+        for path, size, bodies in cases:
+            requests = args.requests if size == 1 else max(20, args.requests // size)
+            samples: Dict[bool, List[float]] = {False: [], True: []}
+            for fast in (False, True):
+                server.FAST_RESPONSES = fast
+                await time_requests(server.app, path, bodies, len(bodies))  # warm the cache
+            for _ in range(args.rounds):
+                for fast in (False, True):
+                    server.FAST_RESPONSES = fast
+                    samples[fast].extend(await time_requests(server.app, path, bodies, requests))
+
+            default_us = float(np.median(samples[False])) * 1e6
+            fast_us = float(np.median(samples[True])) * 1e6
+            print(f"{path:<34} {size:>6} {default_us:>15.1f} {fast_us:>12.1f} "
+                  f"{default_us - fast_us:>9.1f} {1 - fast_us / default_us:>7.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Default vs fast response mode benchmark")
+    parser.add_argument('--requests', type=int, default=2000, help="Requests per mode per round (single-profile)")
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--batch-sizes', default='16,256', help="Profiles per batch request")
+    parser.add_argument('--profiles', type=int, default=512, help="Profiles sampled from dataset.csv")
+    parser.add_argument('--no-cache', action='store_true', help="Run the models on every request")
+    args = parser.parse_args()
+    args.batch_sizes = [int(b) for b in args.batch_sizes.split(',')]
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for the offline batch scorer
+
+Replicates dataset.csv to --rows rows (as Parquet, or CSV with --input-format
+csv), then runs score_batch.py once per worker count and reports
+throughput, speedup over the first worker count and parallel efficiency
+(speedup / worker ratio). Each run is a fresh process, so model loading in
+the workers is included, as it would be for a real job.
+
+Workers scale until they run out of cores: compare os.cpu_count() (printed
+first) with the worker counts before reading much into the efficiency.
+
+Usage: python bench/bench_score_batch.py [--rows 1000000] [--workers 1,2,4,8] [--chunk-rows 100000]
+       python bench/bench_score_batch.py --rows 10000000 --workers 1,4,16,32
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from typing import Any, Dict, List
+
+import pandas as pd
+
+ML_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ML_DIR)
+from feature_schema import PROFILE_FIELDS
+
+
+def replicate_dataset(rows: int, path: str, fmt: str) -> None:
+    """Write dataset.csv's profile columns repeated to `rows` rows, with an id column"""
+    base = pd.read_csv(os.path.join(ML_DIR, 'dataset.csv'), usecols=PROFILE_FIELDS)
+    block = pd.concat([base] * max(1, 1_000_000 // len(base)), ignore_index=True)
+
+    writer = None
+    written = 0
+    while written < rows:
+        part = block.iloc[:rows - written].copy()
+        part.insert(0, 'id', range(written, written + len(part)))
+        if fmt == 'csv':
+            part.to_csv(path, mode='a', header=written == 0, index=False)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(part, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+        written += len(part)
+    if writer is not None:
+        writer.close()
+
+
+def run_scorer(input_path: str, output_dir: str, workers: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run score_batch.py with N workers; returns its _scoring.json summary"""
+    subprocess.run(
+        [sys.executable, 'score_batch.py', input_path, '--output', output_dir, '--overwrite',
+         '--workers', str(workers), '--chunk-rows', str(args.chunk_rows), '--expenses', 'annual'],
+        cwd=ML_DIR, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    with open(os.path.join(output_dir, '_scoring.json')) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch scoring scaling benchmark")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Rows to score (dataset.csv replicated)")
+    parser.add_argument('--workers', default='1,2,4,8', help="Comma-separated worker counts")
+    parser.add_argument('--chunk-rows', type=int, default=100000)
+    parser.add_argument('--input-format', choices=['parquet', 'csv'], default='parquet')
+    args = parser.parse_args()
+
+    worker_counts = [int(w) for w in args.workers.split(',')]
+    print(f"{os.cpu_count()} CPU cores, {args.rows} rows, {args.chunk_rows} rows per chunk")
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, f"profiles.{args.input_format}")
+        replicate_dataset(args.rows, input_path, args.input_format)
+
+        print(f"{'workers':>8} {'threads':>8} {'seconds':>9} {'rows/s':>10} {'speedup':>8} {'efficiency':>10}")
+        for workers in worker_counts:
+            summary = run_scorer(input_path, os.path.join(tmp, 'scores'), workers, args)
+            base = results[0] if results else summary
+            speedup = summary['rows_per_sec'] / base['rows_per_sec']
+            efficiency = speedup / (workers / base['workers'])
+            results.append(summary)
+            print(f"{workers:>8} {summary['threads_per_worker']:>8} {summary['elapsed_s']:>9.1f} "
+                  f"{summary['rows_per_sec']:>10.0f} {speedup:>7.2f}x {efficiency:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+What-if sweep benchmark: one /predict/sweep call vs one call per grid point
+
+Starts server.py (or targets --url) and, for each N in --grids, scores an
+N x N grid of income x debt variations of one profile two ways:
+
+- sweep: a single /predict/sweep request (best of --repeats)
+- per-point: N*N /predict/all requests from --clients concurrent clients
+
+Both score every model at every point. The per-point results are checked
+against the sweep surfaces before timings are reported. The prediction
+cache is disabled so every point runs the models.
+
+Usage: python bench/bench_sweep.py [--grids 10,25,50] [--clients 32] [--repeats 5]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+from typing import Any, Dict, List
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_concurrency import free_port, load_payloads, start_server, wait_ready
+
+
+def sweep_body(profile: Dict[str, Any], n: int) -> Dict[str, Any]:
+    return {
+        "profile": profile,
+        "axes": [
+            {"field": "income", "start": 20000, "stop": 250000, "steps": n},
+            {"field": "debt", "start": 0, "stop": 150000, "steps": n}
+        ]
+    }
+
+
+async def per_point(client: httpx.AsyncClient, profile: Dict[str, Any], sweep: Dict[str, Any],
+                    clients: int) -> List[List[Dict[str, Any]]]:
+    """/predict/all for every grid point, clients at a time"""
+    incomes, debts = (axis["values"] for axis in sweep["axes"])
+    points = [(i, j) for i in range(len(incomes)) for j in range(len(debts))]
+    results: List[List[Dict[str, Any]]] = [[{} for _ in debts] for _ in incomes]
+
+    async def worker(offset: int) -> None:
+        for i, j in points[offset::clients]:
+            response = await client.post('/predict/all', json={**profile, "income": incomes[i], "debt": debts[j]})
+            response.raise_for_status()
+            results[i][j] = response.json()
+
+    await asyncio.gather(*(worker(c) for c in range(clients)))
+    return results
+
+
+def check(sweep: Dict[str, Any], points: List[List[Dict[str, Any]]]) -> None:
+    for field, surface in sweep["surfaces"].items():
+        for name, values in surface.items():
+            for i, row in enumerate(values):
+                for j, value in enumerate(row):
+                    if points[i][j][field][name] != value:
+                        raise RuntimeError(f"Sweep {field}.{name}[{i}][{j}] differs from /predict/all")
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    server = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        url = f"http://127.0.0.1:{port}"
+        server = start_server(port, {'PREDICTION_CACHE_ENABLED': 'false'})
+
+    try:
+        await wait_ready(url)
+        profile = load_payloads(1)[0]
+        limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+        print(f"{'grid':>7} {'points':>7} {'sweep ms':>9} {'per-point ms':>13} {'speedup':>8}")
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=300) as client:
+            for n in (int(g) for g in args.grids.split(',')):
+                body = sweep_body(profile, n)
+                times = []
+                for _ in range(args.repeats):
+                    start = time.perf_counter()
+                    response = await client.post('/predict/sweep', json=body)
+                    times.append(time.perf_counter() - start)
+                    response.raise_for_status()
+                sweep_ms = min(times) * 1000
+                sweep = response.json()
+
+                start = time.perf_counter()
+                points = await per_point(client, profile, sweep, args.clients)
+                point_ms = (time.perf_counter() - start) * 1000
+                check(sweep, points)
+                print(f"{n:>3}x{n:<3} {n * n:>7} {sweep_ms:>9.1f} {point_ms:>13.1f} {point_ms / sweep_ms:>7.1f}x")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/predict/sweep vs one /predict/all call per grid point")
+    parser.add_argument('--url', help="Target an already running server instead of starting one")
+    parser.add_argument('--grids', default='10,25,50', help="Comma-separated grid sizes (N for an N x N grid)")
+    parser.add_argument('--clients', type=int, default=32, help="Concurrent clients for the per-point calls")
+    parser.add_argument('--repeats', type=int, default=5, help="Best of this many sweep calls")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
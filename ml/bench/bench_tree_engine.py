@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tree engine parity check and latency benchmark
+
+For each trained model, checks that FlatTreeEnsemble matches XGBoost's own
+predictions on dataset.csv, then compares latency at several batch sizes.
+Exits non-zero if any model is out of tolerance.
+
+Usage: python bench/bench_tree_engine.py [--batch-sizes 1,64,4096] [--repeat 200]
+"""
+
+import os
+import sys
+import time
+import argparse
+import warnings
+from typing import Callable
+
+import joblib
+import numpy as np
+import pandas as pd
+
+ML_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ML_DIR)
+
+from feature_schema import MODEL_FEATURES
+from tree_engine import FlatTreeEnsemble
+
+warnings.filterwarnings('ignore')
+
+MODEL_FILES = {
+    'investment_risk': 'investment_risk_model.pkl',
+    'affordability': 'affordability_model.pkl',
+    'health_score': 'health_score_model.pkl',
+    'scenario_planner': 'scenario_planner_model.pkl'
+}
+
+# XGBoost sums leaf values in float32, the engine in float64
+RELATIVE_TOLERANCE = 1e-5
+PROBABILITY_TOLERANCE = 1e-5
+
+
+def time_per_call(fn: Callable[[], object], repeat: int) -> float:
+    """Median wall time of fn() in microseconds"""
+    fn()  # warm up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tree engine parity and latency benchmark")
+    parser.add_argument('--models-dir', default=os.path.join(ML_DIR, 'models'))
+    parser.add_argument('--batch-sizes', default='1,64,4096', help="Comma-separated batch sizes")
+    parser.add_argument('--repeat', type=int, default=200, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    batch_sizes = [int(b) for b in args.batch_sizes.split(',')]
+    df = pd.read_csv(os.path.join(ML_DIR, 'dataset.csv'))
+    failed = False
+
+    for model_name, filename in MODEL_FILES.items():
+        model = joblib.load(os.path.join(args.models_dir, filename))
+        if isinstance(model, dict):
+            model = model['model']
+        engine = FlatTreeEnsemble.from_xgboost(model)
+        X = df[MODEL_FEATURES[model_name]].to_numpy(dtype=np.float32)
+
+        # Parity over the whole dataset
+        if engine.objective == 'multi:softprob':
+            predict_xgb, predict_engine = model.predict_proba, engine.predict_proba
+            error = np.abs(predict_xgb(X) - predict_engine(X)).max()
+            ok = error <= PROBABILITY_TOLERANCE and np.array_equal(model.predict(X), engine.predict(X))
+        else:
+            predict_xgb, predict_engine = model.predict, engine.predict
+            expected = predict_xgb(X)
+            error = (np.abs(expected - predict_engine(X)) / np.maximum(1.0, np.abs(expected))).max()
+            ok = error <= RELATIVE_TOLERANCE
+        failed |= not ok
+
+        print(f"\n{model_name}: {engine.n_trees} trees, depth {engine.max_depth}, "
+              f"max error {error:.2e} [{'ok' if ok else 'FAIL'}]")
+        print(f"{'batch':>6} {'xgboost (us)':>14} {'engine (us)':>13} {'speedup':>8}")
+        for batch_size in batch_sizes:
+            batch = X[:batch_size]
+            repeat = max(5, args.repeat * 64 // max(64, batch_size))
+            xgb_us = time_per_call(lambda: predict_xgb(batch), repeat)
+            engine_us = time_per_call(lambda: predict_engine(batch), repeat)
+            print(f"{batch_size:>6} {xgb_us:>14.1f} {engine_us:>13.1f} {xgb_us / engine_us:>7.2f}x")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
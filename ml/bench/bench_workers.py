@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Worker scaling benchmark for the prefork server
+
+For each worker count, starts `python server.py` (prefork supervisor,
+models preloaded in the parent) on a free local port, drives one
+prediction endpoint with concurrent clients and reports throughput,
+latency and memory per worker:
+
+- RSS: resident memory of one worker, including pages shared with the
+  supervisor and the other workers
+- PSS: RSS with shared pages split between the processes sharing them;
+  the sum over all processes is the real footprint
+- USS: memory private to the worker (what one more worker costs)
+
+The prediction cache is disabled so every request runs the model.
+
+Usage: python bench/bench_workers.py [--workers 1,2,4] [--clients 64] [--requests-per-client 50]
+"""
+
+import os
+import sys
+import asyncio
+import argparse
+import subprocess
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_concurrency import ML_DIR, free_port, load_payloads, run_level, wait_ready
+
+
+def memory_kb(pid: int) -> Dict[str, int]:
+    """Rss, Pss and USS (private clean + dirty) of one process"""
+    values: Dict[str, int] = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        "rss": values.get('Rss', 0),
+        "pss": values.get('Pss', 0),
+        "uss": values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+    }
+
+
+def child_pids(pid: int) -> List[int]:
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(p) for p in f.read().split()]
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    """Run server.py's production entry point with N workers"""
+    return subprocess.Popen(
+        [sys.executable, 'server.py'],
+        cwd=ML_DIR,
+        env={**os.environ, 'PORT': str(port), 'HOST': '127.0.0.1', 'WORKERS': str(workers),
+             'RELOAD': 'false', 'LOG_LEVEL': 'warning', 'DEVELOPMENT_MODE': 'false',
+             'PREDICTION_CACHE_ENABLED': 'false'},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+
+async def measure(workers: int, endpoint: str, payloads: List[Dict[str, float]],
+                  clients: int, requests_per_client: int) -> Dict[str, object]:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    server = start_server(port, workers)
+    try:
+        await wait_ready(url)
+        # Warm every worker, then measure
+        await run_level(url, endpoint, payloads, clients, 5)
+        result = await run_level(url, endpoint, payloads, clients, requests_per_client)
+
+        memory = [memory_kb(pid) for pid in child_pids(server.pid)]
+        supervisor = memory_kb(server.pid)
+        return {
+            "workers": workers,
+            "throughput_rps": result['throughput_rps'],
+            "latency_ms": result['latency_ms'],
+            "status_counts": result['status_counts'],
+            "worker_rss_mb": round(sum(m['rss'] for m in memory) / len(memory) / 1024, 1),
+            "worker_pss_mb": round(sum(m['pss'] for m in memory) / len(memory) / 1024, 1),
+            "worker_uss_mb": round(sum(m['uss'] for m in memory) / len(memory) / 1024, 1),
+            "total_pss_mb": round((supervisor['pss'] + sum(m['pss'] for m in memory)) / 1024, 1)
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    payloads = load_payloads(1000)
+    print(f"{os.cpu_count()} CPU cores, endpoint {args.endpoint}, {args.clients} clients")
+    print(f"{'workers':>7} {'rps':>8} {'p50':>8} {'p99':>8} {'RSS/wkr':>9} {'PSS/wkr':>9} {'USS/wkr':>9} {'total PSS':>10}")
+    baseline = None
+    for workers in [int(w) for w in args.workers.split(',')]:
+        r = await measure(workers, args.endpoint, payloads, args.clients, args.requests_per_client)
+        baseline = baseline or r['throughput_rps']
+        print(f"{workers:>7} {r['throughput_rps']:>8} {r['latency_ms']['p50']!s:>8} {r['latency_ms']['p99']!s:>8} "
+              f"{r['worker_rss_mb']:>9} {r['worker_pss_mb']:>9} {r['worker_uss_mb']:>9} {r['total_pss_mb']:>10}"
+              f"   x{r['throughput_rps'] / baseline:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prefork worker scaling benchmark")
+    default_workers = ','.join(str(w) for w in sorted({1, 2, 4, os.cpu_count() or 1}) if w <= (os.cpu_count() or 1)) or '1'
+    parser.add_argument('--workers', default=default_workers, help="Comma-separated worker counts")
+    parser.add_argument('--endpoint', default='/predict/all')
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--requests-per-client', type=int, default=50)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Columnar Batch Input
+
+Parsing for batches sent as one array per field instead of one object per
+profile:
+
+- columnar JSON: {"age": [34, 51, ...], "income": [72000, 98000, ...], ...}
+- Arrow IPC stream (application/vnd.apache.arrow.stream) with one column
+  per field
+
+Each field becomes a NumPy array. Arrow numeric columns without nulls are
+wrapped without copying, and no per-row Python objects are built at all:
+rows are checked against the FinancialProfile constraints with the
+vectorized checks in feature_schema and the arrays go straight into
+FeatureAssembler.build_columns. Results go back in the same layout, one
+array per response field (Arrow when the client accepts it).
+"""
+
+import io
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from feature_schema import PROFILE_FIELDS, PROFILE_LIMITS, OPTIONAL_PROFILE_FIELDS, INTEGER_PROFILE_FIELDS
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON parsing
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # Arrow input/output needs pyarrow
+    pa = None
+
+ARROW_STREAM_TYPE = 'application/vnd.apache.arrow.stream'
+
+COLUMNAR_CONTENT_TYPES = {
+    'application/json': 'json',
+    ARROW_STREAM_TYPE: 'arrow'
+}
+
+ARROW_AVAILABLE = pa is not None
+
+
+class ColumnarFormatError(ValueError):
+    """Raised when a columnar body cannot be turned into profile columns"""
+
+
+class ColumnarBatchTooLarge(ValueError):
+    """Raised when a columnar batch has more rows than allowed"""
+
+
+def detect_columnar_format(content_type: Optional[str]) -> Optional[str]:
+    """'json' or 'arrow' from the Content-Type header, None if unsupported"""
+    media_type = (content_type or 'application/json').split(';')[0].strip().lower()
+    return COLUMNAR_CONTENT_TYPES.get(media_type)
+
+
+def wants_arrow(accept: Optional[str]) -> bool:
+    """True if the Accept header asks for an Arrow IPC stream"""
+    return ARROW_STREAM_TYPE in (accept or '').lower()
+
+
+def _field_message(field: str) -> str:
+    low, high = PROFILE_LIMITS[field]
+    kind = 'an integer' if field in INTEGER_PROFILE_FIELDS else 'a number'
+    if high is not None:
+        return f"Input should be {kind} between {low} and {high}"
+    return f"Input should be {kind} greater than or equal to {low}"
+
+# One message per field, covering missing, non-numeric and out-of-range values
+FIELD_ERROR_MESSAGES = {field: _field_message(field) for field in PROFILE_FIELDS}
+
+
+def _json_column(field: str, values: Any) -> np.ndarray:
+    if not isinstance(values, list):
+        raise ColumnarFormatError(f"Column '{field}' must be an array")
+    try:
+        array = np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        # nulls or non-numeric entries: those rows become NaN and fail validation
+        array = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype=np.float64)
+    if array.ndim != 1:
+        raise ColumnarFormatError(f"Column '{field}' must be a flat array")
+    return array
+
+
+def read_json_columns(body: bytes) -> Dict[str, np.ndarray]:
+    """Profile columns from a columnar JSON object (other keys are ignored)"""
+    try:
+        data = orjson.loads(body) if orjson is not None else json.loads(body)
+    except ValueError as e:
+        raise ColumnarFormatError(f"Invalid JSON: {str(e)}")
+    if not isinstance(data, dict):
+        raise ColumnarFormatError("Body must be a JSON object with one array per field")
+    return {field: _json_column(field, data[field]) for field in PROFILE_FIELDS if field in data}
+
+
+def _arrow_column(field: str, column: Any) -> np.ndarray:
+    array = column.combine_chunks() if column.num_chunks != 1 else column.chunk(0)
+    if pa.types.is_integer(array.type) or pa.types.is_floating(array.type):
+        # Zero-copy without nulls; nulls come back as NaN
+        return array.to_numpy(zero_copy_only=False)
+    if pa.types.is_string(array.type) or pa.types.is_large_string(array.type) or pa.types.is_decimal(array.type):
+        return pd.to_numeric(pd.Series(array.to_pylist(), dtype=object), errors='coerce').to_numpy(dtype=np.float64)
+    raise ColumnarFormatError(f"Column '{field}' has unsupported type {array.type}")
+
+
+def read_arrow_columns(body: bytes) -> Dict[str, np.ndarray]:
+    """Profile columns from an Arrow IPC stream (other columns are ignored)"""
+    try:
+        table = pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+    except (pa.ArrowInvalid, OSError) as e:
+        raise ColumnarFormatError(f"Invalid Arrow IPC stream: {str(e)}")
+    names = set(table.column_names)
+    return {field: _arrow_column(field, table.column(field)) for field in PROFILE_FIELDS if field in names}
+
+
+def read_columns(body: bytes, fmt: str, max_rows: int) -> Tuple[Dict[str, np.ndarray], int]:
+    """
+    Parse a columnar body into one array per profile field.
+
+    Optional fields that are absent or null default to 0. Returns the
+    columns and the row count.
+    """
+
+    columns = read_arrow_columns(body) if fmt == 'arrow' else read_json_columns(body)
+    missing = [f for f in PROFILE_FIELDS if f not in columns and f not in OPTIONAL_PROFILE_FIELDS]
+    if missing:
+        raise ColumnarFormatError(f"Missing required columns: {missing}")
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ColumnarFormatError(f"Columns have different lengths: {sorted(lengths)}")
+    n_rows = lengths.pop()
+    if n_rows > max_rows:
+        raise ColumnarBatchTooLarge(f"Batch too large: {n_rows} profiles (max {max_rows})")
+
+    for field in OPTIONAL_PROFILE_FIELDS:
+        if field not in columns:
+            columns[field] = np.zeros(n_rows)
+        elif columns[field].dtype.kind == 'f' and np.isnan(columns[field]).any():
+            columns[field] = np.nan_to_num(columns[field], nan=0.0)
+    return columns, n_rows
+
+
+def row_errors(invalid: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """Per-row error lists, in the /predict/batch format, for rows with any invalid field"""
+    fields = list(invalid)
+    bad = np.column_stack([invalid[f] for f in fields])
+    errors = []
+    for row in np.flatnonzero(bad.any(axis=1)).tolist():
+        errors.append({
+            "index": row,
+            "errors": [
+                {"loc": [fields[j]], "msg": FIELD_ERROR_MESSAGES[fields[j]], "type": "value_error"}
+                for j in np.flatnonzero(bad[row]).tolist()
+            ]
+        })
+    return errors
+
+
+def arrow_stream(index: np.ndarray, columns: Dict[str, Any], metadata: Dict[str, str]) -> bytes:
+    """Arrow IPC stream with an index column followed by the result columns"""
+    arrays = [pa.array(index, type=pa.int64())]
+    for values in columns.values():
+        arrays.append(pa.array(values.tolist() if getattr(values, 'ndim', 1) > 1 else values))
+    table = pa.Table.from_arrays(arrays, names=['index'] + list(columns))
+    table = table.replace_schema_metadata({k: str(v) for k, v in metadata.items()})
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
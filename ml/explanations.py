@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Prediction Explanations
+
+Per-feature contributions for XGBoost predictions, computed with the
+booster's native tree-path mode (predict(pred_contribs=True)). Every row
+of a batch is explained in one call. For each row, the contributions plus
+the base value add up to the model's raw output:
+
+- regressors: the predicted score, before the server clips it to its range
+- classifiers: the log-odds of the row's most likely class
+
+Two methods:
+
+    exact   TreeSHAP, the Shapley values of the tree ensemble
+    approx  the Saabas path attribution: each split's change in expected
+            value goes to its feature. About 100x cheaper than exact,
+            but the top feature can differ
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import xgboost as xgb
+
+EXPLAIN_METHODS = ('exact', 'approx')
+
+
+def tree_contributions(estimator: Any, X: np.ndarray, feature_names: List[str],
+                       method: str = 'exact') -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """
+    Contributions (rows x features), base values (rows) and, for
+    classifiers, the explained class index of each row.
+    """
+    if method not in EXPLAIN_METHODS:
+        raise ValueError(f"Unknown explanation method '{method}', expected one of {EXPLAIN_METHODS}")
+
+    dmatrix = xgb.DMatrix(X, feature_names=feature_names)
+    contributions = estimator.get_booster().predict(
+        dmatrix, pred_contribs=True, approx_contribs=(method == 'approx')
+    )
+    class_index = None
+    if contributions.ndim == 3:
+        # rows x classes x (features + bias): explain each row's most likely class
+        class_index = np.argmax(contributions.sum(axis=2), axis=1)
+        contributions = contributions[np.arange(len(contributions)), class_index]
+    return contributions[:, :-1], contributions[:, -1], class_index
+
+
+def explanation_rows(feature_names: List[str], contributions: np.ndarray, base_values: np.ndarray,
+                     classes: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+    """
+    One explanation per row: output, base value and contributions keyed by
+    feature, largest absolute contribution first.
+    """
+    order = np.argsort(-np.abs(contributions), axis=1, kind='stable')
+    outputs = (contributions.sum(axis=1, dtype=np.float64) + base_values).tolist()
+    names = np.asarray(feature_names, dtype=object)[order].tolist()
+    values = np.take_along_axis(contributions, order, axis=1).tolist()
+    rows = []
+    for i, (output, base_value) in enumerate(zip(outputs, base_values.tolist())):
+        rows.append({
+            "output": output,
+            "base_value": base_value,
+            "contributions": dict(zip(names[i], values[i])),
+            "explained_class": classes[i] if classes is not None else None
+        })
+    return rows
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Fast JSON Responses
+
+Response class for the server's fast response mode (FAST_RESPONSES=true).
+
+Prediction responses are pydantic objects the server builds itself from
+model outputs, so they are already valid when the endpoint returns them.
+By default FastAPI validates them again against the endpoint's
+response_model and then serializes them. Returning a FastJSONResponse
+skips both steps: the objects are encoded once, by orjson, straight from
+their field values.
+
+That shortcut is only equivalent for plain models (no aliases, custom
+serializers or computed fields), which is all the response models are.
+Without orjson installed, pydantic-core's JSON encoder is used instead;
+it is slower on large batches but still skips the re-validation.
+"""
+
+from typing import Any
+
+import numpy as np
+import pydantic_core
+from pydantic import BaseModel
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+JSON_ENCODER = 'orjson' if orjson is not None else 'pydantic-core'
+
+
+def _encode_default(obj: Any) -> Any:
+    """Fields of nested response models (orjson calls this for types it doesn't know)"""
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    if isinstance(obj, (np.ndarray, np.generic)):
+        # String and object arrays; orjson encodes numeric ones natively
+        return obj.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _encode_fallback(obj: Any) -> Any:
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """JSON bytes for response models, NumPy arrays, and dicts and lists of them (NaN as null)"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_encode_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return pydantic_core.to_json(content, fallback=_encode_fallback, inf_nan_mode='null')
+
+
+class FastJSONResponse(Response):
+    """JSON response that encodes pydantic objects without re-validating them"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
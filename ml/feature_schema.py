@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Feature Schema
+
+Single source of truth for the feature columns used by the ML models.
+Shared by the training pipeline (train_model.py) and the API server
+(server.py) so the two can never drift apart.
+
+The server builds one float32 matrix holding every feature column and each
+model reads its own columns through an index array compiled once at import.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+# Raw fields of a financial profile, in matrix column order
+PROFILE_FIELDS = [
+    'age', 'income', 'expenses', 'savings', 'debt', 'employment_years',
+    'credit_score', 'num_dependents', 'investment_amount', 'property_value'
+]
+
+# Valid range of each raw field (inclusive, None = unbounded), as enforced
+# on API requests by FinancialProfile in server.py
+PROFILE_LIMITS = {
+    'age': (18, 100),
+    'income': (0, None),
+    'expenses': (0, None),
+    'savings': (0, None),
+    'debt': (0, None),
+    'employment_years': (0, 50),
+    'credit_score': (300, 850),
+    'num_dependents': (0, 10),
+    'investment_amount': (0, None),
+    'property_value': (0, None)
+}
+
+# Fields that default to 0 when a profile leaves them out
+OPTIONAL_PROFILE_FIELDS = ['investment_amount', 'property_value']
+
+# Fields FinancialProfile declares as integers
+INTEGER_PROFILE_FIELDS = ['age', 'employment_years', 'credit_score', 'num_dependents']
+
+# Ratios derived from the raw fields
+DERIVED_FEATURES = ['savings_rate', 'debt_to_income', 'expense_ratio']
+
+# Outputs of upstream models consumed by the scenario planner
+UPSTREAM_FEATURES = ['financial_health_score', 'investment_risk_score']
+
+FEATURE_COLUMNS = PROFILE_FIELDS + DERIVED_FEATURES + UPSTREAM_FEATURES
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_COLUMNS)}
+
+# Feature columns each model is trained on, in training order
+MODEL_FEATURES: Dict[str, List[str]] = {
+    'investment_risk': ['age', 'income', 'savings', 'debt', 'employment_years',
+                        'credit_score', 'num_dependents', 'property_value',
+                        'savings_rate', 'debt_to_income'],
+    'affordability': ['age', 'income', 'expenses', 'savings', 'debt',
+                      'employment_years', 'credit_score', 'num_dependents',
+                      'savings_rate', 'debt_to_income'],
+    'health_score': ['age', 'income', 'savings', 'debt', 'investment_amount',
+                     'employment_years', 'credit_score', 'savings_rate',
+                     'debt_to_income', 'expense_ratio'],
+    'scenario_planner': ['age', 'income', 'savings', 'debt', 'investment_amount',
+                         'employment_years', 'credit_score', 'num_dependents',
+                         'savings_rate', 'debt_to_income', 'financial_health_score',
+                         'investment_risk_score']
+}
+
+
+def invalid_profile_fields(columns: Dict[str, np.ndarray], integers: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Per field, the rows whose value is missing (NaN) or outside PROFILE_LIMITS
+    (vectorized). With integers=True, fractional values in
+    INTEGER_PROFILE_FIELDS are invalid too, as FinancialProfile rejects them.
+    """
+    invalid = {}
+    for field, (low, high) in PROFILE_LIMITS.items():
+        values = np.asarray(columns[field], dtype=np.float64)
+        bad = np.isnan(values)
+        if low is not None:
+            bad |= values < low
+        if high is not None:
+            bad |= values > high
+        if integers and field in INTEGER_PROFILE_FIELDS:
+            bad |= values != np.floor(values)
+        invalid[field] = bad
+    return invalid
+
+
+def valid_profile_mask(columns: Dict[str, np.ndarray], integers: bool = False) -> np.ndarray:
+    """Rows whose fields are all present and within PROFILE_LIMITS (vectorized)"""
+    return ~np.logical_or.reduce(list(invalid_profile_fields(columns, integers).values()))
+
+
+class FeatureAssembler:
+    """Builds float32 feature matrices directly from profiles"""
+
+    def __init__(self, model_features: Dict[str, List[str]] = MODEL_FEATURES):
+        self.model_features = model_features
+        # Compile each model's feature list into column indices once
+        self.indices = {
+            model_name: np.array([FEATURE_INDEX[f] for f in features], dtype=np.intp)
+            for model_name, features in model_features.items()
+        }
+
+    def build(self, profiles: Sequence[Any]) -> np.ndarray:
+        """Build the full feature matrix for profile objects (one row each)"""
+
+        raw = np.array(
+            [
+                (p.age, p.income, p.expenses, p.savings, p.debt, p.employment_years,
+                 p.credit_score, p.num_dependents, p.investment_amount or 0,
+                 p.property_value or 0)
+                for p in profiles
+            ],
+            dtype=np.float64
+        ).reshape(len(profiles), len(PROFILE_FIELDS))
+        return self._assemble(raw)
+
+    def build_columns(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Build the full feature matrix from one array per profile field"""
+
+        raw = np.column_stack([
+            np.asarray(columns[field], dtype=np.float64) for field in PROFILE_FIELDS
+        ])
+        return self._assemble(raw)
+
+    def _assemble(self, raw: np.ndarray) -> np.ndarray:
+        """Fill a preallocated float32 matrix from raw profile fields"""
+
+        # Derived ratios are computed in float64 and rounded once on store,
+        # which matches what XGBoost does with a float64 DataFrame
+        income = raw[:, FEATURE_INDEX['income']]
+        raw[:, FEATURE_INDEX['expenses']] *= 12  # Convert to annual
+
+        X = np.zeros((raw.shape[0], len(FEATURE_COLUMNS)), dtype=np.float32)
+        X[:, :len(PROFILE_FIELDS)] = raw
+        X[:, FEATURE_INDEX['savings_rate']] = raw[:, FEATURE_INDEX['savings']] / (income + 1)
+        X[:, FEATURE_INDEX['debt_to_income']] = raw[:, FEATURE_INDEX['debt']] / (income + 1)
+        X[:, FEATURE_INDEX['expense_ratio']] = raw[:, FEATURE_INDEX['expenses']] / (income + 1)
+        return X
+
+    def select(self, X: np.ndarray, model_name: str) -> np.ndarray:
+        """Slice the columns a model was trained on, in training order"""
+        return X[:, self.indices[model_name]]
+
+    @staticmethod
+    def column(X: np.ndarray, feature: str) -> np.ndarray:
+        """View of a single feature column"""
+        return X[:, FEATURE_INDEX[feature]]
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Inference Executor
+
+Runs CPU-bound model inference off the asyncio event loop so a slow
+prediction never stalls other requests (or /health probes) on the same
+uvicorn worker.
+
+Work goes to a thread or process pool behind a bounded queue. When the
+queue is full, run() raises ExecutorSaturated right away instead of letting
+latency grow without limit; the server turns that into 503 + Retry-After.
+Tasks beyond max_workers wait in the executor, not the pool, so they start
+in priority order (lower first, then arrival) rather than submission order.
+A task's worker is handed on when the pool job finishes, not when its
+caller stops waiting: a cancelled caller can't stop a job that is already
+running, so its worker stays taken until the job is done.
+"""
+
+import os
+import heapq
+import asyncio
+import logging
+import itertools
+import multiprocessing
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_MODES = ('thread', 'process')
+
+
+class ExecutorSaturated(Exception):
+    """Raised when the inference queue is full"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Inference queue is full")
+        self.retry_after = retry_after
+
+
+def default_threads_per_task(max_workers: int) -> int:
+    """Split the machine's cores evenly between concurrent inference tasks"""
+    return max(1, (os.cpu_count() or 1) // max_workers)
+
+
+class InferenceExecutor:
+    """Bounded thread or process pool for model inference"""
+
+    def __init__(self, mode: str = 'thread', max_workers: int = 4, max_queue: int = 64,
+                 retry_after: int = 1, initializer: Optional[Callable[[], None]] = None):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown executor mode '{mode}', expected one of {EXECUTOR_MODES}")
+
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.initializer = initializer
+
+        self._pool: Optional[Executor] = None
+        self._pending = 0
+        self._running = 0
+        # (priority, arrival, ticket) of tasks waiting for a worker
+        self._waiting: List[Tuple[int, int, 'asyncio.Future[None]']] = []
+        self._seq = itertools.count()
+        self._completed = 0
+        self._rejected = 0
+
+    @property
+    def capacity(self) -> int:
+        """Tasks that can be running or queued at once"""
+        return self.max_workers + self.max_queue
+
+    def start(self) -> None:
+        """Create the worker pool"""
+        if self._pool is not None:
+            return
+
+        if self.mode == 'process':
+            # spawn, not fork: forking after XGBoost has started its OpenMP
+            # threads can deadlock the children
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=self.initializer
+            )
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='inference'
+            )
+        logger.info(f"Inference executor started: {self.mode} pool, "
+                    f"{self.max_workers} workers, queue {self.max_queue}")
+
+    def shutdown(self) -> None:
+        """Stop the worker pool, letting running tasks finish"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def restart(self) -> None:
+        """Replace the worker pool; tasks already on the old pool finish there"""
+        previous = self._pool
+        self._pool = None
+        self.start()
+        if previous is not None:
+            previous.shutdown(wait=False)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, priority: int = 0) -> Any:
+        """
+        Run fn(*args) on the pool, or raise ExecutorSaturated if the queue is
+        full. When every worker is busy, lower priority values start first.
+        """
+
+        if self._pool is None:
+            raise RuntimeError("Inference executor is not started")
+
+        # Only touched from the event loop thread, so no lock is needed
+        if self._pending >= self.capacity:
+            self._rejected += 1
+            raise ExecutorSaturated(self.retry_after)
+
+        self._pending += 1
+        loop = asyncio.get_running_loop()
+        if self._running < self.max_workers:
+            self._running += 1
+        else:
+            ticket = loop.create_future()
+            entry = (priority, next(self._seq), ticket)
+            heapq.heappush(self._waiting, entry)
+            try:
+                await ticket
+            except asyncio.CancelledError:
+                self._pending -= 1
+                if ticket.done() and not ticket.cancelled():
+                    # A worker was handed over just as we were cancelled
+                    self._next()
+                elif entry in self._waiting:
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                raise
+
+        try:
+            job = self._pool.submit(fn, *args)
+        except BaseException:
+            self._pending -= 1
+            self._next()
+            raise
+        # Released from the job, not from this coroutine: if we are
+        # cancelled the job keeps its worker until it is done
+        job.add_done_callback(lambda job: self._call_soon(loop, self._finished, job))
+        return await asyncio.wrap_future(job, loop=loop)
+
+    @staticmethod
+    def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[..., None], *args: Any) -> None:
+        """Schedule callback on the event loop from a pool thread"""
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # The loop is closed (shutdown): nothing is waiting any more
+            pass
+
+    def _finished(self, job: Future) -> None:
+        """A pool job is done (or was cancelled before it started): free its worker"""
+        self._pending -= 1
+        if not job.cancelled():
+            self._completed += 1
+        self._next()
+
+    def _next(self) -> None:
+        """Hand a finished task's worker to the first waiting task, or free it"""
+        while self._waiting:
+            _, _, ticket = heapq.heappop(self._waiting)
+            if not ticket.done():
+                ticket.set_result(None)
+                return
+        self._running -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue and pool counters for /health"""
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._pending,
+            "running": self._running,
+            "waiting": len(self._waiting),
+            "completed": self._completed,
+            "rejected": self._rejected
+        }
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Metrics
+
+Prometheus text-format metrics and per-request stage timing for the ML API.
+
+Each request gets a RequestTiming that splits its latency into stages:
+
+    admission  waiting for an admission slot (admission-controlled endpoints)
+    validate   request body parsing and pydantic validation
+    cache      prediction cache lookups
+    queue      waiting for the inference executor / micro-batch window
+    features   feature matrix build
+    predict    model graph evaluation and response building
+    serialize  response model validation and JSON encoding
+
+TimingMiddleware records the stages into per-endpoint histograms and sends
+them back in a Server-Timing header (milliseconds), so callers can see the
+same breakdown per response.
+"""
+
+import time
+import contextvars
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from starlette.routing import Match, Route
+
+# Latency bucket upper bounds in seconds
+LATENCY_BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """Base class: a named metric family with fixed label names"""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonic counter per label set"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def set(self, *labels: str, value: float) -> None:
+        """Mirror a counter kept elsewhere (executor, cache) at scrape time"""
+        self._values[labels] = value
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+            for labels, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(Metric):
+    """Value that goes up and down per label set"""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, *labels: str, value: float) -> None:
+        self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+            for labels, value in sorted(self._values.items())
+        ]
+
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram per label set"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (),
+                 buckets: List[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = list(buckets)
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, *labels: str, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = series
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        bounds = self.buckets + [float('inf')]
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                bucket_labels = _format_labels(self.label_names + ('le',), labels + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_str = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Metric families rendered together for /metrics.
+
+    Collectors are callables run at scrape time to refresh gauges from
+    state owned elsewhere (executor queue, cache counters, loaded models).
+    """
+
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Iterable[str] = (),
+                  buckets: List[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        for collector in self._collectors:
+            collector()
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class RequestTiming:
+    """Stage durations (seconds) for one request, measured between marks"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self._last = self.start
+        self.stages: Dict[str, float] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def mark(self, stage: str) -> None:
+        """Attribute the time since the previous mark to stage"""
+        now = time.perf_counter()
+        self.add(stage, now - self._last)
+        self._last = now
+
+    def mark_inference(self, worker_stages: Dict[str, float]) -> None:
+        """
+        Record an inference call: the worker's own stage timings, with the
+        rest of the time since the previous mark counted as queueing.
+        """
+        now = time.perf_counter()
+        elapsed = now - self._last
+        for stage, seconds in worker_stages.items():
+            self.add(stage, seconds)
+        self.add('queue', max(0.0, elapsed - sum(worker_stages.values())))
+        self._last = now
+
+    def total(self) -> float:
+        return time.perf_counter() - self.start
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, durations in milliseconds"""
+        entries = [f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in self.stages.items()]
+        entries.append(f"total;dur={self.total() * 1000:.3f}")
+        return ', '.join(entries)
+
+
+_current_timing: contextvars.ContextVar[Optional[RequestTiming]] = contextvars.ContextVar('request_timing', default=None)
+
+
+def current_timing() -> RequestTiming:
+    """Timing of the request being handled (a throwaway one outside requests)"""
+    timing = _current_timing.get()
+    return timing if timing is not None else RequestTiming()
+
+
+class RouteTemplates:
+    """
+    Route template of a request (/predict/batch/{model}), never the raw
+    path. Routes without path parameters match a single path, so their
+    templates are cached without growing unbounded.
+    """
+
+    def __init__(self):
+        self._static: Dict[Tuple[str, str], str] = {}
+
+    def __call__(self, scope: Dict[str, Any]) -> str:
+        key = (scope['method'], scope['path'])
+        template = self._static.get(key)
+        if template is not None:
+            return template
+        router = getattr(scope.get('app'), 'router', None)
+        for route in getattr(router, 'routes', []):
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                if isinstance(route, Route) and not child_scope.get('path_params'):
+                    self._static[key] = route.path
+                return route.path
+        return 'unmatched'
+
+
+class TimingMiddleware:
+    """
+    ASGI middleware: per-request stage timing, Server-Timing header and
+    per-endpoint request metrics. Endpoints are labelled by route template
+    (/predict/batch/{model}), never by raw path.
+    """
+
+    def __init__(self, app: Any, registry: MetricsRegistry, excluded_paths: Iterable[str] = ('/metrics',)):
+        self.app = app
+        self.excluded_paths = set(excluded_paths)
+        self._endpoint = RouteTemplates()
+        self.requests = registry.counter(
+            'fundn3xus_http_requests_total', 'HTTP requests by endpoint, method and status', ['endpoint', 'method', 'status'])
+        self.latency = registry.histogram(
+            'fundn3xus_http_request_duration_seconds', 'End-to-end request latency', ['endpoint'])
+        self.stage_latency = registry.histogram(
+            'fundn3xus_request_stage_duration_seconds', 'Request latency by stage', ['endpoint', 'stage'])
+        self.in_flight = registry.gauge(
+            'fundn3xus_http_requests_in_flight', 'Requests currently being handled', ['endpoint'])
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope['type'] != 'http' or scope['path'] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = _current_timing.set(timing)
+        endpoint = self._endpoint(scope)
+        status = 500
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                # Endpoints that mark no stages get their whole handler time here
+                timing.mark('serialize' if timing.stages else 'handler')
+                headers = list(message.get('headers', []))
+                headers.append((b'server-timing', timing.server_timing().encode('latin-1')))
+                message = {**message, 'headers': headers}
+            await send(message)
+
+        self.in_flight.inc(endpoint)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            self.in_flight.dec(endpoint)
+            _current_timing.reset(token)
+            self.requests.inc(endpoint, scope['method'], str(status))
+            self.latency.observe(endpoint, value=timing.total())
+            for stage, seconds in timing.stages.items():
+                self.stage_latency.observe(endpoint, stage, value=seconds)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Micro-Batcher
+
+Coalesces concurrent single-profile requests for the same model into one
+vectorized prediction. A request waits at most `window_ms` (or until
+`max_batch_size` requests are queued); the batch is then scored in one
+call and each waiting coroutine gets its own result back.
+
+Batch sizes and queue waits are recorded so the window can be tuned for
+throughput without hurting p50.
+"""
+
+import time
+import asyncio
+from bisect import bisect_left
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Histogram bucket upper bounds
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512]
+QUEUE_WAIT_BUCKETS_MS = [0.1, 0.5, 1, 2, 5, 10, 20, 50]
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum and max"""
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [str(b) for b in self.buckets] + ['+Inf']
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else 0.0,
+            "max": round(self.max, 3),
+            "buckets": dict(zip(labels, self.counts))
+        }
+
+
+class MicroBatcher:
+    """Collects single items for one model and scores them in batches"""
+
+    def __init__(self, name: str, run_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+                 window_ms: float = 2.0, max_batch_size: int = 64):
+        self.name = name
+        self.run_batch = run_batch
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+
+        self._pending: List[Tuple[Any, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()  # keep batch tasks referenced until done
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(QUEUE_WAIT_BUCKETS_MS)
+        self.failed_batches = 0
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result"""
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Hand everything queued so far to a new batch task"""
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future, float]]) -> None:
+        """Score one batch and fan the results back out"""
+
+        started = time.perf_counter()
+        self.batch_sizes.observe(len(batch))
+        for _, _, enqueued in batch:
+            self.queue_wait_ms.observe((started - enqueued) * 1000)
+
+        try:
+            results = await self.run_batch([item for item, _, _ in batch])
+        except Exception as e:
+            self.failed_batches += 1
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            # The waiting request may have been cancelled (client disconnect)
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch size and queue wait metrics"""
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch_size": self.max_batch_size,
+            "queued": len(self._pending),
+            "failed_batches": self.failed_batches,
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot()
+        }
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Model Graph
+
+Declares which models consume other models' outputs and evaluates them in
+dependency order. Every model needed for a request runs exactly once over
+the whole batch and its output is memoized for the rest of the request,
+so e.g. the scenario planner reuses the health and risk predictions instead
+of re-running (or mocking) them.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Set
+
+import numpy as np
+
+# fn(features, upstream_outputs, context) -> output array with one entry per row.
+# context is whatever the caller passes to evaluate() (the server's model set).
+NodeFn = Callable[[np.ndarray, Dict[str, np.ndarray], Any], np.ndarray]
+
+
+class ModelNode:
+    """One model in the graph"""
+
+    def __init__(self, name: str, fn: NodeFn, dependencies: Iterable[str] = ()):
+        self.name = name
+        self.fn = fn
+        self.dependencies = list(dependencies)
+
+
+class ModelGraph:
+    """DAG of models evaluated with per-request memoization"""
+
+    def __init__(self, nodes: List[ModelNode]):
+        self.nodes = {node.name: node for node in nodes}
+        for node in nodes:
+            for dependency in node.dependencies:
+                if dependency not in self.nodes:
+                    raise ValueError(f"{node.name} depends on unknown model {dependency}")
+        # Fails fast on cycles
+        for name in self.nodes:
+            self.requires(name)
+
+    def requires(self, name: str) -> List[str]:
+        """Models needed to produce `name`, upstream first, ending with `name`"""
+        order: List[str] = []
+        self._visit(name, order, set())
+        return order
+
+    def _visit(self, name: str, order: List[str], visiting: Set[str]) -> None:
+        if name in order:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle through {name}")
+        visiting.add(name)
+        for dependency in self.nodes[name].dependencies:
+            self._visit(dependency, order, visiting)
+        visiting.discard(name)
+        order.append(name)
+
+    def missing(self, name: str, available: Iterable[str]) -> List[str]:
+        """Models needed for `name` that are not available"""
+        available = set(available)
+        return [m for m in self.requires(name) if m not in available]
+
+    def evaluate(self, features: np.ndarray, targets: Iterable[str], context: Any = None) -> Dict[str, np.ndarray]:
+        """Run every model needed for `targets` once, in dependency order"""
+        outputs: Dict[str, np.ndarray] = {}
+        for target in targets:
+            for name in self.requires(target):
+                if name not in outputs:
+                    node = self.nodes[name]
+                    upstream = {d: outputs[d] for d in node.dependencies}
+                    outputs[name] = node.fn(features, upstream, context)
+        return outputs
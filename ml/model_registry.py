@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Model Registry
+
+Versioned storage for the trained models. Each model is saved in XGBoost's
+native UBJSON format next to a manifest.json that records its version,
+feature schema, class labels and SHA-256 checksum:
+
+    models/
+    ├── manifest.json
+    ├── investment_risk.ubj
+    ├── affordability.ubj
+    ├── health_score.ubj
+    └── scenario_planner.ubj
+
+LazyModelStore loads each model on first use only, so a worker pays load
+time and memory only for the models it actually serves. ModelSet bundles a
+store with everything derived from it, so the server can swap a whole
+generation of models at once.
+
+Usage:
+    python model_registry.py export    # convert the legacy .pkl files in MODELS_DIR
+"""
+
+import os
+import sys
+import json
+import hashlib
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional
+
+import numpy as np
+from sklearn.preprocessing import LabelEncoder
+from xgboost import XGBClassifier, XGBRegressor
+
+from feature_schema import MODEL_FEATURES
+from tree_engine import FlatTreeEnsemble, parse_engine_models
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_FORMAT_VERSION = 1
+ARTIFACT_FORMAT = 'xgboost-ubj'
+
+# Legacy joblib artifacts written by earlier versions of train_model.py
+LEGACY_MODEL_FILES = {
+    'investment_risk': 'investment_risk_model.pkl',
+    'affordability': 'affordability_model.pkl',
+    'health_score': 'health_score_model.pkl',
+    'scenario_planner': 'scenario_planner_model.pkl'
+}
+
+
+def file_checksum(path: str) -> str:
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def manifest_path(models_dir: str) -> str:
+    return os.path.join(models_dir, MANIFEST_FILE)
+
+
+def read_manifest(models_dir: str) -> Optional[Dict[str, Any]]:
+    """Load the manifest, or None if the directory has no registry"""
+    path = manifest_path(models_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != MANIFEST_FORMAT_VERSION:
+        raise ValueError(f"Unsupported manifest format {manifest.get('format_version')} in {path}")
+    return manifest
+
+
+def export_models(trained: Dict[str, Any], models_dir: str) -> Dict[str, Any]:
+    """
+    Save trained models in native format and write the manifest.
+
+    `trained` uses the trainer's layout: estimators keyed by model name, with
+    the scenario planner stored as {'model', 'label_encoder', 'feature_names'}.
+    """
+
+    os.makedirs(models_dir, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')
+    entries = {}
+
+    for model_name, model in trained.items():
+        estimator = model['model'] if isinstance(model, dict) else model
+        classes = None
+        if isinstance(model, dict) and 'label_encoder' in model:
+            classes = [str(c) for c in model['label_encoder'].classes_]
+
+        artifact = f"{model_name}.ubj"
+        path = os.path.join(models_dir, artifact)
+        estimator.save_model(path)
+        checksum = file_checksum(path)
+
+        entries[model_name] = {
+            'version': f"{stamp}-{checksum[:8]}",
+            'artifact': artifact,
+            'format': ARTIFACT_FORMAT,
+            'kind': 'classifier' if classes is not None else 'regressor',
+            'features': list(MODEL_FEATURES[model_name]),
+            'classes': classes,
+            'sha256': checksum
+        }
+
+    manifest = {
+        'format_version': MANIFEST_FORMAT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'models': entries
+    }
+    # Write then rename so readers never see a half-written manifest
+    tmp_path = manifest_path(models_dir) + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path(models_dir))
+    return manifest
+
+
+def load_native_model(models_dir: str, model_name: str, entry: Dict[str, Any]) -> Any:
+    """Load one model from the registry, verifying its checksum"""
+
+    path = os.path.join(models_dir, entry['artifact'])
+    checksum = file_checksum(path)
+    if checksum != entry['sha256']:
+        raise ValueError(f"Checksum mismatch for {model_name}: {path} does not match the manifest")
+
+    if entry['kind'] == 'classifier':
+        estimator = XGBClassifier()
+        estimator.load_model(path)
+        label_encoder = LabelEncoder()
+        label_encoder.classes_ = np.array(entry['classes'], dtype=object)
+        return {'model': estimator, 'label_encoder': label_encoder, 'feature_names': entry['features']}
+
+    estimator = XGBRegressor()
+    estimator.load_model(path)
+    return estimator
+
+
+class LazyModelStore(Mapping):
+    """
+    Read-only mapping of model name -> model that loads on first access.
+
+    `name in store` only checks that an artifact exists; nothing is loaded
+    until the model is actually used. on_load runs once per model right
+    after it is loaded (thread count, tree engine, ...).
+    """
+
+    def __init__(self, loaders: Dict[str, Callable[[], Any]], versions: Dict[str, str],
+                 on_load: Optional[Callable[[str, Any], None]] = None):
+        self._loaders = loaders
+        self.versions = versions
+        self._on_load = on_load
+        self._loaded: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        # Seconds each model took to load (including on_load)
+        self.load_seconds: Dict[str, float] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        model = self._loaded.get(name)
+        if model is not None:
+            return model
+        if name not in self._loaders:
+            raise KeyError(name)
+
+        # Inference threads may race to load the same model
+        with self._lock:
+            if name not in self._loaded:
+                start = time.perf_counter()
+                model = self._loaders[name]()
+                if self._on_load is not None:
+                    self._on_load(name, model)
+                self.load_seconds[name] = time.perf_counter() - start
+                self._loaded[name] = model
+                logger.info(f"Loaded {name} model (version {self.versions.get(name)})")
+        return self._loaded[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._loaders
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._loaders)
+
+    def __len__(self) -> int:
+        return len(self._loaders)
+
+    @property
+    def loaded(self) -> List[str]:
+        return list(self._loaded)
+
+    def load_all(self) -> None:
+        for name in self._loaders:
+            self[name]
+
+
+def open_registry(models_dir: str, on_load: Optional[Callable[[str, Any], None]] = None) -> LazyModelStore:
+    """
+    Open MODELS_DIR as a lazy model store.
+
+    Uses the native manifest when present, otherwise falls back to the legacy
+    joblib files. Never trains: missing models are simply absent.
+    """
+
+    manifest = read_manifest(models_dir)
+    loaders: Dict[str, Callable[[], Any]] = {}
+    versions: Dict[str, str] = {}
+
+    if manifest is not None:
+        for model_name, entry in manifest['models'].items():
+            loaders[model_name] = (lambda n=model_name, e=entry: load_native_model(models_dir, n, e))
+            versions[model_name] = entry['version']
+        logger.info(f"Model registry: {len(loaders)} native models in {manifest_path(models_dir)}")
+    else:
+        import joblib
+        for model_name, filename in LEGACY_MODEL_FILES.items():
+            path = os.path.join(models_dir, filename)
+            if os.path.exists(path):
+                loaders[model_name] = (lambda p=path: joblib.load(p))
+                versions[model_name] = file_checksum(path)[:12]
+        logger.warning(f"No {MANIFEST_FILE} in {models_dir}; using legacy joblib artifacts. "
+                       f"Run 'python model_registry.py export' to convert them.")
+
+    return LazyModelStore(loaders, versions, on_load=on_load)
+
+
+class ModelSet:
+    """
+    One generation of served models: a lazy store plus the flattened tree
+    engines built from it.
+
+    The server holds a single reference to the active set and replaces it
+    wholesale on reload, so a request that grabbed the set up front keeps
+    using the same model versions until it finishes.
+    """
+
+    def __init__(self, models_dir: str, nthread: Optional[int] = None,
+                 tree_engine_models: str = '', tree_engine_max_rows: int = 16):
+        self.models_dir = models_dir
+        self.nthread = nthread
+        self.tree_engine_max_rows = tree_engine_max_rows
+        self.tree_engines: Dict[str, FlatTreeEnsemble] = {}
+        self.tree_engine_models: set = set()
+        # Per-set micro-batchers, filled in by the server
+        self.batchers: Dict[str, Any] = {}
+        self.created_at = datetime.now(timezone.utc).isoformat()
+
+        self.store = open_registry(models_dir, on_load=self._configure)
+        self.versions = self.store.versions
+        self.tree_engine_models = set(parse_engine_models(tree_engine_models, list(self.store)))
+        for model_name in self.tree_engine_models - set(self.store):
+            logger.warning(f"TREE_ENGINE_MODELS lists unknown model {model_name}")
+
+    def _configure(self, model_name: str, model: Any) -> None:
+        """Runs once per model, right after the store loads it"""
+        estimator = model['model'] if isinstance(model, dict) else model
+        if self.nthread:
+            # Models are trained with n_jobs=-1; cap threads per task so
+            # concurrent inference tasks don't oversubscribe the cores
+            estimator.n_jobs = self.nthread
+            estimator.get_booster().set_param({'nthread': self.nthread})
+
+        if model_name in self.tree_engine_models:
+            self.tree_engines[model_name] = FlatTreeEnsemble.from_xgboost(estimator)
+            logger.info(f"Serving {model_name} with the flattened tree engine")
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.store
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.store)
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    @property
+    def loaded(self) -> List[str]:
+        return self.store.loaded
+
+    def load_all(self) -> None:
+        self.store.load_all()
+
+    def model(self, model_name: str) -> Any:
+        """Model as stored (the scenario planner is a dict with its label encoder)"""
+        return self.store[model_name]
+
+    def estimator(self, model_name: str) -> Any:
+        """XGBoost estimator for a model"""
+        model = self.store[model_name]
+        return model['model'] if isinstance(model, dict) else model
+
+    def predictor(self, model_name: str, n_rows: int) -> Any:
+        """Estimator used for inference: the flattened tree engine for small batches if enabled, else XGBoost"""
+        estimator = self.estimator(model_name)  # loads the model (and its tree engine) on first use
+        if model_name in self.tree_engines and n_rows <= self.tree_engine_max_rows:
+            return self.tree_engines[model_name]
+        return estimator
+
+    def versions_for(self, model_names: List[str]) -> Dict[str, str]:
+        """Versions of the given models"""
+        return {name: self.versions.get(name, '') for name in model_names}
+
+
+def main():
+    """Convert the legacy joblib artifacts in MODELS_DIR to the native registry"""
+    import joblib
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+    models_dir = os.getenv('MODELS_DIR', 'models')
+
+    if len(sys.argv) < 2 or sys.argv[1] != 'export':
+        print(__doc__)
+        sys.exit(1)
+
+    trained = {}
+    for model_name, filename in LEGACY_MODEL_FILES.items():
+        path = os.path.join(models_dir, filename)
+        if os.path.exists(path):
+            trained[model_name] = joblib.load(path)
+        else:
+            logger.warning(f"Skipping {model_name}: {path} not found")
+
+    manifest = export_models(trained, models_dir)
+    for model_name, entry in manifest['models'].items():
+        logger.info(f"Exported {model_name} -> {entry['artifact']} (version {entry['version']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Model Hot Reload
+
+Picks up retrained artifacts without restarting the server:
+
+1. build a new ModelSet from MODELS_DIR and load every model, on a
+   background thread so the event loop keeps serving
+2. validate it against the golden profiles
+3. hand it to the server, which swaps its active set in one assignment
+
+Requests already running keep the set they started with, so they finish
+on the old versions. A reload is triggered from the admin endpoint or by
+ModelWatcher, which polls MODELS_DIR for changed artifacts. Under the
+prefork supervisor, the supervisor polls (with ArtifactChangeDetector)
+and validates instead, so one retrain is one rolling restart.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from model_registry import MANIFEST_FILE, LEGACY_MODEL_FILES
+
+logger = logging.getLogger(__name__)
+
+# Files whose changes trigger a reload
+WATCHED_SUFFIXES = ('.ubj', '.pkl')
+
+# Recent reload results kept for /health
+RELOAD_HISTORY_SIZE = 10
+
+
+def registry_fingerprint(models_dir: str) -> Tuple[Tuple[str, int, int], ...]:
+    """(name, mtime_ns, size) for the manifest and every model artifact"""
+    watched = {MANIFEST_FILE, *LEGACY_MODEL_FILES.values()}
+    entries = []
+    try:
+        with os.scandir(models_dir) as it:
+            for entry in it:
+                if entry.name in watched or entry.name.endswith(WATCHED_SUFFIXES):
+                    stat = entry.stat()
+                    entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    except FileNotFoundError:
+        pass
+    return tuple(sorted(entries))
+
+
+class ArtifactChangeDetector:
+    """
+    Tells when the artifacts in a models directory have changed.
+
+    A change must look the same on two consecutive polls before it counts,
+    so a trainer still writing files doesn't trigger a reload halfway
+    through.
+    """
+
+    def __init__(self, models_dir: str):
+        self.models_dir = models_dir
+        self._seen = registry_fingerprint(models_dir)
+        self._pending: Optional[Tuple[Tuple[str, int, int], ...]] = None
+
+    def poll(self) -> bool:
+        """True once per settled change"""
+        current = registry_fingerprint(self.models_dir)
+        if current == self._seen:
+            self._pending = None
+            return False
+        if current != self._pending:
+            # Changed since the last poll: wait for the writer to finish
+            self._pending = current
+            return False
+        self._seen = current
+        self._pending = None
+        return True
+
+
+class ReloadInProgress(Exception):
+    """Raised when a reload is requested while another one is running"""
+
+
+class ModelReloader:
+    """
+    Builds, validates and activates new model sets, one reload at a time.
+
+    build() returns a new (unloaded) model set, validate(model_set) returns a
+    report dict with a boolean 'passed', and activate(model_set) swaps it in
+    (returning a different status, e.g. 'restarting', when the swap is
+    delegated elsewhere). current_versions() gives the versions being served,
+    so a reload that finds nothing new can be skipped.
+    """
+
+    def __init__(self, build: Callable[[], Any], validate: Callable[[Any], Dict[str, Any]],
+                 activate: Callable[[Any], Optional[str]], current_versions: Callable[[], Dict[str, str]]):
+        self._build = build
+        self._validate = validate
+        self._activate = activate
+        self._current_versions = current_versions
+        self._lock = asyncio.Lock()
+        self.history: List[Dict[str, Any]] = []
+        self.swaps = 0
+        self.rejections = 0
+        self.failures = 0
+
+    @property
+    def in_progress(self) -> bool:
+        return self._lock.locked()
+
+    def _prepare(self) -> Tuple[Any, Dict[str, Any]]:
+        """Load every model of a new set and validate it; runs off the event loop"""
+        model_set = self._build()
+        model_set.load_all()
+        return model_set, self._validate(model_set)
+
+    async def reload(self, trigger: str, force: bool = False) -> Dict[str, Any]:
+        """
+        Load, validate and swap in the artifacts currently in MODELS_DIR.
+
+        Returns the reload result; status is 'swapped' (or what activate
+        returned), 'unchanged' (same versions, skipped unless force),
+        'rejected' (validation failed) or 'failed' (artifacts could not be
+        loaded).
+        """
+
+        if self._lock.locked():
+            raise ReloadInProgress()
+
+        async with self._lock:
+            start = time.perf_counter()
+            previous = dict(self._current_versions())
+            result: Dict[str, Any] = {
+                "trigger": trigger,
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "previous_versions": previous
+            }
+
+            try:
+                loop = asyncio.get_running_loop()
+                model_set, report = await loop.run_in_executor(None, self._prepare)
+            except Exception as e:
+                logger.error(f"Model reload ({trigger}) failed to load artifacts: {str(e)}")
+                self.failures += 1
+                result.update(status="failed", error=str(e))
+            else:
+                result.update(versions=dict(model_set.versions), validation=report)
+                if not report['passed']:
+                    logger.error(f"Model reload ({trigger}) rejected by validation: {report.get('errors')}")
+                    self.rejections += 1
+                    result['status'] = "rejected"
+                elif model_set.versions == previous and not force:
+                    result['status'] = "unchanged"
+                else:
+                    result['status'] = self._activate(model_set) or "swapped"
+                    self.swaps += 1
+                    logger.info(f"Model reload ({trigger}) {result['status']}: versions {model_set.versions}")
+
+            result['duration_ms'] = round((time.perf_counter() - start) * 1000, 1)
+            self.history = (self.history + [result])[-RELOAD_HISTORY_SIZE:]
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Reload counters for /health"""
+        last = self.history[-1] if self.history else None
+        return {
+            "in_progress": self.in_progress,
+            "swaps": self.swaps,
+            "rejections": self.rejections,
+            "failures": self.failures,
+            "last": {k: last[k] for k in ('trigger', 'status', 'started_at', 'duration_ms')} if last else None
+        }
+
+
+class ModelWatcher:
+    """Polls MODELS_DIR and calls on_change when the artifacts change (see ArtifactChangeDetector)"""
+
+    def __init__(self, models_dir: str, interval: float, on_change: Callable[[], Awaitable[Any]]):
+        self.models_dir = models_dir
+        self.interval = interval
+        self.on_change = on_change
+        self._changes = ArtifactChangeDetector(models_dir)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"Watching {self.models_dir} for new models every {self.interval}s")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self._changes.poll():
+                continue
+            try:
+                await self.on_change()
+            except ReloadInProgress:
+                # An admin reload is already picking up these files
+                pass
+            except Exception as e:
+                logger.error(f"Model watcher reload failed: {str(e)}")
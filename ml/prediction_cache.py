@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Prediction Cache
+
+LRU + TTL cache for model responses. Keys are a canonical hash of the
+profile fields plus the version of the model that produced the response,
+so entries stop matching as soon as new artifacts are loaded.
+
+Float inputs can optionally be quantized (e.g. income to the nearest 100)
+so near-identical profiles share an entry.
+"""
+
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def parse_quantize_spec(spec: str) -> Dict[str, float]:
+    """Parse 'income=100,savings=50' into {'income': 100.0, 'savings': 50.0}"""
+    steps = {}
+    for part in spec.split(','):
+        if not part.strip():
+            continue
+        field, _, step = part.partition('=')
+        steps[field.strip()] = float(step)
+    return steps
+
+
+class PredictionCache:
+    """Bounded LRU cache with per-entry TTL"""
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 300,
+                 quantize: Optional[Dict[str, float]] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.quantize = quantize or {}
+
+        # key -> (expires_at, value); only used from the event loop thread
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def canonical(self, fields: Dict[str, Any]) -> Dict[str, float]:
+        """Normalize profile fields: missing optionals become 0, quantized fields snap to their step"""
+        canonical = {}
+        for field, value in fields.items():
+            value = float(value or 0)
+            step = self.quantize.get(field)
+            if step:
+                value = round(value / step) * step
+            canonical[field] = value
+        return canonical
+
+    def key(self, model_name: str, model_version: str, fields: Dict[str, Any]) -> str:
+        """Cache key for one model's response to one profile"""
+        payload = json.dumps(self.canonical(fields), sort_keys=True, separators=(',', ':'))
+        digest = hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+        return f"{model_name}:{model_version}:{digest}"
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for /health"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "quantize": self.quantize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Prefork Supervisor
+
+Production serving for server.py: the parent process binds the listening
+socket, preloads every model, then forks N uvicorn workers that share the
+model memory copy-on-write (XGBoost boosters live in native memory that the
+workers only read, so the pages stay shared).
+
+Worker lifecycle:
+- a worker that exits (crash, or MAX_REQUESTS recycling) is replaced;
+  one whose startup failed (e.g. warmup) is replaced after a backoff
+- SIGHUP, or a change seen by the watch hook: graceful restart. The parent
+  loads and validates the new models, forks a new generation of workers
+  on the same socket, then asks the old generation to finish its
+  in-flight requests and exit. Models that fail to load or validate are
+  dropped and the current workers keep serving
+- SIGTERM / SIGINT: graceful shutdown of every worker, then exit
+
+Models must only be loaded (never used for prediction) in the parent:
+forking after XGBoost has started its OpenMP threads can deadlock the
+workers. The validate hook therefore runs in a short-lived forked child,
+on the very objects the workers will inherit.
+"""
+
+import os
+import gc
+import sys
+import time
+import random
+import signal
+import socket
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import uvicorn
+from uvicorn.config import STARTUP_FAILURE
+
+logger = logging.getLogger(__name__)
+
+# Set in each worker right after fork
+_supervisor_pid: Optional[int] = None
+
+# Seconds before replacing a worker that failed to start, doubling with
+# each consecutive failure up to the maximum
+RESPAWN_BACKOFF = 1.0
+RESPAWN_BACKOFF_MAX = 30.0
+
+
+def supervisor_pid() -> Optional[int]:
+    """PID of the supervisor if this process is one of its workers, else None"""
+    return _supervisor_pid
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Listening socket shared by every worker generation"""
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class PreforkSupervisor:
+    """
+    Preloads the app's models and keeps N forked uvicorn workers running.
+
+    preload() loads and returns a new model set; validate(models) checks it
+    (in a forked child) and activate(models) makes it the set the next
+    workers inherit. watch() is polled every watch_interval seconds and
+    returns True when the models on disk have changed.
+    """
+
+    def __init__(self, app: Any, host: str, port: int, workers: int,
+                 preload: Optional[Callable[[], Any]] = None,
+                 validate: Optional[Callable[[Any], bool]] = None,
+                 activate: Optional[Callable[[Any], None]] = None,
+                 watch: Optional[Callable[[], bool]] = None, watch_interval: float = 0,
+                 max_requests: int = 0, max_requests_jitter: int = 0,
+                 graceful_timeout: float = 30, log_level: str = 'info'):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.preload = preload
+        self.validate = validate
+        self.activate = activate
+        self.watch = watch
+        self.watch_interval = watch_interval
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self.log_level = log_level
+
+        self.sock: Optional[socket.socket] = None
+        self.generation = 0
+        self._workers: Dict[int, int] = {}   # pid -> generation
+        self._retiring: Dict[int, float] = {}  # pid -> kill deadline
+        self._restart_requested = False
+        self._stopping = False
+        self._failed_starts = 0
+        self._next_spawn = 0.0
+
+    # Signal handlers only set flags; the main loop does the work
+
+    def _on_hup(self, signum: int, frame: Any) -> None:
+        self._restart_requested = True
+
+    def _on_stop(self, signum: int, frame: Any) -> None:
+        self._stopping = True
+
+    def run(self) -> None:
+        """Bind, preload, fork the workers and supervise them until stopped"""
+
+        self.sock = bind_socket(self.host, self.port)
+        logger.info(f"Prefork supervisor {os.getpid()} listening on {self.host}:{self.port}")
+
+        if not self._preload():
+            raise RuntimeError("Models failed to load or validate; not starting workers")
+        signal.signal(signal.SIGHUP, self._on_hup)
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+
+        self.generation = 1
+        for _ in range(self.workers):
+            self._spawn()
+
+        next_watch = time.monotonic() + self.watch_interval
+        try:
+            while not self._stopping:
+                self._reap()
+                if self.watch is not None and self.watch_interval > 0 and time.monotonic() >= next_watch:
+                    next_watch = time.monotonic() + self.watch_interval
+                    if self.watch():
+                        logger.info("Model artifacts changed")
+                        self._restart_requested = True
+                if self._restart_requested:
+                    self._restart_requested = False
+                    self._graceful_restart()
+                self._enforce_retire_deadlines()
+                self._replace_missing()
+                time.sleep(0.2)
+        finally:
+            self._shutdown()
+
+    def _preload(self) -> bool:
+        """
+        Load, validate and activate new models, then keep the loaded objects
+        out of the GC's way. False (and the current models kept) if they
+        fail to load or validate.
+        """
+        if self.preload is None:
+            return True
+        start = time.perf_counter()
+        gc.unfreeze()
+        models = None
+        try:
+            models = self.preload()
+            if self.validate is not None and not self._validate_in_child(models):
+                logger.error("Preloaded models failed validation")
+                models = None
+                return False
+            if self.activate is not None:
+                self.activate(models)
+        except Exception as e:
+            logger.error(f"Model preload failed: {str(e)}")
+            models = None
+            return False
+        finally:
+            # Rejected models are collected here. Objects that survive this
+            # collection are never scanned by the GC again, so it doesn't
+            # write to (and un-share) their pages in the workers
+            gc.collect()
+            gc.freeze()
+        logger.info(f"Preloaded and validated models in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return True
+
+    def _validate_in_child(self, models: Any) -> bool:
+        """Run the validate hook in a forked child, so its predictions never start threads in this process"""
+        pid = os.fork()
+        if pid == 0:
+            for signum in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, signal.SIG_DFL)
+            exit_code = 1
+            try:
+                exit_code = 0 if self.validate(models) else 1
+            except BaseException:
+                logger.exception("Model validation crashed")
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(exit_code)
+
+        _, status = os.waitpid(pid, 0)
+        return os.waitstatus_to_exitcode(status) == 0
+
+    def _spawn(self) -> None:
+        """Fork one worker of the current generation"""
+
+        limit = None
+        if self.max_requests > 0:
+            # Jitter so workers don't all recycle at the same moment
+            limit = self.max_requests + random.randint(0, max(0, self.max_requests_jitter))
+
+        pid = os.fork()
+        if pid:
+            self._workers[pid] = self.generation
+            return
+
+        # Child: run uvicorn on the inherited socket, never return
+        global _supervisor_pid
+        _supervisor_pid = os.getppid()
+        for signum in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, signal.SIG_DFL)
+
+        exit_code = 0
+        try:
+            config = uvicorn.Config(
+                self.app,
+                log_level=self.log_level,
+                limit_max_requests=limit,
+                timeout_graceful_shutdown=self.graceful_timeout
+            )
+            uvicorn.Server(config).run(sockets=[self.sock])
+        except SystemExit as e:
+            # uvicorn exits with STARTUP_FAILURE when the app's startup
+            # (e.g. its warmup) fails, before accepting any connection
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except BaseException:
+            logger.exception("Worker crashed")
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exit_code)
+
+    def _reap(self) -> None:
+        """Collect exited workers"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+            self._retiring.pop(pid, None)
+            generation = self._workers.pop(pid, None)
+            if generation == self.generation and not self._stopping:
+                code = os.waitstatus_to_exitcode(status)
+                if code != STARTUP_FAILURE:
+                    self._failed_starts = 0
+                    logger.info(f"Worker {pid} exited ({code}); replacing it")
+                    continue
+                # Back off so a worker that can't start isn't forked in a tight loop
+                delay = min(RESPAWN_BACKOFF * 2 ** self._failed_starts, RESPAWN_BACKOFF_MAX)
+                self._failed_starts += 1
+                self._next_spawn = max(self._next_spawn, time.monotonic() + delay)
+                logger.warning(f"Worker {pid} failed to start; replacing it in {delay:g}s")
+
+    def _replace_missing(self) -> None:
+        """Keep the current generation at full strength"""
+        if self._stopping or time.monotonic() < self._next_spawn:
+            return
+        current = sum(1 for g in self._workers.values() if g == self.generation)
+        for _ in range(self.workers - current):
+            self._spawn()
+
+    def _graceful_restart(self) -> None:
+        """Reload models and replace every worker without closing the socket"""
+
+        logger.info("Graceful restart: reloading and validating models")
+        if not self._preload():
+            logger.error("Keeping the current workers: the new models did not load or validate")
+            return
+
+        old = [pid for pid, g in self._workers.items() if g == self.generation]
+        self.generation += 1
+        self._failed_starts = 0
+        self._next_spawn = 0.0
+        for _ in range(self.workers):
+            self._spawn()
+
+        # New workers already share the socket; old ones finish their requests
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        for pid in old:
+            self._retiring[pid] = deadline
+            self._signal(pid, signal.SIGTERM)
+        logger.info(f"Generation {self.generation} started; retiring {len(old)} workers")
+
+    def _enforce_retire_deadlines(self) -> None:
+        now = time.monotonic()
+        for pid, deadline in list(self._retiring.items()):
+            if now > deadline:
+                logger.warning(f"Worker {pid} did not exit in time; killing it")
+                self._signal(pid, signal.SIGKILL)
+                del self._retiring[pid]
+
+    def _signal(self, pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def _shutdown(self) -> None:
+        """Stop every worker gracefully, killing stragglers after the timeout"""
+
+        logger.info(f"Shutting down {len(self._workers)} workers")
+        for pid in self._workers:
+            self._signal(pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while self._workers and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for pid in list(self._workers):
+            self._signal(pid, signal.SIGKILL)
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self._workers.clear()
+        if self.sock is not None:
+            self.sock.close()
+
+    def worker_pids(self) -> List[int]:
+        return list(self._workers)
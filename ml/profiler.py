@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Profiling Hooks
+
+Two ways to see where request time goes in a running server:
+
+- SamplingProfiler: a background thread snapshots every thread's Python
+  stack at a fixed interval for N seconds (or until N requests have
+  finished) and returns the counts in collapsed-stack format, one
+  `frame;frame;frame count` line per distinct stack. Feed it to
+  flamegraph.pl, speedscope or inferno. Nothing is installed in the
+  profiled threads, so the overhead is one stack walk per interval.
+
+- Per-request cProfile: a request sent with `X-Profile: 1` runs under
+  cProfile. The profiler is on only while that request's own coroutine
+  runs, and off whenever it awaits, so other requests interleaved on the
+  event loop are neither recorded nor slowed down. The response carries
+  an X-Profile-Summary header with the top functions and an X-Profile-Id
+  header; the full summary is kept in a small in-memory store for
+  retrieval. Only one request is profiled at a time, other requests
+  asking for it are served normally.
+
+Both are opt-in and bounded (one session at a time, capped duration and
+stack count), so they can be used on a server under production load.
+"""
+
+import os
+import sys
+import time
+import uuid
+import asyncio
+import cProfile
+import pstats
+import threading
+import contextvars
+from collections import OrderedDict
+from io import StringIO
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_ID_HEADER = 'X-Profile-Id'
+PROFILE_SUMMARY_HEADER = 'X-Profile-Summary'
+
+# Leaf frames of threads that are waiting, not working (event loop select,
+# idle pool workers); dropped unless idle samples are asked for
+IDLE_FRAMES = {
+    ('selectors.py', 'select'),
+    ('threading.py', 'wait'),
+    ('queue.py', 'get'),
+    ('thread.py', '_worker'),
+    ('process.py', '_worker'),
+    ('connection.py', 'wait'),
+}
+
+PSTATS_SORT_KEYS = ('cumulative', 'tottime', 'calls', 'ncalls', 'time')
+
+
+class ProfilerBusy(Exception):
+    """Raised when a sampling session is requested while another one is running"""
+
+
+def _frame_label(code: Any) -> str:
+    path = code.co_filename
+    short = os.path.join(os.path.basename(os.path.dirname(path)), os.path.basename(path))
+    # ';' separates frames in collapsed stacks
+    return f"{code.co_name} ({short}:{code.co_firstlineno})".replace(';', ':')
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for the current process, one session at a time.
+
+    Sessions end after `seconds` or once `requests` requests have finished
+    (whichever comes first, never later than max_seconds). Requests are
+    counted by request_finished(), which ProfilingMiddleware calls.
+    """
+
+    def __init__(self, max_seconds: float = 60, max_stacks: int = 20000, max_depth: int = 128):
+        self.max_seconds = max_seconds
+        self.max_stacks = max_stacks
+        self.max_depth = max_depth
+        self._running = False
+        self._remaining_requests: Optional[int] = None
+        self._requests_done: Optional[asyncio.Event] = None
+        self._requests_seen = 0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def request_finished(self) -> None:
+        """Count one finished request toward a request-bounded session (event loop thread only)"""
+        if not self._running:
+            return
+        self._requests_seen += 1
+        if self._remaining_requests is not None:
+            self._remaining_requests -= 1
+            if self._remaining_requests <= 0:
+                self._requests_done.set()
+
+    def _sample_loop(self, stop: threading.Event, interval: float, include_idle: bool,
+                     counts: Dict[str, int], totals: Dict[str, int]) -> None:
+        own_ident = threading.get_ident()
+        overflow = '[truncated: too many distinct stacks]'
+        while not stop.wait(interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                code = frame.f_code
+                if not include_idle and (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                    continue
+
+                labels = []
+                while frame is not None and len(labels) < self.max_depth:
+                    labels.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                labels.append(names.get(ident, f'thread-{ident}').replace(';', ':'))
+                stack = ';'.join(reversed(labels))
+
+                if stack not in counts and len(counts) >= self.max_stacks:
+                    stack = overflow
+                counts[stack] = counts.get(stack, 0) + 1
+                totals['samples'] += 1
+            totals['ticks'] += 1
+
+    async def profile(self, seconds: Optional[float] = None, requests: Optional[int] = None,
+                      interval: float = 0.01, include_idle: bool = False) -> Dict[str, Any]:
+        """
+        Sample until the time or request budget runs out.
+
+        Returns {'collapsed': text, 'samples', 'ticks', 'duration_seconds',
+        'requests'}. Raises ProfilerBusy if a session is already running.
+        """
+
+        if self._running:
+            raise ProfilerBusy()
+        timeout = min(seconds or self.max_seconds, self.max_seconds)
+
+        self._running = True
+        self._requests_seen = 0
+        self._remaining_requests = requests
+        self._requests_done = asyncio.Event()
+        counts: Dict[str, int] = {}
+        totals = {'samples': 0, 'ticks': 0}
+        stop = threading.Event()
+        sampler = threading.Thread(
+            target=self._sample_loop, args=(stop, max(interval, 0.001), include_idle, counts, totals),
+            name='sampling-profiler', daemon=True
+        )
+
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            if requests:
+                try:
+                    await asyncio.wait_for(self._requests_done.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(timeout)
+        finally:
+            stop.set()
+            await asyncio.get_running_loop().run_in_executor(None, sampler.join)
+            self._running = False
+            self._remaining_requests = None
+
+        lines = [f"{stack} {count}" for stack, count in sorted(counts.items())]
+        return {
+            "collapsed": '\n'.join(lines) + '\n' if lines else '',
+            "samples": totals['samples'],
+            "ticks": totals['ticks'],
+            "duration_seconds": round(time.perf_counter() - start, 3),
+            "requests": self._requests_seen
+        }
+
+
+class _RawStats:
+    """Stats dict in the shape pstats.Stats loads (anything with create_stats)"""
+
+    def __init__(self, stats: Dict[Any, Any]):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+class RequestProfiles:
+    """The last few per-request cProfile results, by profile id"""
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+
+    def store(self, profile_id: str, method: str, path: str, duration: float,
+              stats: List[Dict[Any, Any]]) -> None:
+        """Keep one request's stats: its own profile plus any from inference workers"""
+        self._entries[profile_id] = {
+            "method": method, "path": path, "duration_seconds": duration, "stats": stats
+        }
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, profile_id: object) -> bool:
+        return profile_id in self._entries
+
+    def summary(self, profile_id: str, sort: str = 'cumulative', limit: int = 40) -> str:
+        """pstats report for one profiled request"""
+        entry = self._entries[profile_id]
+        stream = StringIO()
+        stream.write(f"{entry['method']} {entry['path']} in {entry['duration_seconds'] * 1000:.1f} ms\n")
+        stats = pstats.Stats(_RawStats(entry['stats'][0]), stream=stream)
+        for extra in entry['stats'][1:]:
+            stats.add(_RawStats(extra))
+        stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+
+def top_functions(stats: List[Dict[Any, Any]], limit: int = 5) -> str:
+    """
+    One-line summary of the functions with the most own time, for a response
+    header: 'name (file:line)=1.23ms, ...'
+    """
+    merged = pstats.Stats(_RawStats(stats[0]))
+    for extra in stats[1:]:
+        merged.add(_RawStats(extra))
+    ranked = sorted(merged.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+    return ', '.join(
+        f"{name} ({os.path.basename(path)}:{line})={own * 1000:.2f}ms".replace(',', ';')
+        for (path, line, name), (_, _, own, _, _) in ranked
+    )
+
+
+class _ProfiledCoroutine:
+    """
+    Awaitable that drives coro with profile enabled only while coro itself
+    runs. Whenever coro suspends, the profiler is switched off before
+    control goes back to the event loop, so the coroutines of other
+    requests that run in the meantime are neither recorded nor traced.
+    """
+
+    def __init__(self, coro: Any, profile: cProfile.Profile):
+        self.coro = coro
+        self.profile = profile
+
+    def __await__(self) -> Any:
+        value: Any = None
+        error: Optional[BaseException] = None
+        while True:
+            self.profile.enable()
+            try:
+                if error is not None:
+                    yielded = self.coro.throw(error)
+                else:
+                    yielded = self.coro.send(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self.profile.disable()
+
+            value, error = None, None
+            try:
+                value = yield yielded
+            except GeneratorExit:
+                self.coro.close()
+                raise
+            except BaseException as e:
+                error = e
+
+
+# Stats collected by the inference workers for the profiled request, if any
+_request_profile: contextvars.ContextVar[Optional[List[Dict[Any, Any]]]] = contextvars.ContextVar('request_profile', default=None)
+
+
+def request_profiling() -> bool:
+    """True while handling a request that runs under cProfile"""
+    return _request_profile.get() is not None
+
+
+def add_worker_stats(stats: Dict[Any, Any]) -> None:
+    """Attach stats from profiled_call to the request being profiled"""
+    collected = _request_profile.get()
+    if collected is not None:
+        collected.append(stats)
+
+
+def profiled_call(fn: Callable[..., Any], *args: Any) -> Tuple[Any, Dict[Any, Any]]:
+    """
+    Run fn(*args) under cProfile; returns (result, raw stats).
+
+    Used for work sent to the inference executor, which the request's own
+    profiler (on the event loop thread) cannot see. The stats are plain
+    dicts and tuples, so this also works in a process pool.
+    """
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        result = fn(*args)
+    finally:
+        profile.disable()
+    profile.create_stats()
+    return result, profile.stats
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware: counts finished requests for the sampling profiler and
+    runs requests carrying X-Profile under cProfile (only while their own
+    coroutine runs, see _ProfiledCoroutine).
+
+    authorize(headers) decides whether a request may ask for a profile;
+    unauthorized or concurrent profile requests are served unprofiled.
+    """
+
+    def __init__(self, app: Any, sampler: SamplingProfiler, profiles: RequestProfiles,
+                 authorize: Callable[[Dict[str, str]], bool],
+                 excluded_prefixes: Iterable[str] = ('/debug/profile', '/metrics'),
+                 summary_limit: int = 5):
+        self.app = app
+        self.sampler = sampler
+        self.profiles = profiles
+        self.authorize = authorize
+        self.excluded_prefixes = tuple(excluded_prefixes)
+        self.summary_limit = summary_limit
+        self._profiling = False
+
+    def _wants_profile(self, scope: Dict[str, Any]) -> bool:
+        headers = {k.decode('latin-1').lower(): v.decode('latin-1') for k, v in scope.get('headers', [])}
+        value = headers.get(PROFILE_HEADER.lower(), '').lower()
+        return value in ('1', 'true', 'cprofile') and self.authorize(headers)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope['type'] != 'http' or scope['path'].startswith(self.excluded_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        if self._profiling or not self._wants_profile(scope):
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self.sampler.request_finished()
+            return
+
+        self._profiling = True
+        collected: List[Dict[Any, Any]] = []
+        token = _request_profile.set(collected)
+        profile_id = uuid.uuid4().hex[:16]
+        profile = cProfile.Profile()
+        pending_start: Optional[Dict[str, Any]] = None
+
+        async def send_profiled(message: Dict[str, Any]) -> None:
+            # Hold the response start until the last body message, so the
+            # headers can carry the summary of the finished work. Streamed
+            # responses get only the id.
+            nonlocal pending_start
+            if message['type'] == 'http.response.start':
+                pending_start = message
+                return
+            if pending_start is not None:
+                headers = list(pending_start.get('headers', []))
+                headers.append((PROFILE_ID_HEADER.lower().encode(), profile_id.encode()))
+                if message['type'] == 'http.response.body' and not message.get('more_body', False):
+                    # create_stats() stops the profiler; the driver turns it
+                    # back on at the next step, so the final stats still cover
+                    # everything
+                    profile.create_stats()
+                    summary = top_functions([profile.stats] + collected, self.summary_limit)
+                    headers.append((PROFILE_SUMMARY_HEADER.lower().encode(), summary.encode('latin-1', 'replace')))
+                start_message, pending_start = {**pending_start, 'headers': headers}, None
+                await send(start_message)
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            profile.enable()
+            profile.disable()
+        except ValueError:
+            # Another profiler owns this thread (e.g. a debugger)
+            profile = None
+        try:
+            if profile is None:
+                await self.app(scope, receive, send)
+            else:
+                await _ProfiledCoroutine(self.app(scope, receive, send_profiled), profile)
+        finally:
+            _request_profile.reset(token)
+            self._profiling = False
+            self.sampler.request_finished()
+
+        if profile is None:
+            return
+        profile.create_stats()
+        self.profiles.store(profile_id, scope['method'], scope['path'],
+                            time.perf_counter() - start, [profile.stats] + collected)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Monte Carlo Projections
+
+Simulates thousands of multi-year paths of a profile's savings, debt and
+investment balances under each scenario category the scenario planner
+recommends, and summarizes them as percentile bands per year.
+
+Every scenario faces the same simulated economy: one draw of inflation,
+income shocks and market returns per path and year, shared across the
+scenarios (common random numbers). The bands therefore differ only
+because of the scenario's strategy, not sampling noise, and a seed
+reproduces a projection exactly.
+
+Each simulated year, per path:
+
+1. Income grows with wage growth plus that year's inflation; an income
+   shock (job loss, illness) cuts the year's income by shock_severity.
+   Expenses grow with inflation.
+2. Debt accrues interest, and debt_paydown_share of the surplus
+   (income - expenses) pays it down.
+3. The strategy's invest_share of what is left is invested; the rest
+   stays in cash savings. A deficit is drawn from savings, then from
+   investments, then borrowed.
+4. Investments earn a lognormal return with the strategy's mean and
+   volatility; savings earn cash_rate.
+
+All state is held as scenarios x paths arrays, so a year is a few dozen
+NumPy operations however many paths are simulated.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Balances reported per year; net_worth = savings + investments - debt
+PROJECTION_METRICS = ('savings', 'investments', 'debt', 'net_worth')
+
+DEFAULT_PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+
+
+class ScenarioStrategy:
+    """How a scenario invests: the share of each year's surplus invested and the portfolio's annual return"""
+
+    def __init__(self, invest_share: float, mean_return: float, volatility: float):
+        if not 0 <= invest_share <= 1:
+            raise ValueError(f"invest_share must be between 0 and 1, got {invest_share}")
+        if volatility < 0:
+            raise ValueError(f"volatility must not be negative, got {volatility}")
+        self.invest_share = invest_share
+        self.mean_return = mean_return
+        self.volatility = volatility
+
+    def to_dict(self) -> Dict[str, float]:
+        return {"invest_share": self.invest_share, "mean_return": self.mean_return, "volatility": self.volatility}
+
+
+# Scenario planner categories, from safest to riskiest
+SCENARIO_STRATEGIES: Dict[str, ScenarioStrategy] = {
+    'conservative': ScenarioStrategy(invest_share=0.2, mean_return=0.03, volatility=0.04),
+    'low_risk': ScenarioStrategy(invest_share=0.4, mean_return=0.045, volatility=0.07),
+    'moderate_risk': ScenarioStrategy(invest_share=0.6, mean_return=0.06, volatility=0.11),
+    'high_risk': ScenarioStrategy(invest_share=0.8, mean_return=0.075, volatility=0.17)
+}
+
+
+class ProjectionAssumptions:
+    """Economy shared by every scenario: inflation, income and shock distributions, cash and debt rates"""
+
+    def __init__(self, inflation_mean: float = 0.025, inflation_volatility: float = 0.01,
+                 wage_growth: float = 0.01, shock_probability: float = 0.05, shock_severity: float = 0.5,
+                 cash_rate: float = 0.02, debt_rate: float = 0.07, debt_paydown_share: float = 0.5):
+        for name, value in (('shock_probability', shock_probability), ('shock_severity', shock_severity),
+                            ('debt_paydown_share', debt_paydown_share)):
+            if not 0 <= value <= 1:
+                raise ValueError(f"{name} must be between 0 and 1, got {value}")
+        if inflation_volatility < 0:
+            raise ValueError(f"inflation_volatility must not be negative, got {inflation_volatility}")
+        self.inflation_mean = inflation_mean
+        self.inflation_volatility = inflation_volatility
+        self.wage_growth = wage_growth
+        self.shock_probability = shock_probability
+        self.shock_severity = shock_severity
+        self.cash_rate = cash_rate
+        self.debt_rate = debt_rate
+        self.debt_paydown_share = debt_paydown_share
+
+    def to_dict(self) -> Dict[str, float]:
+        return dict(vars(self))
+
+
+def new_seed() -> int:
+    """A fresh seed, reported back so the projection can be reproduced"""
+    return int(np.random.SeedSequence().generate_state(1)[0])
+
+
+def simulate(start: Dict[str, float], strategies: Dict[str, ScenarioStrategy], assumptions: ProjectionAssumptions,
+             years: int, paths: int, seed: int, real: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Balances per metric as (years + 1) x scenarios x paths float32 arrays,
+    year 0 being the starting balances.
+
+    start holds annual income, annual expenses, savings, investments and
+    debt. With real=True balances are deflated by each path's price level.
+    """
+    rng = np.random.default_rng(seed)
+    n_scenarios = len(strategies)
+    invest_share = np.array([s.invest_share for s in strategies.values()], dtype=np.float32)[:, None]
+    volatility = np.array([s.volatility for s in strategies.values()], dtype=np.float32)[:, None]
+    # Lognormal: mean_return is the expected arithmetic return
+    log_drift = np.log1p(np.array([s.mean_return for s in strategies.values()], dtype=np.float32))[:, None]
+    log_drift -= volatility ** 2 / 2
+
+    # One economy per path and year, shared by every scenario
+    inflation = rng.standard_normal((years, paths), dtype=np.float32)
+    inflation *= assumptions.inflation_volatility
+    inflation += assumptions.inflation_mean
+    shocked = rng.random((years, paths), dtype=np.float32) < assumptions.shock_probability
+    market = rng.standard_normal((years, paths), dtype=np.float32)
+
+    # float32 throughout: bands need a few significant digits, not 15,
+    # and half the memory traffic makes the loop and the sort faster
+    income = np.full(paths, start['income'], dtype=np.float32)
+    expenses = np.full(paths, start['expenses'], dtype=np.float32)
+    price_level = np.ones(paths, dtype=np.float32)
+    savings = np.full((n_scenarios, paths), start['savings'], dtype=np.float32)
+    investments = np.full((n_scenarios, paths), start['investments'], dtype=np.float32)
+    debt = np.full((n_scenarios, paths), start['debt'], dtype=np.float32)
+
+    history = {metric: np.empty((years + 1, n_scenarios, paths), dtype=np.float32) for metric in PROJECTION_METRICS}
+
+    def record(year: int) -> None:
+        np.copyto(history['savings'][year], savings)
+        np.copyto(history['investments'][year], investments)
+        np.copyto(history['debt'][year], debt)
+        net_worth = history['net_worth'][year]
+        np.add(savings, investments, out=net_worth)
+        net_worth -= debt
+        if real:
+            for metric in PROJECTION_METRICS:
+                history[metric][year] /= price_level
+
+    record(0)
+    for year in range(years):
+        income *= 1 + assumptions.wage_growth + inflation[year]
+        expenses *= 1 + inflation[year]
+        price_level *= 1 + inflation[year]
+        surplus = np.where(shocked[year], income * (1 - assumptions.shock_severity), income) - expenses
+
+        debt *= 1 + assumptions.debt_rate
+        payment = np.minimum(np.maximum(surplus * assumptions.debt_paydown_share, 0), debt)
+        debt -= payment
+        left = surplus - payment
+        invested = np.maximum(left, 0) * invest_share
+        savings += left - invested
+
+        # Cover a deficit from cash, then investments, then new debt
+        shortfall = np.maximum(-savings, 0)
+        np.maximum(savings, 0, out=savings)
+        drawn = np.minimum(shortfall, investments)
+        investments -= drawn
+        debt += shortfall - drawn
+
+        investments += invested
+        investments *= np.exp(log_drift + volatility * market[year])
+        savings *= 1 + assumptions.cash_rate
+        record(year + 1)
+
+    return history
+
+
+def percentile_bands(history: Dict[str, np.ndarray], scenario_names: List[str],
+                     percentiles: List[float]) -> Dict[str, Dict[str, Dict[str, np.ndarray]]]:
+    """
+    scenario -> metric -> 'p50' -> one value per year.
+
+    Same values as np.percentile's default (linear) method, but from a
+    full sort: NumPy's SIMD float32 sort is several times faster than the
+    multi-kth partition np.percentile uses.
+    """
+    n_paths = next(iter(history.values())).shape[2]
+    position = np.asarray(percentiles, dtype=np.float64) / 100 * (n_paths - 1)
+    lower = np.floor(position).astype(np.intp)
+    upper = np.minimum(lower + 1, n_paths - 1)
+    fraction = position - lower
+
+    bands: Dict[str, Dict[str, Dict[str, np.ndarray]]] = {name: {} for name in scenario_names}
+    for metric, values in history.items():
+        ordered = np.sort(values, axis=2)
+        low = ordered[:, :, lower].astype(np.float64)
+        # (percentiles, years + 1, scenarios)
+        summary = np.moveaxis(low + (ordered[:, :, upper] - low) * fraction, 2, 0)
+        for s, name in enumerate(scenario_names):
+            # Rounded to cents: float32 digits beyond that are noise
+            bands[name][metric] = {f"p{p:g}": np.round(summary[i, :, s], 2) for i, p in enumerate(percentiles)}
+    return bands
+
+
+def project(start: Dict[str, float], strategies: Dict[str, ScenarioStrategy], assumptions: ProjectionAssumptions,
+            years: int, paths: int, seed: Optional[int] = None, real: bool = False,
+            percentiles: List[float] = list(DEFAULT_PERCENTILES)) -> Dict[str, Any]:
+    """Simulate every scenario and summarize it as percentile bands per year"""
+    if seed is None:
+        seed = new_seed()
+    history = simulate(start, strategies, assumptions, years, paths, seed, real)
+    return {
+        "years": list(range(years + 1)),
+        "paths": paths,
+        "seed": seed,
+        "real": real,
+        "percentiles": list(percentiles),
+        "scenarios": percentile_bands(history, list(strategies), percentiles)
+    }
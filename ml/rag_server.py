@@ -9,12 +9,14 @@ Docs: http://localhost:8001/docs
 """
 
 import os
+import hmac
 import logging
 from typing import List, Optional, Dict, Any
 from dotenv import load_dotenv
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Header, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel, Field
 import uvicorn
 
@@ -22,6 +24,7 @@ import uvicorn
 # Switch between ChromaDB (local) and Pinecone (cloud):
 # from rag_pipeline import FinancialRAGPipeline  # ChromaDB (local, default)
 from rag_pipeline_pinecone import PineconeRAGPipeline as FinancialRAGPipeline  # Pinecone (cloud) ✅
+from profiler import SamplingProfiler, RequestProfiles, ProfilingMiddleware, ProfilerBusy, PSTATS_SORT_KEYS
 
 # Load environment variables
 load_dotenv()
@@ -32,6 +35,10 @@ RAG_HOST = os.getenv('RAG_HOST', '0.0.0.0')
 RAG_PORT = int(os.getenv('PORT', os.getenv('RAG_PORT', 8001)))
 CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*').split(',')
 
+# Profiling endpoints: need ADMIN_TOKEN (X-Admin-Token); off when it is unset
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+PROFILER_MAX_SECONDS = float(os.getenv('PROFILER_MAX_SECONDS', 60))
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -55,6 +62,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+def profiling_allowed(headers: Dict[str, str]) -> bool:
+    """Whether a request may use the profiling hooks: it must carry ADMIN_TOKEN"""
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(headers.get('x-admin-token', ''), ADMIN_TOKEN)
+
+
+def require_admin(token: Optional[str]) -> None:
+    """Raise unless the caller may use the debug endpoints"""
+    if not profiling_allowed({'x-admin-token': token or ''}):
+        raise HTTPException(status_code=403 if ADMIN_TOKEN else 404,
+                            detail="Invalid admin token" if ADMIN_TOKEN else "Not Found")
+
+
+# On-demand sampling profiler and per-request cProfile (X-Profile header)
+sampling_profiler = SamplingProfiler(max_seconds=PROFILER_MAX_SECONDS)
+request_profiles = RequestProfiles()
+app.add_middleware(
+    ProfilingMiddleware,
+    sampler=sampling_profiler,
+    profiles=request_profiles,
+    authorize=profiling_allowed
+)
+
 # Global RAG pipeline instance
 rag_pipeline: Optional[FinancialRAGPipeline] = None
 
@@ -328,6 +358,55 @@ async def rebuild_vector_store():
         raise HTTPException(status_code=500, detail=f"Rebuild failed: {str(e)}")
 
 
+@app.post("/debug/profile")
+async def profile_server(
+    seconds: Optional[float] = Query(None, gt=0),
+    requests: Optional[int] = Query(None, ge=1),
+    interval_ms: float = Query(10, ge=1, le=1000),
+    idle: bool = False,
+    x_admin_token: Optional[str] = Header(None)
+):
+    """
+    Sample the server's stacks for `seconds`, or until `requests` more
+    requests have finished, and return them as collapsed stacks
+    (flamegraph.pl / speedscope / inferno input).
+    """
+    
+    require_admin(x_admin_token)
+    
+    try:
+        result = await sampling_profiler.profile(
+            seconds=seconds, requests=requests, interval=interval_ms / 1000, include_idle=idle
+        )
+    except ProfilerBusy:
+        raise HTTPException(status_code=409, detail="A profiling session is already running")
+    
+    return PlainTextResponse(result['collapsed'], headers={
+        "Content-Disposition": f'attachment; filename="rag-server-{os.getpid()}.collapsed"',
+        "X-Profile-Samples": str(result['samples']),
+        "X-Profile-Duration": str(result['duration_seconds']),
+        "X-Profile-Requests": str(result['requests'])
+    })
+
+
+@app.get("/debug/profile/requests/{profile_id}")
+async def request_profile(
+    profile_id: str,
+    sort: str = 'cumulative',
+    limit: int = Query(40, ge=1, le=1000),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """cProfile summary of a request sent with X-Profile: 1 (id from its X-Profile-Id header)"""
+    
+    require_admin(x_admin_token)
+    
+    if sort not in PSTATS_SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"Unknown sort key: {sort}. Use one of: {', '.join(PSTATS_SORT_KEYS)}")
+    if profile_id not in request_profiles:
+        raise HTTPException(status_code=404, detail=f"No profile {profile_id} (only the most recent are kept)")
+    return PlainTextResponse(request_profiles.summary(profile_id, sort=sort, limit=limit))
+
+
 def main():
     """Run development server"""
     logger.info("Starting FundN3xus RAG API Server...")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Recommendation Rules
+
+Declarative threshold rules over feature columns, evaluated for a whole
+batch at once. A rule set compiles its rules into column indices and
+thresholds, so one evaluation is a handful of NumPy comparisons producing
+a boolean mask per rule. Each row's masks are packed into an integer code,
+and the recommendation list is built once per distinct code (one per
+combination of rules that fired) and reused, never once per row.
+
+Rows (and calls) whose rules produce the same recommendations share one
+list object; callers must not modify the lists they get back.
+"""
+
+import operator
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from feature_schema import FeatureAssembler, FEATURE_INDEX, OPTIONAL_PROFILE_FIELDS, PROFILE_FIELDS
+
+COMPARISONS: Dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge
+}
+
+# Codes are packed into int64
+MAX_RULES = 62
+# Up to this many rules, combinations are looked up in a table indexed by
+# code (2**rules entries) instead of found by sorting the codes
+MAX_TABLE_RULES = 16
+
+class Rule:
+    """Recommend `message` for rows where `feature <op> threshold`"""
+
+    def __init__(self, feature: str, op: str, threshold: float, message: str):
+        if feature not in FEATURE_INDEX:
+            raise ValueError(f"Unknown feature {feature}")
+        if op not in COMPARISONS:
+            raise ValueError(f"Unknown comparison {op} (expected one of {list(COMPARISONS)})")
+        self.feature = feature
+        self.op = op
+        self.threshold = threshold
+        self.message = message
+
+
+class RecommendationRules:
+    """Ordered rules plus a default message for rows where none fire"""
+
+    def __init__(self, rules: Sequence[Rule], default: str):
+        if len(rules) > MAX_RULES:
+            raise ValueError(f"At most {MAX_RULES} rules are supported")
+        self.rules = list(rules)
+        self.default = default
+        # Compile: feature column and threshold per rule, rules grouped by comparison
+        self._columns = np.array([FEATURE_INDEX[rule.feature] for rule in self.rules], dtype=np.intp)
+        self._thresholds = np.array([rule.threshold for rule in self.rules], dtype=np.float64)
+        self._groups = [
+            (COMPARISONS[op], np.array([i for i, rule in enumerate(self.rules) if rule.op == op], dtype=np.intp))
+            for op in COMPARISONS if any(rule.op == op for rule in self.rules)
+        ]
+        self._bits = np.left_shift(1, np.arange(len(self.rules), dtype=np.int64))
+        self._table = np.full(1 << len(self.rules), None, dtype=object) if len(self.rules) <= MAX_TABLE_RULES else None
+        self._assembler = FeatureAssembler()
+
+    def masks(self, features: np.ndarray) -> np.ndarray:
+        """Boolean matrix, one row per feature row and one column per rule"""
+        values = features[:, self._columns]
+        # Compare in the features' dtype, like a scalar threshold would
+        thresholds = self._thresholds.astype(features.dtype)
+        fired = np.empty(values.shape, dtype=bool)
+        for compare, rules in self._groups:
+            fired[:, rules] = compare(values[:, rules], thresholds[rules])
+        return fired
+
+    def _combination(self, code: int) -> List[str]:
+        return [rule.message for j, rule in enumerate(self.rules) if code >> j & 1] or [self.default]
+
+    def recommend(self, features: np.ndarray) -> np.ndarray:
+        """Recommendation lists (object array) for every row of a feature matrix, in rule order"""
+        codes = self.masks(features).astype(np.int64) @ self._bits
+        if self._table is None:
+            unique, inverse = np.unique(codes, return_inverse=True)
+            combinations = np.empty(len(unique), dtype=object)
+            for i, code in enumerate(unique.tolist()):
+                combinations[i] = self._combination(code)
+            return combinations[inverse.reshape(-1)]
+        # Fill in combinations seen for the first time, then index the table
+        seen = np.flatnonzero(np.bincount(codes, minlength=len(self._table)))
+        for code in seen.tolist():
+            if self._table[code] is None:
+                self._table[code] = self._combination(code)
+        return self._table[codes]
+
+    def recommend_frame(self, frame: pd.DataFrame) -> pd.Series:
+        """
+        Recommendations for a DataFrame of profiles (API fields, monthly
+        expenses) in one call, indexed like the frame. Rows must be valid
+        profiles; absent or null optional fields count as 0.
+        """
+        columns = {}
+        for field in PROFILE_FIELDS:
+            if field in frame:
+                values = frame[field].to_numpy(dtype=np.float64)
+                columns[field] = np.nan_to_num(values, nan=0.0) if field in OPTIONAL_PROFILE_FIELDS else values
+            elif field in OPTIONAL_PROFILE_FIELDS:
+                columns[field] = np.zeros(len(frame))
+            else:
+                raise KeyError(f"Missing profile column {field}")
+        features = self._assembler.build_columns(columns)
+        return pd.Series(self.recommend(features), index=frame.index, dtype=object)
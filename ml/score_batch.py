@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Offline Batch Scoring
+
+Applies the models in MODELS_DIR to a CSV, NDJSON or Parquet file of profiles,
+without the API server:
+
+    python score_batch.py profiles.csv --output scores/
+    python score_batch.py dataset.csv --output scores/ --expenses annual --keep-columns age,income
+    python score_batch.py profiles.parquet --output scores/ --workers 8 --partition-by recommended_scenario
+
+The input is read in chunks and the chunks are scored across a process
+pool. Each worker loads its own copy of the models once; OpenMP/BLAS and
+XGBoost threads are pinned so workers x threads never exceeds the cores.
+Workers write their results straight to the output directory as Parquet
+part files (hive-style subdirectories with --partition-by), so results
+never travel back through the parent process. A _scoring.json summary
+with row counts, throughput and model versions is written last.
+
+Input columns use the API's profile fields (expenses are monthly unless
+--expenses annual). Rows with missing or out-of-range fields, or with
+fractional integer fields (age, employment_years, credit_score,
+num_dependents) as the API rejects them, are kept with empty predictions
+and valid=false.
+"""
+
+import os
+import sys
+import json
+import time
+import glob
+import shutil
+import logging
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, Future
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+from feature_schema import PROFILE_FIELDS, OPTIONAL_PROFILE_FIELDS, valid_profile_mask
+from model_registry import ModelSet
+from scoring import (
+    feature_assembler, model_graph, categorize, RISK_BANDS, HEALTH_BANDS, HEALTH_RULES, AFFORDABILITY_MONTHS
+)
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet input/output needs pyarrow
+    pq = None
+
+load_dotenv()
+
+MODELS_DIR = os.getenv('MODELS_DIR', 'models')
+
+# Thread-count variables read by OpenMP (XGBoost) and the BLAS libraries
+# when they load, so they are set before the workers start
+THREAD_ENV_VARS = ['OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'NUMEXPR_NUM_THREADS']
+
+OUTPUT_COLUMNS = [
+    'risk_score', 'risk_category', 'affordability_amount', 'monthly_payment_capacity',
+    'health_score', 'health_category', 'recommendations', 'recommended_scenario', 'scenario_confidence', 'valid'
+]
+
+# CSV output joins each row's recommendations into one field
+CSV_LIST_SEPARATOR = '; '
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Set in each worker by _init_worker
+_worker_models: Optional[ModelSet] = None
+
+
+def read_chunks(path: str, chunk_rows: int, columns: List[str]) -> Iterator[pd.DataFrame]:
+    """Read only the needed columns of a CSV, NDJSON or Parquet file, chunk_rows rows at a time"""
+    name = path.lower()
+    if name.endswith(('.ndjson', '.jsonl', '.ndjson.gz', '.jsonl.gz')):
+        for frame in pd.read_json(path, lines=True, chunksize=chunk_rows):
+            yield frame[[c for c in columns if c in frame]]
+    elif name.endswith(('.csv', '.csv.gz', '.txt')):
+        yield from pd.read_csv(path, chunksize=chunk_rows, usecols=lambda c: c in columns)
+    elif name.endswith('.parquet') or os.path.isdir(path):
+        if pq is None:
+            raise RuntimeError("Reading Parquet needs pyarrow: pip install pyarrow")
+        files = sorted(glob.glob(os.path.join(path, '**', '*.parquet'), recursive=True)) if os.path.isdir(path) else [path]
+        for file in files:
+            parquet = pq.ParquetFile(file)
+            available = [c for c in columns if c in parquet.schema_arrow.names]
+            for batch in parquet.iter_batches(batch_size=chunk_rows, columns=available):
+                yield batch.to_pandas()
+    else:
+        raise RuntimeError(f"Unsupported input {path}: expected .csv, .ndjson/.jsonl or .parquet")
+
+
+def _init_worker(models_dir: str, nthread: int) -> None:
+    """Load one copy of every model per worker process"""
+    global _worker_models
+    logging.getLogger('model_registry').setLevel(logging.WARNING)
+    _worker_models = ModelSet(models_dir, nthread=nthread)
+    _worker_models.load_all()
+
+
+def score_frame(frame: pd.DataFrame, model_set: ModelSet, annual_expenses: bool) -> pd.DataFrame:
+    """Prediction columns for one chunk of profiles (same scores and bands as the API)"""
+
+    columns = {}
+    for field in PROFILE_FIELDS:
+        if field in frame:
+            values = pd.to_numeric(frame[field], errors='coerce').to_numpy(dtype=np.float64)
+        else:
+            values = np.full(len(frame), np.nan)
+        if field in OPTIONAL_PROFILE_FIELDS:
+            values = np.nan_to_num(values, nan=0.0)
+        columns[field] = values
+    if annual_expenses:
+        columns['expenses'] = columns['expenses'] / 12
+
+    valid = valid_profile_mask(columns, integers=True)
+    n = int(valid.sum())
+    out = pd.DataFrame(index=frame.index)
+    out['risk_score'] = np.nan
+    out['affordability_amount'] = np.nan
+    out['health_score'] = np.nan
+    out['scenario_confidence'] = np.nan
+    for column in ('risk_category', 'health_category', 'recommended_scenario'):
+        out[column] = pd.Series([None] * len(frame), index=frame.index, dtype=object)
+    recommendations = np.full(len(frame), None, dtype=object)
+
+    if n:
+        features = feature_assembler.build_columns({f: v[valid] for f, v in columns.items()})
+        outputs = model_graph.evaluate(features, list(model_graph.nodes), model_set)
+        classes = np.asarray(model_set.model('scenario_planner')['label_encoder'].classes_, dtype=object)
+        probabilities = outputs['scenario_planner']
+        best = probabilities.argmax(axis=1)
+
+        out.loc[valid, 'risk_score'] = outputs['investment_risk']
+        out.loc[valid, 'risk_category'] = categorize(outputs['investment_risk'], RISK_BANDS)
+        out.loc[valid, 'affordability_amount'] = outputs['affordability']
+        out.loc[valid, 'health_score'] = outputs['health_score']
+        out.loc[valid, 'health_category'] = categorize(outputs['health_score'], HEALTH_BANDS)
+        recommendations[valid] = HEALTH_RULES.recommend(features)
+        out.loc[valid, 'recommended_scenario'] = classes[best]
+        out.loc[valid, 'scenario_confidence'] = probabilities[np.arange(n), best]
+
+    out['monthly_payment_capacity'] = out['affordability_amount'] / AFFORDABILITY_MONTHS
+    out['recommendations'] = recommendations
+    out['valid'] = valid
+    return out[OUTPUT_COLUMNS]
+
+
+def write_part(frame: pd.DataFrame, output_dir: str, index: int, fmt: str,
+               partition_by: Optional[str]) -> List[str]:
+    """Write one chunk's results, split into hive-style partitions if asked"""
+
+    name = f"part-{index:05d}.{fmt}"
+    groups = [(None, frame)] if partition_by is None else frame.groupby(
+        frame[partition_by].fillna('__null__'), sort=False)
+    paths = []
+    for value, group in groups:
+        directory = output_dir if value is None else os.path.join(output_dir, f"{partition_by}={value}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, name)
+        if partition_by is not None:
+            group = group.drop(columns=[partition_by])
+        if fmt == 'parquet':
+            group.to_parquet(path, index=False)
+        else:
+            group = group.assign(recommendations=[
+                CSV_LIST_SEPARATOR.join(r) if r is not None else None for r in group['recommendations']
+            ])
+            group.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def score_chunk(index: int, frame: pd.DataFrame, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Score one chunk and write its part file(s); runs in a worker process"""
+    start = time.perf_counter()
+    scores = score_frame(frame, _worker_models, options['annual_expenses'])
+    keep = [c for c in options['keep_columns'] if c in frame]
+    result = pd.concat([frame[keep].reset_index(drop=True), scores.reset_index(drop=True)], axis=1)
+    paths = write_part(result, options['output_dir'], index, options['format'], options['partition_by'])
+    return {
+        "chunk": index,
+        "rows": len(frame),
+        "valid": int(scores['valid'].sum()),
+        "seconds": time.perf_counter() - start,
+        "files": len(paths)
+    }
+
+
+def pin_threads(threads: int) -> None:
+    """Cap native thread pools in the (not yet started) workers"""
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Score args.input into args.output; returns the run summary"""
+
+    workers = args.workers or os.cpu_count() or 1
+    threads = args.threads or max(1, (os.cpu_count() or 1) // workers)
+    pin_threads(threads)
+
+    model_set = ModelSet(args.models_dir)
+    missing = [name for name in model_graph.nodes if name not in model_set]
+    if missing:
+        raise RuntimeError(f"Models not found in {args.models_dir}: {missing}")
+
+    keep_columns = [c for c in args.keep_columns.split(',') if c]
+    clashes = [c for c in keep_columns if c in OUTPUT_COLUMNS]
+    if clashes:
+        raise RuntimeError(f"--keep-columns would overwrite prediction columns: {clashes}")
+
+    if os.path.exists(args.output) and os.listdir(args.output):
+        if not args.overwrite:
+            raise RuntimeError(f"{args.output} is not empty (use --overwrite)")
+        shutil.rmtree(args.output)
+    os.makedirs(args.output, exist_ok=True)
+
+    options = {
+        "output_dir": args.output,
+        "format": args.format,
+        "partition_by": args.partition_by,
+        "keep_columns": keep_columns,
+        "annual_expenses": args.expenses == 'annual'
+    }
+    read_columns = list(dict.fromkeys(PROFILE_FIELDS + keep_columns))
+
+    logger.info(f"Scoring {args.input} with {workers} workers x {threads} threads, {args.chunk_rows} rows per chunk")
+    start = time.perf_counter()
+    rows = valid = files = 0
+    busy_seconds = 0.0
+
+    # Spawned workers start with the pinned thread counts and no inherited
+    # OpenMP state; at most 2 chunks per worker are in memory at once
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(args.models_dir, threads)) as pool:
+        pending: List[Future] = []
+
+        def collect(future: Future) -> None:
+            nonlocal rows, valid, files, busy_seconds
+            result = future.result()
+            rows += result['rows']
+            valid += result['valid']
+            files += result['files']
+            busy_seconds += result['seconds']
+            logger.info(f"Chunk {result['chunk']}: {result['rows']} rows in {result['seconds']:.2f}s "
+                        f"({rows} total, {rows / (time.perf_counter() - start):.0f} rows/s)")
+
+        for index, frame in enumerate(read_chunks(args.input, args.chunk_rows, read_columns)):
+            while len(pending) >= workers * 2:
+                collect(pending.pop(0))
+            pending.append(pool.submit(score_chunk, index, frame, options))
+        for future in pending:
+            collect(future)
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "input": os.path.abspath(args.input),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "rows": rows,
+        "valid_rows": valid,
+        "invalid_rows": rows - valid,
+        "files": files,
+        "format": args.format,
+        "partition_by": args.partition_by,
+        "workers": workers,
+        "threads_per_worker": threads,
+        "chunk_rows": args.chunk_rows,
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_sec": round(rows / elapsed, 1) if elapsed > 0 else None,
+        "worker_utilization": round(busy_seconds / (elapsed * workers), 3) if elapsed > 0 else None,
+        "model_versions": dict(model_set.versions)
+    }
+    with open(os.path.join(args.output, '_scoring.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+    logger.info(f"Scored {rows} rows ({rows - valid} invalid) in {elapsed:.1f}s: "
+                f"{summary['rows_per_sec']} rows/s -> {args.output}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a file of profiles with every model")
+    parser.add_argument('input', help="CSV, NDJSON or Parquet file, or a directory of Parquet files")
+    parser.add_argument('--output', required=True, help="Output directory")
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--workers', type=int, default=0, help="Worker processes (default: one per core)")
+    parser.add_argument('--threads', type=int, default=0, help="Threads per worker (default: cores / workers)")
+    parser.add_argument('--chunk-rows', type=int, default=100000)
+    parser.add_argument('--format', choices=['parquet', 'csv'], default='parquet' if pq is not None else 'csv')
+    parser.add_argument('--partition-by', choices=['recommended_scenario', 'risk_category', 'health_category'],
+                        help="Write hive-style partitions on this output column")
+    parser.add_argument('--keep-columns', default='id', help="Comma-separated input columns copied to the output")
+    parser.add_argument('--expenses', choices=['monthly', 'annual'], default='monthly',
+                        help="Period of the expenses column (dataset.csv is annual)")
+    parser.add_argument('--overwrite', action='store_true', help="Replace a non-empty output directory")
+    args = parser.parse_args()
+
+    if args.format == 'parquet' and pq is None:
+        parser.error("Parquet output needs pyarrow (pip install pyarrow), or use --format csv")
+
+    try:
+        run(args)
+    except RuntimeError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
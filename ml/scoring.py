@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Scoring Graph
+
+The model graph, score bands and recommendation rules shared by the API
+server (server.py) and the offline batch scorer (score_batch.py), so a
+profile gets the same scores, categories and recommendations whichever
+way it is scored.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from feature_schema import FeatureAssembler, FEATURE_INDEX
+from model_graph import ModelGraph, ModelNode
+from model_registry import ModelSet
+from recommendations import RecommendationRules, Rule
+
+# Feature matrices are built once per request and sliced per model
+feature_assembler = FeatureAssembler()
+
+# Model graph: each node turns the feature matrix (plus upstream model
+# outputs) into one raw output per row, using the model set passed to
+# evaluate(). The scenario planner consumes the health and risk
+# predictions, so those run first and are reused.
+
+def _run_investment_risk(features: np.ndarray, upstream: Dict[str, np.ndarray], model_set: ModelSet) -> np.ndarray:
+    X = feature_assembler.select(features, 'investment_risk')
+    return np.clip(model_set.predictor('investment_risk', len(X)).predict(X).astype(float), 0, 100)
+
+def _run_affordability(features: np.ndarray, upstream: Dict[str, np.ndarray], model_set: ModelSet) -> np.ndarray:
+    X = feature_assembler.select(features, 'affordability')
+    return np.maximum(model_set.predictor('affordability', len(X)).predict(X).astype(float), 0)
+
+def _run_health_score(features: np.ndarray, upstream: Dict[str, np.ndarray], model_set: ModelSet) -> np.ndarray:
+    X = feature_assembler.select(features, 'health_score')
+    return np.clip(model_set.predictor('health_score', len(X)).predict(X).astype(float), 0, 100)
+
+def _scenario_planner_inputs(features: np.ndarray, upstream: Dict[str, np.ndarray]) -> np.ndarray:
+    features = features.copy()
+    features[:, FEATURE_INDEX['financial_health_score']] = upstream['health_score']
+    features[:, FEATURE_INDEX['investment_risk_score']] = upstream['investment_risk']
+    return features
+
+def _run_scenario_planner(features: np.ndarray, upstream: Dict[str, np.ndarray], model_set: ModelSet) -> np.ndarray:
+    X = feature_assembler.select(_scenario_planner_inputs(features, upstream), 'scenario_planner')
+    # predict() is argmax over predict_proba(), so one pass gives both
+    return model_set.predictor('scenario_planner', len(X)).predict_proba(X)
+
+model_graph = ModelGraph([
+    ModelNode('investment_risk', _run_investment_risk),
+    ModelNode('affordability', _run_affordability),
+    ModelNode('health_score', _run_health_score),
+    ModelNode('scenario_planner', _run_scenario_planner,
+              dependencies=['health_score', 'investment_risk'])
+])
+
+# Models that read upstream outputs as features: model -> fn(features, upstream) -> features
+UPSTREAM_INPUTS = {'scenario_planner': _scenario_planner_inputs}
+
+
+def model_inputs(features: np.ndarray, model_name: str, model_set: ModelSet) -> np.ndarray:
+    """The matrix a model scores: its feature columns, with upstream model outputs filled in"""
+    fill = UPSTREAM_INPUTS.get(model_name)
+    if fill is not None:
+        upstream = model_graph.evaluate(features, model_graph.nodes[model_name].dependencies, model_set)
+        features = fill(features, upstream)
+    return feature_assembler.select(features, model_name)
+
+# Score bands: (lowest score in the band, category), highest band first
+RISK_BANDS: List[Tuple[float, str]] = [(70, 'aggressive'), (40, 'moderate'), (-np.inf, 'conservative')]
+HEALTH_BANDS: List[Tuple[float, str]] = [
+    (80, 'excellent'), (60, 'good'), (40, 'fair'), (-np.inf, 'needs_improvement')
+]
+
+# Affordability is spread over a 5-year horizon for the monthly capacity
+AFFORDABILITY_MONTHS = 60
+
+# Financial health recommendations, in response order; add a Rule to add one
+HEALTH_RULES = RecommendationRules([
+    Rule('savings_rate', '<', 0.1, "Increase your savings rate to at least 10% of income"),
+    Rule('debt_to_income', '>', 0.3, "Work on reducing debt-to-income ratio below 30%"),
+    Rule('credit_score', '<', 700, "Focus on improving credit score through timely payments")
+], default="Maintain your excellent financial habits!")
+
+
+def categorize(scores: np.ndarray, bands: List[Tuple[float, str]]) -> np.ndarray:
+    """Category of each score (vectorized)"""
+    return np.select([scores >= lower for lower, _ in bands], [name for _, name in bands], default=bands[-1][1])
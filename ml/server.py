@@ -4,37 +4,192 @@ FundN3xus ML API Server - Production Ready
 
 Endpoints:
 - GET /health - Health check
+- GET /livez - Liveness probe (the process is up)
+- GET /readyz - Readiness probe (warmed up, required models available)
 - POST /predict/investment-risk - Investment risk scoring
 - POST /predict/affordability - Affordability analysis
+- POST /predict/affordability/grid - Largest loan and its payment for every rate x term x down payment
 - POST /predict/financial-health - Financial health scoring
 - POST /predict/scenario - Scenario planning recommendations
+- POST /predict/all - Run every model on one profile in a single call
+- POST /predict/batch/{model} - Score a list of profiles with one model
+- POST /predict/columnar/{model} - Score a columnar batch (JSON arrays or Arrow IPC) with one model
+- POST /predict/sweep - What-if sweep: score a grid of variations of one profile with every model
+- POST /predict/projection - Monte Carlo projection of a profile's balances under each scenario category
+- POST /explain/{model} - Per-feature contributions to a model's predictions for a list of profiles
+- POST /score/stream - Score a CSV/NDJSON upload with every model, streaming NDJSON back
+- POST /admin/reload-models - Hot-reload retrained models without a restart
+- GET /metrics - Prometheus metrics
+- POST /debug/profile - Sample the server's stacks (collapsed-stack output)
+- GET /debug/profile/requests/{id} - cProfile summary of a request sent with X-Profile: 1
+
+Prediction responses carry an X-Model-Version header naming the model
+versions that served them, and every response a Server-Timing header with
+its latency split by stage.
 """
 
 import os
+import hmac
+import time
+import asyncio
+import signal
+import json
 import logging
-from typing import Dict, Any, List, Optional
-import joblib
-import pandas as pd
+from typing import Dict, Any, List, Optional, Tuple
 import numpy as np
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.requests import ClientDisconnect
+from pydantic import BaseModel, Field, ValidationError
 import uvicorn
 from dotenv import load_dotenv
 
+from inference_executor import InferenceExecutor, ExecutorSaturated, default_threads_per_task
+from micro_batcher import MicroBatcher
+from scoring import (
+    feature_assembler, model_graph, model_inputs, categorize, RISK_BANDS, HEALTH_BANDS, HEALTH_RULES, AFFORDABILITY_MONTHS
+)
+from prediction_cache import PredictionCache, parse_quantize_spec
+from model_registry import ModelSet
+from model_reload import ArtifactChangeDetector, ModelReloader, ModelWatcher, ReloadInProgress
+from prefork import PreforkSupervisor, supervisor_pid
+from metrics import MetricsRegistry, TimingMiddleware, current_timing
+from fast_responses import FastJSONResponse, JSON_ENCODER, dumps
+from feature_schema import MODEL_FEATURES, PROFILE_FIELDS, invalid_profile_fields
+from explanations import EXPLAIN_METHODS, explanation_rows, tree_contributions
+from columnar_input import (
+    ARROW_AVAILABLE, ARROW_STREAM_TYPE, ColumnarBatchTooLarge, ColumnarFormatError,
+    arrow_stream, detect_columnar_format, read_columns, row_errors, wants_arrow
+)
+from stream_scoring import (
+    DuplexStreamingResponse, LineChunker, StreamFormatError, detect_format, parse_csv_header, parse_lines
+)
+from profiler import (
+    SamplingProfiler, RequestProfiles, ProfilingMiddleware, ProfilerBusy,
+    PSTATS_SORT_KEYS, add_worker_stats, profiled_call, request_profiling
+)
+from sweep import MAX_SWEEP_AXES, SweepError, axis_values, surfaces, sweep_grid
+from amortization import (
+    DEFAULT_DOWN_PAYMENT_FRACTIONS, DEFAULT_MAX_EXPENSE_RATIO, DEFAULT_RATES, DEFAULT_TERMS, GRID_CONSTRAINTS,
+    LoanGridError, affordability_grid, payment_budget, validate_grid
+)
+from projections import DEFAULT_PERCENTILES, SCENARIO_STRATEGIES, ProjectionAssumptions, ScenarioStrategy, project
+from admission import AdmissionController, AdmissionMiddleware, current_priority, parse_limits
+from warmup import Readiness, parse_required_models, run_warmup, warmup_plan
+
+# Response header naming the model versions that served a prediction
+MODEL_VERSION_HEADER = 'X-Model-Version'
+
 # Load environment variables from .env file
 load_dotenv()
 
 # Get configuration from environment variables
 ML_HOST = os.getenv('HOST', '0.0.0.0')
 ML_PORT = int(os.getenv('PORT', 8000))
-ML_RELOAD = os.getenv('RELOAD', 'true').lower() == 'true'
+# Auto-reload is for development only; production runs the prefork supervisor
+ML_RELOAD = os.getenv('RELOAD', 'false').lower() == 'true'
 ML_LOG_LEVEL = os.getenv('LOG_LEVEL', 'info')
 ML_WORKERS = int(os.getenv('WORKERS', 1))
+# Recycle a worker after this many requests, plus up to JITTER more (0 = never)
+MAX_REQUESTS = int(os.getenv('MAX_REQUESTS', 0))
+MAX_REQUESTS_JITTER = int(os.getenv('MAX_REQUESTS_JITTER', 0))
+# Seconds a stopping worker gets to finish in-flight requests
+GRACEFUL_TIMEOUT = float(os.getenv('GRACEFUL_TIMEOUT', 30))
 
 # Model configuration
 MODELS_DIR = os.getenv('MODELS_DIR', 'models')
 DATASET_PATH = os.getenv('DATASET_PATH', 'dataset.csv')
+# Load each model on first use (false = load everything at startup)
+MODEL_LAZY_LOADING = os.getenv('MODEL_LAZY_LOADING', 'true').lower() == 'true'
+
+# Hot reload: poll MODELS_DIR for new artifacts every N seconds (0 = off)
+MODEL_WATCH_INTERVAL = float(os.getenv('MODEL_WATCH_INTERVAL', 0))
+# Profiles every new model set must score before it is swapped in
+MODEL_GOLDEN_PROFILES = os.getenv('MODEL_GOLDEN_PROFILES', 'golden_profiles.json')
+# Reject reloads whose golden outputs drift more than this (relative, 0 = report only)
+MODEL_RELOAD_MAX_DRIFT = float(os.getenv('MODEL_RELOAD_MAX_DRIFT', 0))
+# Token for /admin and profiling endpoints (unset = those endpoints are off)
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+# Models that must be available before /readyz passes ('all', '' or a comma list)
+REQUIRED_MODELS = os.getenv('REQUIRED_MODELS', 'all')
+
+# Startup warmup: requests sent through the app before it reports ready
+WARMUP_ENABLED = os.getenv('WARMUP_ENABLED', 'true').lower() == 'true'
+WARMUP_ROUNDS = int(os.getenv('WARMUP_ROUNDS', 3))
+WARMUP_TIMEOUT = float(os.getenv('WARMUP_TIMEOUT', 120))
+# Failed warmups are retried this many times, WARMUP_RETRY_DELAY seconds
+# apart, doubling each time; a prefork worker that runs out of retries
+# exits so the supervisor replaces it
+WARMUP_RETRIES = int(os.getenv('WARMUP_RETRIES', 3))
+WARMUP_RETRY_DELAY = float(os.getenv('WARMUP_RETRY_DELAY', 1))
+
+# Batch prediction configuration (columnar batches skip per-row objects, so
+# they can be larger)
+MAX_BATCH_SIZE = int(os.getenv('MAX_BATCH_SIZE', 10000))
+COLUMNAR_MAX_ROWS = int(os.getenv('COLUMNAR_MAX_ROWS', 200000))
+
+# What-if sweeps: most grid points one /predict/sweep request may score
+SWEEP_MAX_POINTS = int(os.getenv('SWEEP_MAX_POINTS', 10000))
+
+# Loan affordability grids: most rate x term x down-payment cells one
+# /predict/affordability/grid request may ask for
+AFFORDABILITY_GRID_MAX_CELLS = int(os.getenv('AFFORDABILITY_GRID_MAX_CELLS', 10000))
+
+# Monte Carlo projections: simulated paths when the request doesn't say,
+# and the most paths / years one /predict/projection request may simulate
+# (memory grows with paths x years: ~65 MB at 20,000 x 50)
+PROJECTION_PATHS = int(os.getenv('PROJECTION_PATHS', 10000))
+PROJECTION_MAX_PATHS = int(os.getenv('PROJECTION_MAX_PATHS', 20000))
+PROJECTION_MAX_YEARS = int(os.getenv('PROJECTION_MAX_YEARS', 50))
+
+# Streaming bulk scoring: rows per scoring chunk (the ?chunk_rows= default)
+# and the longest input line accepted
+STREAM_CHUNK_ROWS = int(os.getenv('STREAM_CHUNK_ROWS', 2000))
+STREAM_MAX_LINE_BYTES = int(os.getenv('STREAM_MAX_LINE_BYTES', 65536))
+
+# Inference engine: comma-separated models (or 'all') served by the
+# flattened NumPy tree engine instead of XGBoost's predict()
+TREE_ENGINE_MODELS = os.getenv('TREE_ENGINE_MODELS', '')
+# Larger batches go back to XGBoost, which wins once its overhead amortizes
+TREE_ENGINE_MAX_ROWS = int(os.getenv('TREE_ENGINE_MAX_ROWS', 16))
+
+# Micro-batching of concurrent single-profile requests
+MICRO_BATCH_ENABLED = os.getenv('MICRO_BATCH_ENABLED', 'true').lower() == 'true'
+MICRO_BATCH_WINDOW_MS = float(os.getenv('MICRO_BATCH_WINDOW_MS', 2.0))
+MICRO_BATCH_MAX_SIZE = int(os.getenv('MICRO_BATCH_MAX_SIZE', 64))
+
+# Prediction cache (single-profile and /predict/all responses)
+PREDICTION_CACHE_ENABLED = os.getenv('PREDICTION_CACHE_ENABLED', 'true').lower() == 'true'
+PREDICTION_CACHE_SIZE = int(os.getenv('PREDICTION_CACHE_SIZE', 10000))
+PREDICTION_CACHE_TTL = float(os.getenv('PREDICTION_CACHE_TTL', 300))
+# Optional input quantization, e.g. "income=100,expenses=10,savings=100"
+PREDICTION_CACHE_QUANTIZE = os.getenv('PREDICTION_CACHE_QUANTIZE', '')
+# Explanations are cached apart from predictions (same switch, TTL and
+# quantization), so a burst of /explain calls can't evict predictions
+EXPLANATION_CACHE_SIZE = int(os.getenv('EXPLANATION_CACHE_SIZE', 10000))
+
+# Inference executor configuration
+INFERENCE_EXECUTOR = os.getenv('INFERENCE_EXECUTOR', 'thread')  # thread or process
+INFERENCE_WORKERS = int(os.getenv('INFERENCE_WORKERS', min(4, os.cpu_count() or 1)))
+INFERENCE_QUEUE_SIZE = int(os.getenv('INFERENCE_QUEUE_SIZE', 64))
+INFERENCE_RETRY_AFTER = int(os.getenv('INFERENCE_RETRY_AFTER', 1))
+# XGBoost threads per inference task (0 = split cores evenly across all
+# inference tasks of all server workers)
+INFERENCE_NTHREAD = int(os.getenv('INFERENCE_NTHREAD', 0)) or default_threads_per_task(INFERENCE_WORKERS * ML_WORKERS)
+
+# Admission control: in-flight prediction requests are bounded and the
+# excess is shed with 429/503 (see admission.py)
+ADMISSION_ENABLED = os.getenv('ADMISSION_ENABLED', 'true').lower() == 'true'
+ADMISSION_MAX_CONCURRENCY = int(os.getenv('ADMISSION_MAX_CONCURRENCY', 64))
+ADMISSION_QUEUE_SIZE = int(os.getenv('ADMISSION_QUEUE_SIZE', 256))
+# Concurrent requests per bulk endpoint; ADMISSION_LIMITS sets any endpoint's
+# limit by route template ('/score/stream=1,/predict/batch/{model}=4', 0 = none)
+ADMISSION_BULK_LIMIT = int(os.getenv('ADMISSION_BULK_LIMIT', 2))
+ADMISSION_LIMITS = os.getenv('ADMISSION_LIMITS', '')
+# Longest a request waits for a slot before it is shed, per priority class (seconds)
+ADMISSION_INTERACTIVE_MAX_WAIT = float(os.getenv('ADMISSION_INTERACTIVE_MAX_WAIT', 1.0))
+ADMISSION_BULK_MAX_WAIT = float(os.getenv('ADMISSION_BULK_MAX_WAIT', 30))
 
 # CORS configuration
 CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:9002,http://127.0.0.1:9002,http://localhost:3000,http://127.0.0.1:3000').split(',')
@@ -51,6 +206,16 @@ LOG_PREDICTIONS = os.getenv('LOG_PREDICTIONS', 'false').lower() == 'true'
 DEVELOPMENT_MODE = os.getenv('DEVELOPMENT_MODE', 'true').lower() == 'true'
 ENABLE_DEBUG_ENDPOINTS = os.getenv('ENABLE_DEBUG_ENDPOINTS', 'true').lower() == 'true'
 
+# Metrics configuration (Prometheus text format at /metrics)
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+
+# Fast response mode: prediction responses skip response_model re-validation
+# and are encoded with orjson when it is installed
+FAST_RESPONSES = os.getenv('FAST_RESPONSES', 'false').lower() == 'true'
+
+# Profiling configuration (sampling sessions are capped at this many seconds)
+PROFILER_MAX_SECONDS = float(os.getenv('PROFILER_MAX_SECONDS', 60))
+
 # Configure logging based on environment variables
 log_level = getattr(logging, ML_LOG_LEVEL.upper(), logging.INFO)
 logging.basicConfig(
@@ -77,6 +242,44 @@ app = FastAPI(
     redoc_url="/redoc" if ENABLE_DEBUG_ENDPOINTS else None
 )
 
+metrics_registry = MetricsRegistry()
+
+# Admission priority class per prediction endpoint (route template):
+# single-profile dashboard calls outrank bulk scoring
+ADMISSION_PRIORITIES = {
+    '/predict/investment-risk': 'interactive',
+    '/predict/affordability': 'interactive',
+    '/predict/affordability/grid': 'interactive',
+    '/predict/financial-health': 'interactive',
+    '/predict/scenario': 'interactive',
+    '/predict/all': 'interactive',
+    '/predict/sweep': 'interactive',
+    '/predict/projection': 'interactive',
+    '/explain/{model}': 'interactive',
+    '/predict/batch/{model}': 'bulk',
+    '/predict/columnar/{model}': 'bulk',
+    '/score/stream': 'bulk'
+}
+
+admission_controller = AdmissionController(
+    max_concurrency=ADMISSION_MAX_CONCURRENCY,
+    max_queue=ADMISSION_QUEUE_SIZE,
+    endpoint_limits={
+        **{endpoint: ADMISSION_BULK_LIMIT for endpoint, priority in ADMISSION_PRIORITIES.items() if priority == 'bulk'},
+        **parse_limits(ADMISSION_LIMITS)
+    },
+    max_wait={'interactive': ADMISSION_INTERACTIVE_MAX_WAIT, 'bulk': ADMISSION_BULK_MAX_WAIT},
+    retry_after=INFERENCE_RETRY_AFTER
+)
+# Added before CORS so it runs inside it: shed responses keep their CORS headers
+if ADMISSION_ENABLED:
+    app.add_middleware(
+        AdmissionMiddleware,
+        controller=admission_controller,
+        priorities=ADMISSION_PRIORITIES,
+        registry=metrics_registry
+    )
+
 # Add CORS middleware for frontend integration
 app.add_middleware(
     CORSMiddleware,
@@ -84,10 +287,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "Retry-After", MODEL_VERSION_HEADER],
+)
+
+# Per-request stage timing: Server-Timing header plus per-endpoint histograms
+app.add_middleware(TimingMiddleware, registry=metrics_registry)
+
+def profiling_allowed(headers: Dict[str, str]) -> bool:
+    """Same rule as the admin endpoints: the request must carry ADMIN_TOKEN, and without one profiling is off"""
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(headers.get('x-admin-token', ''), ADMIN_TOKEN)
+
+# On-demand sampling profiler and per-request cProfile (X-Profile header)
+sampling_profiler = SamplingProfiler(max_seconds=PROFILER_MAX_SECONDS)
+request_profiles = RequestProfiles()
+app.add_middleware(
+    ProfilingMiddleware,
+    sampler=sampling_profiler,
+    profiles=request_profiles,
+    authorize=profiling_allowed
 )
 
-# Global model storage
-models = {}
+# Active model set (lazy: each model loads on first use). Hot reloads replace
+# it in one assignment; requests grab it up front so they finish on the
+# versions they started with.
+active_models: Optional[ModelSet] = None
 
 # Log CORS configuration if in development mode
 if DEVELOPMENT_MODE:
@@ -133,67 +356,880 @@ class ScenarioResponse(BaseModel):
     alternative_scenarios: List[str] = Field(..., description="Alternative scenarios")
     rationale: str = Field(..., description="Reasoning for recommendation")
 
+class AllPredictionsResponse(BaseModel):
+    """Combined response from every model for one profile"""
+    investment_risk: Optional[InvestmentRiskResponse] = Field(None, description="Investment risk prediction")
+    affordability: Optional[AffordabilityResponse] = Field(None, description="Affordability prediction")
+    financial_health: Optional[FinancialHealthResponse] = Field(None, description="Financial health prediction")
+    scenario: Optional[ScenarioResponse] = Field(None, description="Scenario planning prediction")
+    unavailable_models: List[str] = Field(default_factory=list, description="Models that are not loaded")
+
+class BatchItemResult(BaseModel):
+    """Result for a single profile in a batch request"""
+    index: int = Field(..., description="Position of the profile in the request")
+    result: Optional[Dict[str, Any]] = Field(None, description="Prediction, if the profile was valid")
+    errors: Optional[List[Dict[str, Any]]] = Field(None, description="Validation errors, if the profile was invalid")
+
+class BatchPredictionResponse(BaseModel):
+    """Batch prediction response, in input order"""
+    model: str = Field(..., description="Model used for scoring")
+    total: int = Field(..., description="Number of profiles received")
+    succeeded: int = Field(..., description="Number of profiles scored")
+    failed: int = Field(..., description="Number of profiles rejected by validation")
+    results: List[BatchItemResult] = Field(..., description="Per-profile results")
+
+class SweepAxis(BaseModel):
+    """One profile field varied by a what-if sweep"""
+    field: str = Field(..., description="Profile field to vary, e.g. income")
+    start: float = Field(..., description="First value")
+    stop: float = Field(..., description="Last value (included)")
+    steps: int = Field(..., ge=1, le=SWEEP_MAX_POINTS, description="Number of evenly spaced values")
+
+class SweepRequest(BaseModel):
+    """What-if sweep: a base profile with one or two fields varied over a grid"""
+    profile: FinancialProfile = Field(..., description="Base profile")
+    axes: List[SweepAxis] = Field(..., min_length=1, max_length=MAX_SWEEP_AXES, description="Swept fields, outermost first")
+    models: Optional[List[str]] = Field(None, description="Endpoint slugs to score (default: every available model)")
+
+class AffordabilityGridRequest(BaseModel):
+    """Loan affordability grid: one profile, every combination of rate, term and down payment"""
+    profile: FinancialProfile = Field(..., description="Borrower profile")
+    rates: List[float] = Field(list(DEFAULT_RATES), min_length=1, description="Annual interest rates as fractions, e.g. 0.085 for 8.5%")
+    terms: List[int] = Field(list(DEFAULT_TERMS), min_length=1, description="Loan terms in months")
+    down_payment_fractions: List[float] = Field(list(DEFAULT_DOWN_PAYMENT_FRACTIONS), min_length=1, description="Down payment as a fraction of the price")
+    max_expense_ratio: float = Field(DEFAULT_MAX_EXPENSE_RATIO, gt=0, le=1, description="Share of monthly income that expenses plus the loan payment may take")
+
+class ProjectionEconomy(BaseModel):
+    """Economy shared by every scenario of a projection; unset fields keep their defaults"""
+    inflation_mean: Optional[float] = Field(None, ge=-0.1, le=0.5, description="Mean annual inflation")
+    inflation_volatility: Optional[float] = Field(None, ge=0, le=0.5, description="Standard deviation of annual inflation")
+    wage_growth: Optional[float] = Field(None, ge=-0.5, le=0.5, description="Annual income growth on top of inflation")
+    shock_probability: Optional[float] = Field(None, ge=0, le=1, description="Chance of an income shock in any year")
+    shock_severity: Optional[float] = Field(None, ge=0, le=1, description="Share of a year's income an income shock takes")
+    cash_rate: Optional[float] = Field(None, ge=-0.1, le=0.5, description="Annual interest on savings")
+    debt_rate: Optional[float] = Field(None, ge=0, le=1, description="Annual interest on debt")
+    debt_paydown_share: Optional[float] = Field(None, ge=0, le=1, description="Share of each year's surplus that repays debt")
+
+class ProjectionStrategy(BaseModel):
+    """How one scenario category invests; unset fields keep the category's defaults"""
+    invest_share: Optional[float] = Field(None, ge=0, le=1, description="Share of each year's surplus invested")
+    mean_return: Optional[float] = Field(None, ge=-0.5, le=1, description="Expected annual portfolio return")
+    volatility: Optional[float] = Field(None, ge=0, le=1, description="Standard deviation of annual portfolio returns")
+
+class ProjectionRequest(BaseModel):
+    """Monte Carlo projection of one profile's balances under each scenario category"""
+    profile: FinancialProfile = Field(..., description="Starting profile")
+    years: int = Field(30, ge=1, le=PROJECTION_MAX_YEARS, description="Years to project")
+    paths: int = Field(PROJECTION_PATHS, ge=100, le=PROJECTION_MAX_PATHS, description="Simulated paths per scenario")
+    seed: Optional[int] = Field(None, ge=0, description="Random seed; the same seed reproduces a projection")
+    real: bool = Field(False, description="Report balances in today's money (deflated by simulated inflation)")
+    percentiles: List[float] = Field(list(DEFAULT_PERCENTILES), min_length=1, max_length=21, description="Percentile bands to report")
+    scenarios: Optional[List[str]] = Field(None, description=f"Scenario categories to project (default: all of {list(SCENARIO_STRATEGIES)})")
+    economy: ProjectionEconomy = Field(default_factory=ProjectionEconomy, description="Inflation, income and shock assumptions")
+    strategies: Dict[str, ProjectionStrategy] = Field(default_factory=dict, description="Per-scenario overrides of the investment strategy")
+
+class ExplanationItem(BaseModel):
+    """Per-feature contributions to one prediction"""
+    output: float = Field(..., description="Raw model output being explained")
+    base_value: float = Field(..., description="Output before any feature is taken into account (the model's average)")
+    contributions: Dict[str, float] = Field(..., description="Contribution of each feature, largest absolute value first")
+    explained_class: Optional[str] = Field(None, description="Class whose log-odds are explained (scenario planner)")
+
+class ExplainResponse(BaseModel):
+    """Explanations of one model's predictions, in input order"""
+    model: str = Field(..., description="Model explained")
+    method: str = Field(..., description="exact (TreeSHAP) or approx (Saabas)")
+    output: str = Field(..., description="Model output the contributions add up to")
+    explanations: List[ExplanationItem] = Field(..., description="One explanation per profile")
+
+def build_model_set() -> ModelSet:
+    """Open the model registry in MODELS_DIR as a new model set; models load lazily on first use"""
+    model_set = ModelSet(
+        MODELS_DIR,
+        nthread=INFERENCE_NTHREAD,
+        tree_engine_models=TREE_ENGINE_MODELS,
+        tree_engine_max_rows=TREE_ENGINE_MAX_ROWS
+    )
+    if not model_set:
+        # Never train on startup: it blocks boot for minutes
+        logger.error(f"No models found in {MODELS_DIR}. Train them first: python train_model.py")
+    model_set.batchers = make_micro_batchers(model_set)
+    return model_set
+
+def load_model_artifacts() -> None:
+    """Open the model registry and make it the active model set"""
+    global active_models
+    
+    logger.info("Opening FundN3xus model registry...")
+    
+    active_models = build_model_set()
+    if not MODEL_LAZY_LOADING:
+        active_models.load_all()
+    
+    logger.info(f"Model registry ready: {len(active_models)} models available, {len(active_models.loaded)} loaded")
+
+def preload_models() -> ModelSet:
+    """
+    Load every model of a new set for the prefork supervisor to validate
+    and hand to its workers.
+    
+    Only loads: predicting here would start XGBoost's OpenMP threads, which
+    must not exist at fork time.
+    """
+    model_set = build_model_set()
+    model_set.load_all()
+    logger.info(f"Preloaded {len(model_set)} models for the worker processes")
+    return model_set
+
+def validate_preloaded_models(model_set: ModelSet) -> bool:
+    """Golden-profile check of a preloaded set; the supervisor runs it in a forked child"""
+    report = validate_model_set(model_set)
+    if not report['passed']:
+        logger.error(f"Preloaded models rejected by validation: {report['errors']}")
+    return report['passed']
+
+def activate_preloaded_models(model_set: ModelSet) -> None:
+    """Make a validated preloaded set the one the next workers inherit"""
+    global active_models
+    active_models = model_set
+
+def _init_inference_worker() -> None:
+    """Process pool initializer: each worker process loads its own models"""
+    load_model_artifacts()
+
+# Inference runs here rather than on the event loop
+inference_executor = InferenceExecutor(
+    mode=INFERENCE_EXECUTOR,
+    max_workers=INFERENCE_WORKERS,
+    max_queue=INFERENCE_QUEUE_SIZE,
+    retry_after=INFERENCE_RETRY_AFTER,
+    initializer=_init_inference_worker
+)
+
+def worker_model_set(model_set: ModelSet) -> Optional[ModelSet]:
+    """Model set to hand to the inference executor (process workers use their own copy)"""
+    return model_set if inference_executor.mode == 'thread' else None
+
+def missing_models(model_name: str, model_set: ModelSet) -> List[str]:
+    """Models (including upstream ones) that must be loaded to serve model_name"""
+    return model_graph.missing(model_name, model_set)
+
+def served_versions(model_set: ModelSet, model_names: List[str]) -> Dict[str, str]:
+    """Versions of every model (including upstream ones) behind the given models' outputs"""
+    names: List[str] = []
+    for model_name in model_names:
+        names.extend(m for m in model_graph.requires(model_name) if m not in names)
+    return model_set.versions_for(names)
+
+def respond(result: Any, response: Response) -> Any:
+    """Endpoint return value: the response object, or its encoded JSON in fast response mode"""
+    if not FAST_RESPONSES:
+        return result
+    # FastAPI sends a returned Response as-is, without the headers set on
+    # the injected one, so those are copied over
+    fast = FastJSONResponse(result)
+    fast.raw_headers.extend(response.raw_headers)
+    return fast
+
+def set_model_version_header(response: Response, versions: Dict[str, str]) -> None:
+    """Report the model versions that served a response"""
+    response.headers[MODEL_VERSION_HEADER] = ','.join(
+        f"{name}={version}" for name, version in sorted(versions.items())
+    )
+
+# Response builders: turn a model's raw outputs into response columns (one
+# array or list per response field, for every row at once). The columnar
+# endpoint sends the columns as they are; the other endpoints turn them
+# into one response object per row.
+
+RATIONALE_MAP = {
+    'conservative': 'Based on your financial profile, a conservative approach will help build stability',
+    'low_risk': 'Your stable financial situation supports a low-risk investment strategy',
+    'moderate_risk': 'Your balanced profile suggests moderate risk investments are appropriate',
+    'high_risk': 'Your strong financial position can handle higher-risk, higher-reward investments'
+}
+
+def investment_risk_columns(risk_scores: np.ndarray, features: np.ndarray,
+                            model_set: ModelSet) -> Dict[str, Any]:
+    """Investment risk fields from clamped risk scores"""
+    return {
+        "risk_score": risk_scores,
+        "risk_category": categorize(risk_scores, RISK_BANDS),
+        # Simple confidence based on model certainty (mock for now)
+        "confidence": np.full(len(risk_scores), 0.85)
+    }
+
+def affordability_columns(amounts: np.ndarray, features: np.ndarray,
+                          model_set: ModelSet) -> Dict[str, Any]:
+    """Affordability fields from predicted amounts"""
+    return {
+        "affordability_amount": amounts,
+        # Calculate monthly payment capacity (rough estimate, 5-year assumption)
+        "monthly_payment_capacity": amounts / AFFORDABILITY_MONTHS,
+        "confidence": np.full(len(amounts), 0.82)
+    }
+
+def financial_health_columns(health_scores: np.ndarray, features: np.ndarray,
+                             model_set: ModelSet) -> Dict[str, Any]:
+    """Financial health fields from clamped health scores, with rule-based recommendations"""
+    return {
+        "health_score": health_scores,
+        "health_category": categorize(health_scores, HEALTH_BANDS),
+        "recommendations": HEALTH_RULES.recommend(features),
+        "confidence": np.full(len(health_scores), 0.88)
+    }
+
+def scenario_columns(probabilities: np.ndarray, features: np.ndarray,
+                     model_set: ModelSet) -> Dict[str, Any]:
+    """Scenario fields from class probabilities"""
+    
+    classes = np.asarray(model_set.model('scenario_planner')['label_encoder'].classes_, dtype=object)
+    rationales = np.array([
+        RATIONALE_MAP.get(name, 'Recommendation based on your financial profile analysis') for name in classes
+    ], dtype=object)
+    ranked = np.argsort(-probabilities, axis=1, kind='stable')
+    best = ranked[:, 0]
+    
+    return {
+        "recommended_scenario": classes[best],
+        "scenario_confidence": probabilities[np.arange(len(best)), best].astype(np.float64),
+        # Alternative scenarios are the next two most likely classes
+        "alternative_scenarios": classes[ranked[:, 1:3]],
+        "rationale": rationales[best]
+    }
+
+# Model name -> (column builder, response model)
+RESPONSE_BUILDERS = {
+    'investment_risk': (investment_risk_columns, InvestmentRiskResponse),
+    'affordability': (affordability_columns, AffordabilityResponse),
+    'health_score': (financial_health_columns, FinancialHealthResponse),
+    'scenario_planner': (scenario_columns, ScenarioResponse)
+}
+
+def build_responses(response_model: Any, columns: Dict[str, Any]) -> List[Any]:
+    """One response object per row of a column builder's output"""
+    names = list(columns)
+    values = [column.tolist() if isinstance(column, np.ndarray) else column for column in columns.values()]
+    return [response_model(**dict(zip(names, row))) for row in zip(*values)]
+
+def score_features(features: np.ndarray, model_names: List[str], model_set: ModelSet) -> Dict[str, List[Any]]:
+    """Evaluate the model graph once for all requested models and build their responses"""
+    outputs = model_graph.evaluate(features, model_names, model_set)
+    responses = {}
+    for name in model_names:
+        build_columns, response_model = RESPONSE_BUILDERS[name]
+        responses[name] = build_responses(response_model, build_columns(outputs[name], features, model_set))
+    return responses
+
+# Scoring helpers shared by the single-profile and batch endpoints.
+# Each takes a feature matrix from feature_assembler and returns one
+# response per row.
+
+def score_investment_risk(features: np.ndarray, model_set: ModelSet) -> List[InvestmentRiskResponse]:
+    """Score investment risk tolerance for every row"""
+    return score_features(features, ['investment_risk'], model_set)['investment_risk']
+
+def score_affordability(features: np.ndarray, model_set: ModelSet) -> List[AffordabilityResponse]:
+    """Score affordability capacity for every row"""
+    return score_features(features, ['affordability'], model_set)['affordability']
+
+def score_financial_health(features: np.ndarray, model_set: ModelSet) -> List[FinancialHealthResponse]:
+    """Score financial health and build recommendations for every row"""
+    return score_features(features, ['health_score'], model_set)['health_score']
+
+def score_scenario(features: np.ndarray, model_set: ModelSet) -> List[ScenarioResponse]:
+    """Score recommended financial scenario for every row, using real health and risk scores"""
+    return score_features(features, ['scenario_planner'], model_set)['scenario_planner']
+
+# Batch endpoint slug -> (model key, scorer)
+BATCH_SCORERS = {
+    'investment-risk': ('investment_risk', score_investment_risk),
+    'affordability': ('affordability', score_affordability),
+    'financial-health': ('health_score', score_financial_health),
+    'scenario': ('scenario_planner', score_scenario)
+}
+BATCH_SCORERS_BY_MODEL = dict(BATCH_SCORERS.values())
+
+# Inference results travel back from the executor as
+# (responses, model versions, stage timings in seconds)
+InferenceResult = Tuple[Any, Dict[str, str], Dict[str, float]]
+
+def score_profiles(model_name: str, profiles: List[FinancialProfile],
+                   model_set: Optional[ModelSet] = None) -> InferenceResult:
+    """
+    Build features and score them with one model; runs on the inference executor.
+    
+    Returns the responses, the versions of the models that produced them and
+    the feature build / predict timings. Without a model set, the active one
+    in this process is used.
+    """
+    if model_set is None:
+        model_set = active_models
+    start = time.perf_counter()
+    features = feature_assembler.build(profiles)
+    built = time.perf_counter()
+    responses = BATCH_SCORERS_BY_MODEL[model_name](features, model_set)
+    stages = {'features': built - start, 'predict': time.perf_counter() - built}
+    return responses, served_versions(model_set, [model_name]), stages
+
+# Model name -> AllPredictionsResponse field
+ALL_PREDICTION_FIELDS = {
+    'investment_risk': 'investment_risk',
+    'affordability': 'affordability',
+    'health_score': 'financial_health',
+    'scenario_planner': 'scenario'
+}
+
+def score_models(profile: FinancialProfile, model_names: List[str],
+                 model_set: Optional[ModelSet] = None) -> InferenceResult:
+    """Build features once and run the given models; runs on the inference executor"""
+    if model_set is None:
+        model_set = active_models
+    start = time.perf_counter()
+    features = feature_assembler.build([profile])
+    built = time.perf_counter()
+    responses = score_features(features, model_names, model_set)
+    stages = {'features': built - start, 'predict': time.perf_counter() - built}
+    return {name: result[0] for name, result in responses.items()}, served_versions(model_set, model_names), stages
+
+def score_sweep(profile: FinancialProfile, axes: List[Tuple[str, np.ndarray]], model_names: List[str],
+                unavailable: List[str], model_set: Optional[ModelSet] = None) -> InferenceResult:
+    """
+    Build a what-if grid around one profile and score every point with the
+    given models in one pass; runs on the inference executor.
+    
+    Returns the encoded response body with its point count, the model
+    versions and the stage timings.
+    """
+    if model_set is None:
+        model_set = active_models
+    start = time.perf_counter()
+    base = {field: getattr(profile, field) or 0 for field in PROFILE_FIELDS}
+    columns, shape = sweep_grid(base, axes, SWEEP_MAX_POINTS)
+    features = feature_assembler.build_columns(columns)
+    built = time.perf_counter()
+    outputs = model_graph.evaluate(features, model_names, model_set)
+    results = {}
+    for name in model_names:
+        build_columns = RESPONSE_BUILDERS[name][0]
+        results[ALL_PREDICTION_FIELDS[name]] = surfaces(build_columns(outputs[name], features, model_set), shape)
+    predicted = time.perf_counter()
+    
+    payload = dumps({
+        "shape": shape,
+        "axes": [{"field": field, "values": values} for field, values in axes],
+        "surfaces": results,
+        "unavailable_models": unavailable
+    })
+    stages = {
+        'features': built - start,
+        'predict': predicted - built,
+        'serialize': time.perf_counter() - predicted
+    }
+    return (payload, len(features)), served_versions(model_set, model_names), stages
+
+def score_projection(profile: FinancialProfile, strategies: Dict[str, ScenarioStrategy],
+                     assumptions: ProjectionAssumptions, request: ProjectionRequest, recommend: bool,
+                     model_set: Optional[ModelSet] = None) -> InferenceResult:
+    """
+    Simulate a profile's balances under each scenario strategy and, when
+    the scenario planner is available, add its recommendation; runs on
+    the inference executor.
+    
+    Returns the encoded response body, the model versions and the stage
+    timings.
+    """
+    if model_set is None:
+        model_set = active_models
+    start = time.perf_counter()
+    recommended = None
+    versions: Dict[str, str] = {}
+    if recommend:
+        features = feature_assembler.build([profile])
+        recommended = score_features(features, ['scenario_planner'], model_set)['scenario_planner'][0].recommended_scenario
+        versions = served_versions(model_set, ['scenario_planner'])
+    predicted = time.perf_counter()
+    
+    balances = {
+        'income': profile.income,
+        'expenses': profile.expenses * 12,
+        'savings': profile.savings,
+        'investments': profile.investment_amount or 0,
+        'debt': profile.debt
+    }
+    projection = project(balances, strategies, assumptions, request.years, request.paths,
+                         seed=request.seed, real=request.real, percentiles=request.percentiles)
+    simulated = time.perf_counter()
+    
+    payload = dumps({
+        **projection,
+        "recommended_scenario": recommended,
+        "economy": assumptions.to_dict(),
+        "strategies": {name: strategy.to_dict() for name, strategy in strategies.items()}
+    })
+    stages = {
+        'predict': predicted - start,
+        'simulate': simulated - predicted,
+        'serialize': time.perf_counter() - simulated
+    }
+    return payload, versions, stages
+
+# Model name -> output its explanations add up to
+EXPLAINED_OUTPUTS = {
+    'investment_risk': 'risk_score (before clipping to 0-100)',
+    'affordability': 'affordability_amount (before clipping at 0)',
+    'health_score': 'health_score (before clipping to 0-100)',
+    'scenario_planner': 'log-odds of the recommended scenario'
+}
+
+def explain_profiles(model_name: str, profiles: List[FinancialProfile], method: str,
+                     model_set: Optional[ModelSet] = None) -> InferenceResult:
+    """Per-feature contributions for every profile in one booster call; runs on the inference executor"""
+    if model_set is None:
+        model_set = active_models
+    start = time.perf_counter()
+    features = feature_assembler.build(profiles)
+    built = time.perf_counter()
+    X = model_inputs(features, model_name, model_set)
+    contributions, base_values, class_index = tree_contributions(
+        model_set.estimator(model_name), X, MODEL_FEATURES[model_name], method
+    )
+    classes = None
+    if class_index is not None:
+        classes = np.asarray(model_set.model(model_name)['label_encoder'].classes_, dtype=object)[class_index]
+    rows = explanation_rows(MODEL_FEATURES[model_name], contributions, base_values, classes)
+    explanations = [ExplanationItem(**row) for row in rows]
+    stages = {'features': built - start, 'predict': time.perf_counter() - built}
+    return explanations, served_versions(model_set, [model_name]), stages
+
+def score_stream_chunk(lines: List[bytes], fmt: str, header: Optional[List[str]], first_index: int,
+                       id_field: str, model_set: Optional[ModelSet] = None) -> Tuple[bytes, int, int]:
+    """
+    Parse, validate and score one chunk of a /score/stream upload with every
+    model; runs on the inference executor.
+    
+    Returns the NDJSON output for the chunk and its scored / failed counts.
+    """
+    if model_set is None:
+        model_set = active_models
+    
+    records: List[Dict[str, Any]] = []
+    valid_records = []
+    valid_profiles = []
+    for offset, (row, error) in enumerate(parse_lines(lines, fmt, header)):
+        record: Dict[str, Any] = {"index": first_index + offset}
+        records.append(record)
+        if row is not None and id_field in row:
+            record["id"] = row[id_field]
+        if error is not None:
+            record["errors"] = [{"loc": [], "msg": error, "type": "parse_error"}]
+            continue
+        try:
+            valid_profiles.append(FinancialProfile.model_validate(row))
+            valid_records.append(record)
+        except ValidationError as e:
+            record["errors"] = [
+                {"loc": list(err["loc"]), "msg": err["msg"], "type": err["type"]}
+                for err in e.errors()
+            ]
+    
+    if valid_profiles:
+        responses = score_features(feature_assembler.build(valid_profiles), list(ALL_PREDICTION_FIELDS), model_set)
+        for model_name, field in ALL_PREDICTION_FIELDS.items():
+            for record, response in zip(valid_records, responses[model_name]):
+                record[field] = response.model_dump()
+    
+    output = '\n'.join(json.dumps(record, separators=(',', ':')) for record in records) + '\n'
+    return output.encode(), len(valid_profiles), len(records) - len(valid_profiles)
+
+def score_columnar(model: str, body: bytes, fmt: str, arrow_output: bool,
+                   model_set: Optional[ModelSet] = None) -> InferenceResult:
+    """
+    Parse, validate and score a columnar batch with one model; runs on the
+    inference executor.
+    
+    Returns the encoded response body with its row counts, the model
+    versions and the stage timings. Raises ColumnarFormatError or
+    ColumnarBatchTooLarge for bodies that can't be scored.
+    """
+    if model_set is None:
+        model_set = active_models
+    model_name = BATCH_SCORERS[model][0]
+    build_columns, response_model = RESPONSE_BUILDERS[model_name]
+    
+    start = time.perf_counter()
+    columns, n_rows = read_columns(body, fmt, COLUMNAR_MAX_ROWS)
+    invalid = invalid_profile_fields(columns, integers=True)
+    valid = ~np.logical_or.reduce(list(invalid.values()))
+    index = np.flatnonzero(valid)
+    if len(index) < n_rows:
+        columns = {field: values[valid] for field, values in columns.items()}
+    validated = time.perf_counter()
+    
+    features = feature_assembler.build_columns(columns)
+    built = time.perf_counter()
+    if len(index):
+        outputs = model_graph.evaluate(features, [model_name], model_set)
+        results = build_columns(outputs[model_name], features, model_set)
+    else:
+        results = {field: [] for field in response_model.model_fields}
+    predicted = time.perf_counter()
+    
+    summary = {"model": model, "total": n_rows, "succeeded": len(index), "failed": n_rows - len(index)}
+    errors = row_errors(invalid) if len(index) < n_rows else []
+    if arrow_output:
+        payload = arrow_stream(index, results, {**summary, "errors": json.dumps(errors)})
+    else:
+        payload = dumps({**summary, "index": index, "columns": results, "errors": errors})
+    stages = {
+        'validate': validated - start,
+        'features': built - validated,
+        'predict': predicted - built,
+        'serialize': time.perf_counter() - predicted
+    }
+    return (payload, summary), served_versions(model_set, [model_name]), stages
+
+async def run_inference(fn: Any, *args: Any) -> Any:
+    """Run fn on the inference executor, answering 503 + Retry-After when it is saturated"""
+    try:
+        if request_profiling():
+            # Profile the worker side too; the request's own profiler only sees the event loop
+            result, stats = await inference_executor.run(profiled_call, fn, *args, priority=current_priority())
+            add_worker_stats(stats)
+            return result
+        return await inference_executor.run(fn, *args, priority=current_priority())
+    except ExecutorSaturated as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Inference queue is full, retry later",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+def _make_batch_runner(model_name: str, model_set: ModelSet) -> Any:
+    async def run_batch(profiles: List[FinancialProfile]) -> List[InferenceResult]:
+        responses, versions, stages = await run_inference(score_profiles, model_name, profiles, worker_model_set(model_set))
+        return [(response, versions, stages) for response in responses]
+    return run_batch
+
+def make_micro_batchers(model_set: ModelSet) -> Dict[str, MicroBatcher]:
+    """One micro-batcher per model behind the single-profile endpoints, bound to one model set"""
+    return {
+        model_name: MicroBatcher(
+            model_name,
+            _make_batch_runner(model_name, model_set),
+            window_ms=MICRO_BATCH_WINDOW_MS,
+            max_batch_size=MICRO_BATCH_MAX_SIZE
+        )
+        for model_name in BATCH_SCORERS_BY_MODEL
+    }
+
+prediction_cache = PredictionCache(
+    max_entries=PREDICTION_CACHE_SIZE,
+    ttl_seconds=PREDICTION_CACHE_TTL,
+    quantize=parse_quantize_spec(PREDICTION_CACHE_QUANTIZE)
+)
+
+explanation_cache = PredictionCache(
+    max_entries=EXPLANATION_CACHE_SIZE,
+    ttl_seconds=PREDICTION_CACHE_TTL,
+    quantize=parse_quantize_spec(PREDICTION_CACHE_QUANTIZE)
+)
+
+def graph_version(model_name: str, model_set: ModelSet) -> str:
+    """Versions of a model and every model upstream of it"""
+    # A retrained health model changes scenario outputs
+    return '+'.join(model_set.versions.get(m, '') for m in model_graph.requires(model_name))
+
+def cache_key(model_name: str, profile: FinancialProfile, model_set: ModelSet) -> str:
+    """Prediction cache key for one model's response to a profile"""
+    return prediction_cache.key(model_name, graph_version(model_name, model_set), profile.model_dump())
+
+def explanation_key(model_name: str, method: str, profile: FinancialProfile, model_set: ModelSet) -> str:
+    """Explanation cache key for one model's explanation of a profile"""
+    return explanation_cache.key(f"{model_name}/{method}", graph_version(model_name, model_set), profile.model_dump())
+
+async def predict_one(model_name: str, profile: FinancialProfile,
+                      model_set: ModelSet) -> Tuple[Any, Dict[str, str]]:
+    """
+    Score a single profile: cached, else micro-batched with concurrent requests when enabled.
+    
+    Returns the response and the model versions that served it.
+    """
+    
+    timing = current_timing()
+    key = None
+    if PREDICTION_CACHE_ENABLED:
+        key = cache_key(model_name, profile, model_set)
+        cached = prediction_cache.get(key)
+        if cached is not None:
+            timing.mark('cache')
+            return cached
+    
+    # A profiled request runs alone so its profile only holds its own work
+    if MICRO_BATCH_ENABLED and not request_profiling():
+        response, versions, stages = await model_set.batchers[model_name].submit(profile)
+    else:
+        responses, versions, stages = await run_inference(score_profiles, model_name, [profile], worker_model_set(model_set))
+        response = responses[0]
+    # Batch-level feature/predict times: every request in a batch waited for all of it
+    timing.mark_inference(stages)
+    result = (response, versions)
+    
+    if key is not None:
+        prediction_cache.put(key, result)
+    return result
+
+# Hot reload: new artifacts are loaded and checked on the golden profiles
+# in the background, then swapped in as a whole model set
+
+def load_golden_profiles(path: str) -> List[FinancialProfile]:
+    with open(path) as f:
+        return [FinancialProfile.model_validate(item) for item in json.load(f)]
+
+def validate_model_set(candidate: ModelSet) -> Dict[str, Any]:
+    """
+    Score the golden profiles with a candidate model set before it goes live.
+    
+    Every model must produce finite outputs that build valid responses, and no
+    model served today may disappear. Output drift against the active set is
+    reported per model and fails the check above MODEL_RELOAD_MAX_DRIFT.
+    """
+    
+    errors: List[str] = []
+    report: Dict[str, Any] = {"passed": False, "golden_profiles": 0, "models": {}, "errors": errors}
+    # Nothing to compare against at first start (prefork supervisor)
+    previous_set = active_models
+    
+    if previous_set is not None:
+        dropped = [m for m in previous_set if m not in candidate]
+        if dropped:
+            errors.append(f"Models missing from the new artifacts: {dropped}")
+    
+    profiles = load_golden_profiles(MODEL_GOLDEN_PROFILES)
+    report["golden_profiles"] = len(profiles)
+    features = feature_assembler.build(profiles)
+    
+    targets = [m for m in model_graph.nodes if not missing_models(m, candidate)]
+    outputs = model_graph.evaluate(features, targets, candidate)
+    current = {}
+    if previous_set is not None:
+        current = model_graph.evaluate(
+            features, [m for m in targets if not missing_models(m, previous_set)], previous_set
+        )
+    
+    for model_name in targets:
+        output = outputs[model_name]
+        model_report: Dict[str, Any] = {"version": candidate.versions.get(model_name)}
+        report["models"][model_name] = model_report
+        
+        if len(output) != len(profiles) or not np.all(np.isfinite(output)):
+            errors.append(f"{model_name} produced missing or non-finite outputs")
+            continue
+        try:
+            build_columns, response_model = RESPONSE_BUILDERS[model_name]
+            build_responses(response_model, build_columns(output, features, candidate))
+        except Exception as e:
+            errors.append(f"{model_name} outputs do not build valid responses: {str(e)}")
+            continue
+        
+        previous = current.get(model_name)
+        if previous is not None and previous.shape == output.shape:
+            # Mean absolute change relative to the current outputs' scale
+            drift = float(np.mean(np.abs(output - previous)) / (np.mean(np.abs(previous)) + 1e-9))
+            model_report["drift"] = round(drift, 6)
+            if MODEL_RELOAD_MAX_DRIFT and drift > MODEL_RELOAD_MAX_DRIFT:
+                errors.append(f"{model_name} drifted {drift:.4f} on the golden profiles (max {MODEL_RELOAD_MAX_DRIFT})")
+    
+    report["passed"] = not errors
+    return report
+
+def activate_model_set(model_set: ModelSet) -> Optional[str]:
+    """Swap in a validated model set; requests already running keep the old one"""
+    global active_models
+    
+    pid = supervisor_pid()
+    if pid is not None:
+        # Prefork workers share the supervisor's models: have it reload them,
+        # validate what it loaded and roll every worker instead of swapping
+        # in this one only
+        os.kill(pid, signal.SIGHUP)
+        return "restarting"
+    
+    active_models = model_set
+    
+    # Cache keys carry model versions, so old entries can never match again
+    if PREDICTION_CACHE_ENABLED:
+        prediction_cache.clear()
+    # Worker processes hold their own models: fresh workers load the new ones
+    if inference_executor.mode == 'process':
+        inference_executor.restart()
+
+model_reloader = ModelReloader(
+    build=build_model_set,
+    validate=validate_model_set,
+    activate=activate_model_set,
+    current_versions=lambda: active_models.versions
+)
+model_watcher: Optional[ModelWatcher] = None
+
+def require_admin(token: Optional[str]) -> None:
+    """
+    Admin and profiling endpoints need ADMIN_TOKEN in X-Admin-Token.
+    Without ADMIN_TOKEN they are off, whatever ENABLE_DEBUG_ENDPOINTS says:
+    that flag defaults to on for /docs, and must not open model reloads.
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(token or '', ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+# Readiness: /readyz passes once warmup has finished and the required models are available
+readiness = Readiness(parse_required_models(REQUIRED_MODELS, list(model_graph.nodes)))
+for _model_name in readiness.required_models:
+    if _model_name not in model_graph.nodes:
+        logger.warning(f"REQUIRED_MODELS lists unknown model {_model_name}")
+warmup_task: Optional[asyncio.Task] = None
+
+def unavailable_models() -> List[str]:
+    """Required models (including upstream ones) the active model set cannot serve"""
+    if active_models is None:
+        return list(readiness.required_models)
+    unavailable: List[str] = []
+    for model_name in readiness.required_models:
+        missing = missing_models(model_name, active_models) if model_name in model_graph.nodes else [model_name]
+        unavailable.extend(m for m in missing if m not in unavailable)
+    return unavailable
+
+async def warm_up() -> bool:
+    """
+    Warm up, retrying a failed warmup up to WARMUP_RETRIES times with
+    exponential backoff. True once an attempt succeeds.
+    """
+    
+    delay = WARMUP_RETRY_DELAY
+    for attempt in range(1, WARMUP_RETRIES + 2):
+        if await warm_up_once(attempt):
+            return True
+        if attempt <= WARMUP_RETRIES:
+            logger.warning(f"Retrying warmup in {delay:g}s ({WARMUP_RETRIES - attempt + 1} retries left)")
+            await asyncio.sleep(delay)
+            delay *= 2
+    return False
+
+async def warm_up_once(attempt: int) -> bool:
+    """
+    Send the golden profiles through every available prediction endpoint
+    WARMUP_ROUNDS times, then drop what the warmup left in the prediction
+    and explanation caches. True if every warmup request succeeded.
+    """
+    
+    readiness.start_warmup(attempt)
+    try:
+        model_set = active_models
+        slugs = [slug for slug, (model_name, _) in BATCH_SCORERS.items() if not missing_models(model_name, model_set)]
+        profiles = [profile.model_dump() for profile in load_golden_profiles(MODEL_GOLDEN_PROFILES)]
+        plan = warmup_plan(profiles, slugs, include_all=bool(slugs), rounds=WARMUP_ROUNDS)
+        readiness.finish_warmup(await asyncio.wait_for(run_warmup(app, plan), WARMUP_TIMEOUT))
+    except asyncio.TimeoutError:
+        readiness.fail_warmup(f"Timed out after {WARMUP_TIMEOUT:g}s")
+    except Exception as e:
+        readiness.fail_warmup(str(e))
+    
+    if PREDICTION_CACHE_ENABLED:
+        prediction_cache.clear()
+        explanation_cache.clear()
+    
+    warmup = readiness.warmup
+    if warmup["status"] == "done":
+        logger.info(f"Warmup done in {warmup['seconds']:.2f}s ({warmup['requests']} requests)")
+        return True
+    logger.error(f"Warmup attempt {attempt} failed: {warmup.get('error') or warmup.get('failures')}")
+    return False
+
+# Metrics refreshed from the executor, cache and model set at scrape time
+model_load_seconds = metrics_registry.gauge(
+    'fundn3xus_model_load_seconds', 'Time to load each model (0 until first use)', ['model', 'version'])
+models_loaded = metrics_registry.gauge('fundn3xus_models_loaded', 'Models loaded in this worker')
+model_reloads = metrics_registry.counter('fundn3xus_model_reloads_total', 'Model reloads by outcome', ['status'])
+inference_in_flight = metrics_registry.gauge('fundn3xus_inference_in_flight', 'Inference tasks queued or running')
+inference_tasks = metrics_registry.counter('fundn3xus_inference_tasks_total', 'Inference tasks by outcome', ['outcome'])
+cache_lookups = metrics_registry.counter('fundn3xus_prediction_cache_lookups_total', 'Prediction cache lookups', ['result'])
+cache_entries = metrics_registry.gauge('fundn3xus_prediction_cache_entries', 'Responses held in the prediction cache')
+explanation_cache_lookups = metrics_registry.counter(
+    'fundn3xus_explanation_cache_lookups_total', 'Explanation cache lookups', ['result'])
+explanation_cache_entries = metrics_registry.gauge(
+    'fundn3xus_explanation_cache_entries', 'Explanations held in the explanation cache')
+
+def collect_metrics() -> None:
+    model_set = active_models
+    if model_set is not None:
+        for name in model_set:
+            model_load_seconds.set(name, model_set.versions.get(name, ''), value=model_set.store.load_seconds.get(name, 0.0))
+        models_loaded.set(value=len(model_set.loaded))
+    model_reloads.set('swapped', value=model_reloader.swaps)
+    model_reloads.set('rejected', value=model_reloader.rejections)
+    model_reloads.set('failed', value=model_reloader.failures)
+    
+    executor = inference_executor.stats()
+    inference_in_flight.set(value=executor['in_flight'])
+    inference_tasks.set('completed', value=executor['completed'])
+    inference_tasks.set('rejected', value=executor['rejected'])
+    
+    if PREDICTION_CACHE_ENABLED:
+        cache = prediction_cache.stats()
+        cache_lookups.set('hit', value=cache['hits'])
+        cache_lookups.set('miss', value=cache['misses'])
+        cache_entries.set(value=cache['entries'])
+        cache = explanation_cache.stats()
+        explanation_cache_lookups.set('hit', value=cache['hits'])
+        explanation_cache_lookups.set('miss', value=cache['misses'])
+        explanation_cache_entries.set(value=cache['entries'])
+
+metrics_registry.add_collector(collect_metrics)
+
 # Startup event to load models
 @app.on_event("startup")
 async def load_models():
-    """Load ML models on server startup"""
+    """Load ML models, start the inference executor (and model watcher) and warm up on server startup"""
+    global model_watcher, warmup_task
     try:
-        logger.info("Loading FundN3xus ML models...")
-        
-        # Check if models directory exists
-        if not os.path.exists(MODELS_DIR):
-            logger.warning(f"Models directory {MODELS_DIR} not found. Training models first...")
-            # Run training script from the correct directory
-            os.system("python train_model.py")
-        
-        # Load each model
-        model_files = {
-            'investment_risk': 'investment_risk_model.pkl',
-            'affordability': 'affordability_model.pkl',
-            'health_score': 'health_score_model.pkl',
-            'scenario_planner': 'scenario_planner_model.pkl'
-        }
-        
-        for model_name, filename in model_files.items():
-            model_path = os.path.join(MODELS_DIR, filename)
-            if os.path.exists(model_path):
-                models[model_name] = joblib.load(model_path)
-                logger.info(f"Successfully loaded {model_name} model")
-            else:
-                logger.error(f"Model file {model_path} not found")
+        # Prefork workers inherit the models preloaded by the supervisor
+        if active_models is None:
+            load_model_artifacts()
+        inference_executor.start()
         
-        logger.info(f"Successfully loaded {len(models)} models")
+        if not WARMUP_ENABLED:
+            readiness.skip_warmup()
+        elif supervisor_pid() is not None:
+            # Prefork workers share the socket with workers already serving:
+            # warm up before uvicorn starts accepting connections on it, and
+            # fail startup rather than serve cold (the supervisor replaces us)
+            if not await warm_up():
+                raise RuntimeError(f"Warmup failed after {WARMUP_RETRIES + 1} attempts")
+        else:
+            # Standalone: answer /livez (and a 503 /readyz) while warming up
+            warmup_task = asyncio.create_task(warm_up())
         
+        # Prefork workers leave watching to the supervisor: one watcher per
+        # worker would roll every worker once per worker
+        if MODEL_WATCH_INTERVAL > 0 and supervisor_pid() is None:
+            model_watcher = ModelWatcher(MODELS_DIR, MODEL_WATCH_INTERVAL, lambda: model_reloader.reload('watcher'))
+            model_watcher.start()
+    
     except Exception as e:
         logger.error(f"Failed to load models: {str(e)}")
         raise
 
-def create_feature_dataframe(profile: FinancialProfile) -> pd.DataFrame:
-    """Convert financial profile to feature DataFrame"""
-    
-    # Calculate derived features
-    savings_rate = profile.savings / (profile.income + 1)
-    debt_to_income = profile.debt / (profile.income + 1)
-    expense_ratio = (profile.expenses * 12) / (profile.income + 1)
-    
-    # Create feature dictionary
-    features = {
-        'age': profile.age,
-        'income': profile.income,
-        'expenses': profile.expenses * 12,  # Convert to annual
-        'savings': profile.savings,
-        'debt': profile.debt,
-        'employment_years': profile.employment_years,
-        'credit_score': profile.credit_score,
-        'num_dependents': profile.num_dependents,
-        'investment_amount': profile.investment_amount or 0,
-        'property_value': profile.property_value or 0,
-        'savings_rate': savings_rate,
-        'debt_to_income': debt_to_income,
-        'expense_ratio': expense_ratio
-    }
-    
-    return pd.DataFrame([features])
+@app.on_event("shutdown")
+async def stop_inference_executor():
+    """Stop warmup and model watching, and let in-flight inference finish on shutdown"""
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+        # Let the cancellation land before the executor goes away under it
+        await asyncio.gather(warmup_task, return_exceptions=True)
+    if model_watcher is not None:
+        await model_watcher.stop()
+    inference_executor.shutdown()
 
 # API Endpoints
 
@@ -207,8 +1243,20 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "models_loaded": len(models),
-        "available_models": list(models.keys()),
+        "ready": readiness.check(unavailable_models())[0],
+        "warmup": readiness.warmup,
+        "models_loaded": len(active_models),
+        "available_models": list(active_models),
+        "loaded_models": active_models.loaded,
+        "model_versions": active_models.versions,
+        "model_reload": model_reloader.stats(),
+        "inference": inference_executor.stats(),
+        "admission": admission_controller.stats() if ADMISSION_ENABLED else {"enabled": False},
+        "prediction_cache": prediction_cache.stats() if PREDICTION_CACHE_ENABLED else {"enabled": False},
+        "explanation_cache": explanation_cache.stats() if PREDICTION_CACHE_ENABLED else {"enabled": False},
+        "micro_batching": {
+            name: batcher.stats() for name, batcher in active_models.batchers.items()
+        } if MICRO_BATCH_ENABLED else {"enabled": False},
         "configuration": {
             "models_dir": MODELS_DIR,
             "gpu_enabled": USE_GPU,
@@ -216,6 +1264,26 @@ async def health_check():
         } if DEVELOPMENT_MODE else {}
     }
 
+@app.api_route("/livez", methods=["GET", "HEAD"])
+async def liveness_probe():
+    """Liveness probe: the process is up and its event loop is responding"""
+    return {"status": "alive"}
+
+@app.api_route("/readyz", methods=["GET", "HEAD"])
+async def readiness_probe():
+    """Readiness probe: 503 until warmup has finished and every required model is available"""
+    ready, reasons = readiness.check(unavailable_models())
+    return JSONResponse(
+        {"status": "ready" if ready else "not_ready", "reasons": reasons, "warmup": readiness.warmup["status"]},
+        status_code=200 if ready else 503
+    )
+
+if METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics for this worker process"""
+        return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # Debug endpoint (only available in development mode)
 if ENABLE_DEBUG_ENDPOINTS:
     @app.get("/debug/config")
@@ -227,11 +1295,33 @@ if ENABLE_DEBUG_ENDPOINTS:
                 "port": ML_PORT,
                 "reload": ML_RELOAD,
                 "log_level": ML_LOG_LEVEL,
-                "workers": ML_WORKERS
+                "workers": ML_WORKERS,
+                "max_requests": MAX_REQUESTS,
+                "max_requests_jitter": MAX_REQUESTS_JITTER,
+                "graceful_timeout": GRACEFUL_TIMEOUT,
+                "supervised": supervisor_pid() is not None
             },
             "models": {
                 "directory": MODELS_DIR,
-                "dataset_path": DATASET_PATH
+                "lazy_loading": MODEL_LAZY_LOADING,
+                "watch_interval": MODEL_WATCH_INTERVAL,
+                "golden_profiles": MODEL_GOLDEN_PROFILES,
+                "dataset_path": DATASET_PATH,
+                "required": readiness.required_models
+            },
+            "admission": {
+                "enabled": ADMISSION_ENABLED,
+                "max_concurrency": ADMISSION_MAX_CONCURRENCY,
+                "queue_size": ADMISSION_QUEUE_SIZE,
+                "endpoint_limits": admission_controller.endpoint_limits,
+                "max_wait": admission_controller.max_wait,
+                "priorities": ADMISSION_PRIORITIES
+            },
+            "warmup": {
+                "enabled": WARMUP_ENABLED,
+                "rounds": WARMUP_ROUNDS,
+                "retries": WARMUP_RETRIES,
+                "timeout": WARMUP_TIMEOUT
             },
             "gpu": {
                 "enabled": USE_GPU,
@@ -247,218 +1337,702 @@ if ENABLE_DEBUG_ENDPOINTS:
             "development": {
                 "mode": DEVELOPMENT_MODE,
                 "debug_endpoints": ENABLE_DEBUG_ENDPOINTS
+            },
+            "responses": {
+                "fast": FAST_RESPONSES,
+                "json_encoder": JSON_ENCODER if FAST_RESPONSES else "fastapi"
             }
         }
 
 @app.post("/predict/investment-risk", response_model=InvestmentRiskResponse)
-async def predict_investment_risk(profile: FinancialProfile):
+async def predict_investment_risk(profile: FinancialProfile, response: Response):
     """Predict investment risk tolerance"""
     
     try:
-        if 'investment_risk' not in models:
+        current_timing().mark('validate')
+        model_set = active_models
+        if 'investment_risk' not in model_set:
             raise HTTPException(status_code=503, detail="Investment risk model not available")
         
-        # Prepare features
-        features_df = create_feature_dataframe(profile)
-        
-        # Select relevant features for this model
-        model_features = ['age', 'income', 'savings', 'debt', 'employment_years', 
-                         'credit_score', 'num_dependents', 'property_value', 
-                         'savings_rate', 'debt_to_income']
-        
-        X = features_df[model_features]
-        
-        # Make prediction
-        risk_score = float(models['investment_risk'].predict(X)[0])
-        risk_score = max(0, min(100, risk_score))  # Clamp to 0-100
-        
-        # Determine risk category
-        if risk_score >= 70:
-            risk_category = "aggressive"
-        elif risk_score >= 40:
-            risk_category = "moderate"
-        else:
-            risk_category = "conservative"
-        
-        # Simple confidence based on model certainty (mock for now)
-        confidence = 0.85
+        result, versions = await predict_one('investment_risk', profile, model_set)
+        set_model_version_header(response, versions)
         
         # Log prediction if enabled
         if LOG_PREDICTIONS:
-            logger.info(f"Investment Risk Prediction - Age: {profile.age}, Income: {profile.income}, Risk Score: {risk_score:.1f}")
+            logger.info(f"Investment Risk Prediction - Age: {profile.age}, Income: {profile.income}, Risk Score: {result.risk_score:.1f}")
         
-        return InvestmentRiskResponse(
-            risk_score=risk_score,
-            risk_category=risk_category,
-            confidence=confidence
-        )
+        return respond(result, response)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Investment risk prediction error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 @app.post("/predict/affordability", response_model=AffordabilityResponse)
-async def predict_affordability(profile: FinancialProfile):
+async def predict_affordability(profile: FinancialProfile, response: Response):
     """Predict affordability capacity"""
     
     try:
-        if 'affordability' not in models:
+        current_timing().mark('validate')
+        model_set = active_models
+        if 'affordability' not in model_set:
             raise HTTPException(status_code=503, detail="Affordability model not available")
         
-        # Prepare features
-        features_df = create_feature_dataframe(profile)
-        
-        # Select relevant features
-        model_features = ['age', 'income', 'expenses', 'savings', 'debt', 
-                         'employment_years', 'credit_score', 'num_dependents',
-                         'savings_rate', 'debt_to_income']
-        
-        X = features_df[model_features]
-        
-        # Make prediction
-        affordability_amount = float(models['affordability'].predict(X)[0])
-        affordability_amount = max(0, affordability_amount)
+        result, versions = await predict_one('affordability', profile, model_set)
+        set_model_version_header(response, versions)
+        return respond(result, response)
         
-        # Calculate monthly payment capacity (rough estimate)
-        monthly_payment_capacity = affordability_amount / 60  # 5-year assumption
-        
-        confidence = 0.82
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Affordability prediction error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
+@app.post("/predict/affordability/grid")
+async def predict_affordability_grid(request: AffordabilityGridRequest):
+    """
+    Largest loan a profile can carry for every rate x term x down payment.
+    
+    Each output is a matrix indexed [rate][term][down payment], computed in
+    one vectorized pass. A cell's principal is limited by the monthly
+    payment budget (income headroom under max_expense_ratio after
+    expenses), by the predicted affordability amount as a price cap, and
+    by savings for the down payment; binding names the limit that applies,
+    as an index into constraints.
+    """
+    
+    try:
+        validate_grid(request.rates, request.terms, request.down_payment_fractions, AFFORDABILITY_GRID_MAX_CELLS)
+    except LoanGridError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        current_timing().mark('validate')
+        model_set = active_models
+        if 'affordability' not in model_set:
+            raise HTTPException(status_code=503, detail="Affordability model not available")
         
-        return AffordabilityResponse(
-            affordability_amount=affordability_amount,
-            monthly_payment_capacity=monthly_payment_capacity,
-            confidence=confidence
-        )
+        result, versions = await predict_one('affordability', request.profile, model_set)
+        amount = result.affordability_amount
+        profile = request.profile
+        budget = payment_budget(profile.income / 12, profile.expenses, request.max_expense_ratio)
+        grid = affordability_grid(amount, budget, profile.savings, request.rates, request.terms,
+                                  request.down_payment_fractions)
+        payload = dumps({
+            "affordability_amount": amount,
+            "monthly_payment_budget": round(budget, 2),
+            "rates": request.rates,
+            "terms": request.terms,
+            "down_payment_fractions": request.down_payment_fractions,
+            **{name: np.round(values, 2) for name, values in grid.items() if name != "binding"},
+            "binding": grid["binding"],
+            "constraints": GRID_CONSTRAINTS
+        })
+        current_timing().mark('grid')
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Affordability prediction error: {str(e)}")
+        logger.error(f"Affordability grid error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+    
+    if LOG_PREDICTIONS:
+        logger.info(f"Affordability Grid - Amount: {amount:.2f}, Cells: {grid['binding'].size}")
+    
+    response = Response(payload, media_type="application/json")
+    set_model_version_header(response, versions)
+    return response
 
 @app.post("/predict/financial-health", response_model=FinancialHealthResponse)
-async def predict_financial_health(profile: FinancialProfile):
+async def predict_financial_health(profile: FinancialProfile, response: Response):
     """Predict financial health score"""
     
     try:
-        if 'health_score' not in models:
+        current_timing().mark('validate')
+        model_set = active_models
+        if 'health_score' not in model_set:
             raise HTTPException(status_code=503, detail="Financial health model not available")
         
-        # Prepare features
-        features_df = create_feature_dataframe(profile)
-        
-        # Select relevant features
-        model_features = ['age', 'income', 'savings', 'debt', 'investment_amount',
-                         'employment_years', 'credit_score', 'savings_rate', 
-                         'debt_to_income', 'expense_ratio']
-        
-        X = features_df[model_features]
-        
-        # Make prediction
-        health_score = float(models['health_score'].predict(X)[0])
-        health_score = max(0, min(100, health_score))
-        
-        # Determine health category
-        if health_score >= 80:
-            health_category = "excellent"
-        elif health_score >= 60:
-            health_category = "good"
-        elif health_score >= 40:
-            health_category = "fair"
-        else:
-            health_category = "needs_improvement"
-        
-        # Generate recommendations based on score
-        recommendations = []
-        if features_df['savings_rate'].iloc[0] < 0.1:
-            recommendations.append("Increase your savings rate to at least 10% of income")
-        if features_df['debt_to_income'].iloc[0] > 0.3:
-            recommendations.append("Work on reducing debt-to-income ratio below 30%")
-        if profile.credit_score < 700:
-            recommendations.append("Focus on improving credit score through timely payments")
-        if not recommendations:
-            recommendations.append("Maintain your excellent financial habits!")
-        
-        confidence = 0.88
-        
-        return FinancialHealthResponse(
-            health_score=health_score,
-            health_category=health_category,
-            recommendations=recommendations,
-            confidence=confidence
-        )
+        result, versions = await predict_one('health_score', profile, model_set)
+        set_model_version_header(response, versions)
+        return respond(result, response)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Financial health prediction error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 @app.post("/predict/scenario", response_model=ScenarioResponse)
-async def predict_scenario(profile: FinancialProfile):
+async def predict_scenario(profile: FinancialProfile, response: Response):
     """Predict recommended financial scenario"""
     
     try:
-        if 'scenario_planner' not in models:
-            raise HTTPException(status_code=503, detail="Scenario planner model not available")
+        current_timing().mark('validate')
+        model_set = active_models
+        if missing_models('scenario_planner', model_set):
+            raise HTTPException(status_code=503, detail=f"Scenario planner needs unavailable models: {missing_models('scenario_planner', model_set)}")
         
-        # Prepare features - need to include financial health and risk scores
-        features_df = create_feature_dataframe(profile)
+        result, versions = await predict_one('scenario_planner', profile, model_set)
+        set_model_version_header(response, versions)
+        return respond(result, response)
         
-        # Calculate additional features needed for scenario model
-        # Mock financial health and investment risk for scenario prediction
-        mock_health_score = 75.0  # Could use actual health model prediction
-        mock_risk_score = 50.0   # Could use actual risk model prediction
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Scenario prediction error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
+@app.post("/predict/all", response_model=AllPredictionsResponse)
+async def predict_all(profile: FinancialProfile, response: Response):
+    """
+    Run every loaded model on one profile.
+    
+    Derived features are computed once and each model reads its own column
+    subset, so this replaces four separate /predict/* calls.
+    """
+    
+    try:
+        model_set = active_models
+        predictions = AllPredictionsResponse()
+        versions: Dict[str, str] = {}
+        missing = []
+        keys = {}
+        timing = current_timing()
+        timing.mark('validate')
+        for model_name, field in ALL_PREDICTION_FIELDS.items():
+            if missing_models(model_name, model_set):
+                predictions.unavailable_models.append(model_name)
+                continue
+            if PREDICTION_CACHE_ENABLED:
+                keys[model_name] = cache_key(model_name, profile, model_set)
+                cached = prediction_cache.get(keys[model_name])
+                if cached is not None:
+                    setattr(predictions, field, cached[0])
+                    versions.update(cached[1])
+                    continue
+            missing.append(model_name)
         
-        features_df['financial_health_score'] = mock_health_score
-        features_df['investment_risk_score'] = mock_risk_score
+        if keys:
+            timing.mark('cache')
         
-        # Select relevant features
-        model_features = ['age', 'income', 'savings', 'debt', 'investment_amount',
-                         'employment_years', 'credit_score', 'num_dependents',
-                         'savings_rate', 'debt_to_income', 'financial_health_score',
-                         'investment_risk_score']
+        # Only the models without a cached response are run
+        if missing:
+            computed, computed_versions, stages = await run_inference(score_models, profile, missing, worker_model_set(model_set))
+            timing.mark_inference(stages)
+            versions.update(computed_versions)
+            for model_name, result in computed.items():
+                setattr(predictions, ALL_PREDICTION_FIELDS[model_name], result)
+                if model_name in keys:
+                    prediction_cache.put(keys[model_name], (result, served_versions(model_set, [model_name])))
         
-        X = features_df[model_features]
+        set_model_version_header(response, versions)
         
-        # Get model prediction
-        model_data = models['scenario_planner']
-        scenario_model = model_data['model']
-        label_encoder = model_data['label_encoder']
+        if LOG_PREDICTIONS:
+            logger.info(f"All Models Prediction - Age: {profile.age}, Income: {profile.income}, Unavailable: {predictions.unavailable_models}")
         
-        # Make prediction
-        scenario_pred = scenario_model.predict(X)[0]
-        scenario_proba = scenario_model.predict_proba(X)[0]
+        return respond(predictions, response)
         
-        # Decode prediction
-        recommended_scenario = label_encoder.inverse_transform([scenario_pred])[0]
-        scenario_confidence = float(max(scenario_proba))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Combined prediction error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
+@app.post("/predict/batch/{model}", response_model=BatchPredictionResponse)
+async def predict_batch(model: str, profiles: List[Dict[str, Any]], response: Response):
+    """
+    Score a list of profiles with a single model.
+    
+    Profiles are validated individually; invalid ones are reported with their
+    validation errors and the rest are scored together in one vectorized pass.
+    Results are returned in input order.
+    """
+    
+    if model not in BATCH_SCORERS:
+        raise HTTPException(status_code=404, detail=f"Unknown model '{model}'. Available: {list(BATCH_SCORERS)}")
+    
+    model_name = BATCH_SCORERS[model][0]
+    model_set = active_models
+    if missing_models(model_name, model_set):
+        raise HTTPException(status_code=503, detail=f"{model_name} needs unavailable models: {missing_models(model_name, model_set)}")
+    
+    if len(profiles) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch too large: {len(profiles)} profiles (max {MAX_BATCH_SIZE})")
+    
+    # Validate each profile on its own so one bad row doesn't fail the batch
+    results: List[Dict[str, Any]] = [{"index": i, "result": None, "errors": None} for i in range(len(profiles))]
+    valid_indices = []
+    valid_profiles = []
+    for i, item in enumerate(profiles):
+        try:
+            valid_profiles.append(FinancialProfile.model_validate(item))
+            valid_indices.append(i)
+        except ValidationError as e:
+            results[i]["errors"] = [
+                {"loc": list(err["loc"]), "msg": err["msg"], "type": err["type"]}
+                for err in e.errors()
+            ]
+    timing = current_timing()
+    timing.mark('validate')
+    
+    try:
+        versions = served_versions(model_set, [model_name])
+        if valid_profiles:
+            responses, versions, stages = await run_inference(score_profiles, model_name, valid_profiles, worker_model_set(model_set))
+            timing.mark_inference(stages)
+            for i, result in zip(valid_indices, responses):
+                # The fast response encoder reads response objects directly
+                results[i]["result"] = result if FAST_RESPONSES else result.model_dump()
+        set_model_version_header(response, versions)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Batch {model} prediction error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+    
+    if LOG_PREDICTIONS:
+        logger.info(f"Batch {model} Prediction - Scored: {len(valid_profiles)}, Rejected: {len(profiles) - len(valid_profiles)}")
+    
+    # Validated against BatchPredictionResponse by FastAPI (unless fast responses are on)
+    return respond({
+        "model": model,
+        "total": len(profiles),
+        "succeeded": len(valid_profiles),
+        "failed": len(profiles) - len(valid_profiles),
+        "results": results
+    }, response)
+
+@app.post("/predict/columnar/{model}")
+async def predict_columnar(model: str, request: Request):
+    """
+    Score a columnar batch with a single model.
+    
+    The body holds one array per profile field, either as a JSON object or
+    as an Arrow IPC stream (Content-Type: application/vnd.apache.arrow.stream).
+    Rows are checked against the FinancialProfile constraints with vectorized
+    range checks and scored without building per-row objects. The response
+    has the indices of the scored rows, one array per response field, and
+    the errors of the rejected rows; send Accept: application/vnd.apache.arrow.stream
+    to get an Arrow IPC stream back.
+    """
+    
+    if model not in BATCH_SCORERS:
+        raise HTTPException(status_code=404, detail=f"Unknown model '{model}'. Available: {list(BATCH_SCORERS)}")
+    
+    model_name = BATCH_SCORERS[model][0]
+    model_set = active_models
+    if missing_models(model_name, model_set):
+        raise HTTPException(status_code=503, detail=f"{model_name} needs unavailable models: {missing_models(model_name, model_set)}")
+    
+    fmt = detect_columnar_format(request.headers.get('content-type'))
+    if fmt is None:
+        raise HTTPException(status_code=415, detail=f"Send application/json or {ARROW_STREAM_TYPE}")
+    arrow_output = wants_arrow(request.headers.get('accept'))
+    if (fmt == 'arrow' or arrow_output) and not ARROW_AVAILABLE:
+        raise HTTPException(status_code=415, detail="Arrow input and output need pyarrow on the server")
+    
+    body = await request.body()
+    timing = current_timing()
+    timing.mark('validate')
+    
+    try:
+        (payload, summary), versions, stages = await run_inference(
+            score_columnar, model, body, fmt, arrow_output, worker_model_set(model_set)
+        )
+        timing.mark_inference(stages)
+    except ColumnarFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ColumnarBatchTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Columnar {model} prediction error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+    
+    if LOG_PREDICTIONS:
+        logger.info(f"Columnar {model} Prediction - Scored: {summary['succeeded']}, Rejected: {summary['failed']}")
+    
+    response = Response(payload, media_type=ARROW_STREAM_TYPE if arrow_output else "application/json")
+    set_model_version_header(response, versions)
+    return response
+
+@app.post("/predict/sweep")
+async def predict_sweep(request: SweepRequest):
+    """
+    What-if sweep around one profile.
+    
+    Each axis varies one profile field over evenly spaced values; with two
+    axes every combination is scored. The whole grid is built as one
+    feature matrix and scored with every requested model in a single pass,
+    so a 50x50 grid is one request instead of 2,500. Each response field
+    comes back as a surface with one dimension per axis, e.g.
+    surfaces.financial_health.health_score[i][j] for axes[0].values[i] and
+    axes[1].values[j].
+    """
+    
+    model_set = active_models
+    if request.models is None:
+        requested = list(ALL_PREDICTION_FIELDS)
+    else:
+        unknown = [slug for slug in request.models if slug not in BATCH_SCORERS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown models {unknown}. Available: {list(BATCH_SCORERS)}")
+        requested = [BATCH_SCORERS[slug][0] for slug in request.models]
+        for model_name in requested:
+            if missing_models(model_name, model_set):
+                raise HTTPException(status_code=503, detail=f"{model_name} needs unavailable models: {missing_models(model_name, model_set)}")
+    model_names = [name for name in ALL_PREDICTION_FIELDS if name in requested and not missing_models(name, model_set)]
+    unavailable = [name for name in requested if name not in model_names]
+    if not model_names:
+        raise HTTPException(status_code=503, detail="No models are available")
+    
+    try:
+        axes = [(axis.field, axis_values(axis.field, axis.start, axis.stop, axis.steps, SWEEP_MAX_POINTS)) for axis in request.axes]
+    except SweepError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    timing = current_timing()
+    timing.mark('validate')
+    
+    try:
+        (payload, n_points), versions, stages = await run_inference(
+            score_sweep, request.profile, axes, model_names, unavailable, worker_model_set(model_set)
+        )
+        timing.mark_inference(stages)
+    except SweepError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Sweep prediction error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+    
+    if LOG_PREDICTIONS:
+        logger.info(f"Sweep Prediction - Axes: {[field for field, _ in axes]}, Points: {n_points}")
+    
+    response = Response(payload, media_type="application/json")
+    set_model_version_header(response, versions)
+    return response
+
+@app.post("/predict/projection")
+async def predict_projection(request: ProjectionRequest):
+    """
+    Monte Carlo projection of one profile under each scenario category.
+    
+    Simulates `paths` multi-year paths of savings, investments and debt per
+    scenario (conservative to high_risk, as recommended by
+    /predict/scenario) and reports percentile bands per year, e.g.
+    scenarios.moderate_risk.net_worth.p50[year]. Every scenario faces the
+    same simulated inflation, income shocks and market draws, so the bands
+    differ only by strategy. The response names the seed used; sending it
+    back reproduces the projection.
+    """
+    
+    names = request.scenarios if request.scenarios is not None else list(SCENARIO_STRATEGIES)
+    unknown = [name for name in list(names) + list(request.strategies) if name not in SCENARIO_STRATEGIES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown scenarios {unknown}. Available: {list(SCENARIO_STRATEGIES)}")
+    if not names:
+        raise HTTPException(status_code=400, detail="At least one scenario is required")
+    if not all(0 <= p <= 100 for p in request.percentiles):
+        raise HTTPException(status_code=400, detail="Percentiles must be between 0 and 100")
+    try:
+        strategies = {}
+        for name in dict.fromkeys(names):
+            override = request.strategies.get(name)
+            settings = override.model_dump(exclude_none=True) if override is not None else {}
+            strategies[name] = ScenarioStrategy(**{**SCENARIO_STRATEGIES[name].to_dict(), **settings})
+        assumptions = ProjectionAssumptions(**request.economy.model_dump(exclude_none=True))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    model_set = active_models
+    recommend = not missing_models('scenario_planner', model_set)
+    timing = current_timing()
+    timing.mark('validate')
+    
+    try:
+        payload, versions, stages = await run_inference(
+            score_projection, request.profile, strategies, assumptions, request, recommend, worker_model_set(model_set)
+        )
+        timing.mark_inference(stages)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Projection error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Projection failed: {str(e)}")
+    
+    if LOG_PREDICTIONS:
+        logger.info(f"Projection - Scenarios: {list(strategies)}, Paths: {request.paths}, Years: {request.years}")
+    
+    response = Response(payload, media_type="application/json")
+    if versions:
+        set_model_version_header(response, versions)
+    return response
+
+@app.post("/explain/{model}", response_model=ExplainResponse)
+async def explain(model: str, profiles: List[FinancialProfile], response: Response,
+                  method: str = Query('exact', description="exact (TreeSHAP) or approx (Saabas, much faster)")):
+    """
+    Explain a model's predictions for a list of profiles.
+    
+    Each explanation gives every feature's contribution to the model's raw
+    output, computed with XGBoost's native tree-path contributions. The
+    contributions plus base_value add up to that output. Explanations are
+    cached per profile; the rest of the batch is explained in one call.
+    """
+    
+    if model not in BATCH_SCORERS:
+        raise HTTPException(status_code=404, detail=f"Unknown model '{model}'. Available: {list(BATCH_SCORERS)}")
+    if method not in EXPLAIN_METHODS:
+        raise HTTPException(status_code=400, detail=f"Unknown method '{method}'. Available: {list(EXPLAIN_METHODS)}")
+    if len(profiles) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch too large: {len(profiles)} profiles (max {MAX_BATCH_SIZE})")
+    
+    model_name = BATCH_SCORERS[model][0]
+    model_set = active_models
+    if missing_models(model_name, model_set):
+        raise HTTPException(status_code=503, detail=f"{model_name} needs unavailable models: {missing_models(model_name, model_set)}")
+    
+    try:
+        explanations: List[Optional[ExplanationItem]] = [None] * len(profiles)
+        keys = {}
+        timing = current_timing()
+        timing.mark('validate')
+        if PREDICTION_CACHE_ENABLED:
+            for i, profile in enumerate(profiles):
+                keys[i] = explanation_key(model_name, method, profile, model_set)
+                explanations[i] = explanation_cache.get(keys[i])
+            timing.mark('cache')
         
-        # Get alternative scenarios (top 2 other predictions)
-        scenario_probabilities = list(zip(label_encoder.classes_, scenario_proba))
-        scenario_probabilities.sort(key=lambda x: x[1], reverse=True)
-        alternative_scenarios = [s[0] for s in scenario_probabilities[1:3]]
+        # Only the profiles without a cached explanation are explained
+        missing = [i for i, item in enumerate(explanations) if item is None]
+        versions = served_versions(model_set, [model_name])
+        if missing:
+            computed, versions, stages = await run_inference(
+                explain_profiles, model_name, [profiles[i] for i in missing], method, worker_model_set(model_set)
+            )
+            timing.mark_inference(stages)
+            for i, item in zip(missing, computed):
+                explanations[i] = item
+                if i in keys:
+                    explanation_cache.put(keys[i], item)
         
-        # Generate rationale
-        rationale_map = {
-            'conservative': 'Based on your financial profile, a conservative approach will help build stability',
-            'low_risk': 'Your stable financial situation supports a low-risk investment strategy',
-            'moderate_risk': 'Your balanced profile suggests moderate risk investments are appropriate',
-            'high_risk': 'Your strong financial position can handle higher-risk, higher-reward investments'
-        }
+        set_model_version_header(response, versions)
         
-        rationale = rationale_map.get(recommended_scenario, 'Recommendation based on your financial profile analysis')
+        if LOG_PREDICTIONS:
+            logger.info(f"Explain {model} - Profiles: {len(profiles)}, Computed: {len(missing)}, Method: {method}")
         
-        return ScenarioResponse(
-            recommended_scenario=recommended_scenario,
-            scenario_confidence=scenario_confidence,
-            alternative_scenarios=alternative_scenarios,
-            rationale=rationale
-        )
+        return respond(ExplainResponse(
+            model=model, method=method, output=EXPLAINED_OUTPUTS[model_name], explanations=explanations
+        ), response)
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Scenario prediction error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+        logger.error(f"Explain {model} error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Explanation failed: {str(e)}")
+
+async def run_stream_chunk(*args: Any) -> Tuple[bytes, int, int]:
+    """Score one stream chunk; a bulk upload waits for executor room instead of failing"""
+    while True:
+        try:
+            return await inference_executor.run(score_stream_chunk, *args, priority=current_priority())
+        except ExecutorSaturated as e:
+            await asyncio.sleep(min(e.retry_after, 0.05))
+
+async def stream_scores(chunks: Any, fmt: str, header: Optional[List[str]],
+                        id_field: str, model_set: ModelSet) -> Any:
+    """
+    Score the upload chunk by chunk and yield NDJSON, ending with a trailer.
+    
+    The next chunk is read while the current one is scored, so at most two
+    chunks are held in memory. The trailer reports the counts and rows/sec,
+    or the error that stopped the stream.
+    """
+    
+    start = time.perf_counter()
+    rows = scored = failed = 0
+    pending: Optional[asyncio.Future] = None
+    error = None
+    try:
+        async for lines in chunks:
+            task = asyncio.ensure_future(run_stream_chunk(lines, fmt, header, rows, id_field, worker_model_set(model_set)))
+            rows += len(lines)
+            if pending is not None:
+                output, ok, bad = await pending
+                scored += ok
+                failed += bad
+                yield output
+            pending = task
+        if pending is not None:
+            output, ok, bad = await pending
+            pending = None
+            scored += ok
+            failed += bad
+            yield output
+    except ClientDisconnect:
+        logger.warning(f"Stream scoring: client disconnected after {rows} rows")
+        return
+    except StreamFormatError as e:
+        error = str(e)
+    except Exception as e:
+        logger.error(f"Stream scoring error: {str(e)}")
+        error = f"Scoring failed: {str(e)}"
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+    
+    elapsed = time.perf_counter() - start
+    trailer = {
+        "trailer": True,
+        "status": "error" if error else "complete",
+        "rows": scored + failed,
+        "scored": scored,
+        "failed": failed,
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_sec": round((scored + failed) / elapsed, 1) if elapsed > 0 else None,
+        "model_versions": served_versions(model_set, list(ALL_PREDICTION_FIELDS))
+    }
+    if error:
+        trailer["error"] = error
+    if LOG_PREDICTIONS:
+        logger.info(f"Stream scoring - Scored: {scored}, Rejected: {failed}, {trailer['rows_per_sec']} rows/s")
+    yield (json.dumps(trailer, separators=(',', ':')) + '\n').encode()
 
-# Development server
+@app.post("/score/stream")
+async def score_stream(
+    request: Request,
+    format: Optional[str] = None,
+    chunk_rows: int = Query(STREAM_CHUNK_ROWS, ge=1, le=MAX_BATCH_SIZE),
+    id_field: str = 'id'
+):
+    """
+    Score an uploaded CSV or NDJSON file with every model, streaming NDJSON back.
+    
+    The upload is read incrementally in chunks of chunk_rows rows, so memory
+    stays flat whatever the file size. Each output line carries the row
+    index (and the row's id_field value, if present) with either all four
+    predictions or its validation errors; the last line is a trailer with
+    the totals and rows/sec. The format comes from ?format=csv|ndjson or the
+    Content-Type header.
+    """
+    
+    fmt = detect_format(request.headers.get('content-type'), format)
+    if fmt is None:
+        raise HTTPException(status_code=415, detail="Upload CSV (text/csv) or NDJSON (application/x-ndjson), or pass ?format=csv|ndjson; JSON arrays are not streamed, send them to /predict/batch/{model}")
+    
+    model_set = active_models
+    missing = sorted({m for model_name in ALL_PREDICTION_FIELDS for m in missing_models(model_name, model_set)})
+    if missing:
+        raise HTTPException(status_code=503, detail=f"Stream scoring needs unavailable models: {missing}")
+    
+    chunker = LineChunker(chunk_rows, STREAM_MAX_LINE_BYTES)
+    chunks = chunker.chunks(request.stream())
+    
+    # Read the first chunk up front so a bad header fails with a status code
+    header = None
+    try:
+        first = await anext(chunks, None)
+        if fmt == 'csv' and first:
+            header = parse_csv_header(first[0])
+            first = first[1:]
+            absent = [name for name, field in FinancialProfile.model_fields.items()
+                      if field.is_required() and name not in header]
+            if absent:
+                raise HTTPException(status_code=400, detail=f"CSV header is missing required columns: {absent}")
+    except StreamFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def all_chunks() -> Any:
+        if first:
+            yield first
+        async for lines in chunks:
+            yield lines
+    
+    response = DuplexStreamingResponse(
+        stream_scores(all_chunks(), fmt, header, id_field, model_set),
+        media_type="application/x-ndjson"
+    )
+    set_model_version_header(response, served_versions(model_set, list(ALL_PREDICTION_FIELDS)))
+    return response
+
+@app.post("/admin/reload-models")
+async def reload_models(force: bool = False, x_admin_token: Optional[str] = Header(None)):
+    """
+    Hot-reload the models in MODELS_DIR without dropping requests.
+    
+    The new artifacts are loaded in the background and must pass the golden
+    profile checks before they replace the active models; requests already
+    running finish on the old versions. force=true swaps even when the
+    versions are unchanged.
+    """
+    
+    require_admin(x_admin_token)
+    
+    try:
+        result = await model_reloader.reload('admin', force=force)
+    except ReloadInProgress:
+        raise HTTPException(status_code=409, detail="A model reload is already running")
+    
+    if result['status'] in ('rejected', 'failed'):
+        raise HTTPException(status_code=422, detail=result)
+    return result
+
+@app.post("/debug/profile")
+async def profile_server(
+    seconds: Optional[float] = Query(None, gt=0),
+    requests: Optional[int] = Query(None, ge=1),
+    interval_ms: float = Query(10, ge=1, le=1000),
+    idle: bool = False,
+    x_admin_token: Optional[str] = Header(None)
+):
+    """
+    Sample this worker's stacks for `seconds`, or until `requests` more
+    requests have finished, and return them as collapsed stacks.
+    
+    The output loads directly into flamegraph.pl, speedscope or inferno.
+    Sessions never run longer than PROFILER_MAX_SECONDS; idle=true keeps
+    samples of threads that are only waiting.
+    """
+    
+    require_admin(x_admin_token)
+    
+    try:
+        result = await sampling_profiler.profile(
+            seconds=seconds, requests=requests, interval=interval_ms / 1000, include_idle=idle
+        )
+    except ProfilerBusy:
+        raise HTTPException(status_code=409, detail="A profiling session is already running")
+    
+    return PlainTextResponse(result['collapsed'], headers={
+        "Content-Disposition": f'attachment; filename="ml-server-{os.getpid()}.collapsed"',
+        "X-Profile-Samples": str(result['samples']),
+        "X-Profile-Duration": str(result['duration_seconds']),
+        "X-Profile-Requests": str(result['requests'])
+    })
+
+@app.get("/debug/profile/requests/{profile_id}")
+async def request_profile(
+    profile_id: str,
+    sort: str = 'cumulative',
+    limit: int = Query(40, ge=1, le=1000),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """cProfile summary of a request sent with X-Profile: 1 (id from its X-Profile-Id header)"""
+    
+    require_admin(x_admin_token)
+    
+    if sort not in PSTATS_SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"Unknown sort key: {sort}. Use one of: {', '.join(PSTATS_SORT_KEYS)}")
+    if profile_id not in request_profiles:
+        raise HTTPException(status_code=404, detail=f"No profile {profile_id} (only the most recent are kept)")
+    return PlainTextResponse(request_profiles.summary(profile_id, sort=sort, limit=limit))
+
+# Server entry point
 def main():
-    """Run development server"""
+    """Run the development server (RELOAD=true) or the prefork production server"""
     logger.info("Starting FiSight ML API Server...")
     
     if DEVELOPMENT_MODE:
@@ -466,14 +2040,40 @@ def main():
         logger.info(f"   URL: http://{ML_HOST}:{ML_PORT}")
         logger.info(f"   Docs: http://{ML_HOST}:{ML_PORT}/docs" if ENABLE_DEBUG_ENDPOINTS else "   Docs: Disabled")
         logger.info(f"   Reload: {ML_RELOAD}")
+        logger.info(f"   Workers: {ML_WORKERS}")
+    
+    if ML_RELOAD:
+        if ML_WORKERS > 1:
+            logger.warning("RELOAD=true runs a single worker; WORKERS is ignored")
+        uvicorn.run(
+            "server:app",
+            host=ML_HOST,
+            port=ML_PORT,
+            reload=True,
+            log_level=ML_LOG_LEVEL
+        )
+        return
     
-    uvicorn.run(
-        "server:app",
+    if not hasattr(os, 'fork'):
+        # No fork (Windows): plain uvicorn workers, each loading its own models
+        uvicorn.run("server:app", host=ML_HOST, port=ML_PORT, workers=ML_WORKERS, log_level=ML_LOG_LEVEL)
+        return
+    
+    PreforkSupervisor(
+        app,
         host=ML_HOST,
         port=ML_PORT,
-        reload=ML_RELOAD,
+        workers=ML_WORKERS,
+        preload=preload_models,
+        validate=validate_preloaded_models,
+        activate=activate_preloaded_models,
+        watch=ArtifactChangeDetector(MODELS_DIR).poll if MODEL_WATCH_INTERVAL > 0 else None,
+        watch_interval=MODEL_WATCH_INTERVAL,
+        max_requests=MAX_REQUESTS,
+        max_requests_jitter=MAX_REQUESTS_JITTER,
+        graceful_timeout=GRACEFUL_TIMEOUT,
         log_level=ML_LOG_LEVEL
-    )
+    ).run()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Streaming Input
+
+Incremental parsing for bulk scoring uploads. LineChunker cuts a request
+body, as it arrives, into chunks of at most N raw lines; parse_lines turns
+one chunk of CSV or NDJSON lines into row dicts. Only a chunk or two is
+ever held in memory, however large the file is.
+
+The event loop only splits bytes on newlines; decoding and parsing happen
+in parse_lines, which the server runs on the inference executor together
+with scoring.
+"""
+
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+
+STREAM_FORMATS = ('csv', 'ndjson')
+
+CONTENT_TYPE_FORMATS = {
+    'text/csv': 'csv',
+    'application/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'application/json-lines': 'ndjson'
+}
+
+
+class StreamFormatError(ValueError):
+    """Raised when the upload cannot be split into rows"""
+
+
+def detect_format(content_type: Optional[str], explicit: Optional[str] = None) -> Optional[str]:
+    """Upload format from ?format= or the Content-Type header, None if unknown"""
+    if explicit:
+        return explicit if explicit in STREAM_FORMATS else None
+    media_type = (content_type or '').split(';')[0].strip().lower()
+    return CONTENT_TYPE_FORMATS.get(media_type)
+
+
+class LineChunker:
+    """
+    Splits a byte stream into chunks of complete lines.
+
+    Blank lines are skipped and line endings stripped. A line longer than
+    max_line_bytes raises StreamFormatError, so a file without newlines
+    can't grow the buffer without bound.
+    """
+
+    def __init__(self, chunk_rows: int, max_line_bytes: int = 1 << 16):
+        self.chunk_rows = chunk_rows
+        self.max_line_bytes = max_line_bytes
+        self.lines_read = 0
+
+    async def chunks(self, body: AsyncIterator[bytes]) -> AsyncIterator[List[bytes]]:
+        buffer = b''
+        lines: List[bytes] = []
+        async for data in body:
+            buffer += data
+            *complete, buffer = buffer.split(b'\n')
+            if len(buffer) > self.max_line_bytes or (complete and max(map(len, complete)) > self.max_line_bytes):
+                raise StreamFormatError(f"Input line longer than {self.max_line_bytes} bytes")
+            for line in complete:
+                line = line.rstrip(b'\r')
+                if line.strip():
+                    lines.append(line)
+            while len(lines) >= self.chunk_rows:
+                chunk, lines = lines[:self.chunk_rows], lines[self.chunk_rows:]
+                self.lines_read += len(chunk)
+                yield chunk
+
+        tail = buffer.rstrip(b'\r')
+        if tail.strip():
+            lines.append(tail)
+        while lines:
+            chunk, lines = lines[:self.chunk_rows], lines[self.chunk_rows:]
+            self.lines_read += len(chunk)
+            yield chunk
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for endpoints that stream output while still reading
+    the request body.
+
+    Starlette's StreamingResponse watches receive() for a disconnect on
+    servers older than ASGI 2.4, which swallows the body messages the
+    endpoint has not read yet. This one leaves receive() to the body
+    reader; a client that goes away surfaces as ClientDisconnect from
+    request.stream() or an OSError on send.
+    """
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
+
+
+def parse_csv_header(line: bytes) -> List[str]:
+    """Column names from the first CSV line"""
+    try:
+        names = next(csv.reader([line.decode('utf-8-sig')]))
+    except (UnicodeDecodeError, StopIteration) as e:
+        raise StreamFormatError(f"Invalid CSV header: {str(e)}")
+    return [name.strip() for name in names]
+
+
+def parse_lines(lines: List[bytes], fmt: str,
+                header: Optional[List[str]] = None) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Parse one chunk into (row, None) or (None, error) per line.
+
+    CSV cells are kept as strings for pydantic to coerce; empty cells are
+    left out so optional fields fall back to their defaults.
+    """
+
+    parsed: List[Tuple[Optional[Dict[str, Any]], Optional[str]]] = []
+    if fmt == 'csv':
+        try:
+            text = [line.decode('utf-8') for line in lines]
+        except UnicodeDecodeError as e:
+            return [(None, f"Invalid UTF-8: {str(e)}")] * len(lines)
+        for cells in csv.reader(text):
+            if len(cells) != len(header):
+                parsed.append((None, f"Expected {len(header)} columns, got {len(cells)}"))
+                continue
+            parsed.append(({name: value.strip() for name, value in zip(header, cells) if value.strip() != ''}, None))
+        return parsed
+
+    for line in lines:
+        try:
+            row = json.loads(line)
+        except (ValueError, UnicodeDecodeError) as e:
+            parsed.append((None, f"Invalid JSON: {str(e)}"))
+            continue
+        if not isinstance(row, dict):
+            parsed.append((None, "Each line must be a JSON object"))
+            continue
+        parsed.append((row, None))
+    return parsed
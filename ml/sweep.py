@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+FundN3xus What-If Sweeps
+
+Builds the perturbation grid for /predict/sweep: a base profile with one
+or two of its fields swept over a range. The grid comes out as one array
+per profile field, ready for FeatureAssembler.build_columns(), so every
+point is scored in a single batched pass instead of one request per
+point. Model outputs are folded back into response surfaces with one
+dimension per axis.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from feature_schema import INTEGER_PROFILE_FIELDS, PROFILE_FIELDS, PROFILE_LIMITS
+
+# Axes a sweep may have (a response surface is at most 2-D)
+MAX_SWEEP_AXES = 2
+
+# Largest magnitude an axis may reach on fields without an upper limit
+# (money amounts): far above any real profile, and far enough below the
+# float64 range that the feature math can't overflow
+MAX_AXIS_MAGNITUDE = 1e12
+
+
+class SweepError(ValueError):
+    """Raised for sweeps that can't be built (unknown field, out-of-range values, too many points)"""
+
+
+def axis_values(field: str, start: float, stop: float, steps: int, max_points: int) -> np.ndarray:
+    """
+    The values one axis takes: `steps` evenly spaced points from start to
+    stop, both included. Integer fields are rounded, and repeats dropped.
+    """
+    if field not in PROFILE_LIMITS:
+        raise SweepError(f"Unknown sweep field '{field}'. Available: {PROFILE_FIELDS}")
+    if steps < 1:
+        raise SweepError(f"Sweep over {field} needs at least 1 step")
+    # Checked before allocating: the grid's own limit comes too late
+    if steps > max_points:
+        raise SweepError(f"Sweep over {field} has {steps} steps; the limit is {max_points} points")
+
+    low, high = PROFILE_LIMITS[field]
+    for value in (start, stop):
+        # NaN fails every comparison below, so it is caught here first
+        if not np.isfinite(value):
+            raise SweepError(f"Sweep over {field} needs finite start and stop values, got {value}")
+        if abs(value) > MAX_AXIS_MAGNITUDE:
+            raise SweepError(f"Sweep over {field} goes beyond {MAX_AXIS_MAGNITUDE:g}: {value}")
+        if (low is not None and value < low) or (high is not None and value > high):
+            raise SweepError(f"Sweep over {field} goes outside its valid range [{low}, {high}]: {value}")
+
+    values = np.linspace(start, stop, steps)
+    if field in INTEGER_PROFILE_FIELDS:
+        values = np.round(values)
+        # np.unique sorts; keep the sweep's own direction
+        _, first = np.unique(values, return_index=True)
+        values = values[np.sort(first)]
+    return values
+
+
+def sweep_grid(base: Dict[str, float], axes: List[Tuple[str, np.ndarray]],
+               max_points: int) -> Tuple[Dict[str, np.ndarray], Tuple[int, ...]]:
+    """
+    One array per profile field holding every grid point, in row-major
+    order over the axes, and the grid's shape. Fields that are not swept
+    keep their base value.
+    """
+    if not 1 <= len(axes) <= MAX_SWEEP_AXES:
+        raise SweepError(f"A sweep has 1 to {MAX_SWEEP_AXES} axes, got {len(axes)}")
+    fields = [field for field, _ in axes]
+    if len(set(fields)) != len(fields):
+        raise SweepError(f"Each field can be swept only once, got {fields}")
+
+    shape = tuple(len(values) for _, values in axes)
+    n_points = int(np.prod(shape))
+    if n_points > max_points:
+        raise SweepError(f"Sweep has {n_points} points; the limit is {max_points}")
+
+    grids = np.meshgrid(*(values for _, values in axes), indexing='ij')
+    columns = {field: np.full(n_points, base[field], dtype=np.float64) for field in PROFILE_FIELDS}
+    for field, grid in zip(fields, grids):
+        columns[field] = grid.ravel()
+    return columns, shape
+
+
+def surfaces(columns: Dict[str, Any], shape: Tuple[int, ...]) -> Dict[str, np.ndarray]:
+    """Reshape a column builder's per-row output to the grid, one dimension per axis"""
+    result = {}
+    for name, column in columns.items():
+        column = np.asarray(column)
+        result[name] = column.reshape(shape + column.shape[1:])
+    return result
@@ -19,6 +19,9 @@ from sklearn.preprocessing import LabelEncoder
 from imblearn.over_sampling import SMOTE
 from xgboost import XGBRegressor, XGBClassifier
 
+from feature_schema import MODEL_FEATURES
+from model_registry import export_models
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -240,10 +243,8 @@ class FundN3xusMLTrainer:
         
         logger.info("Training Investment Risk Model...")
         
-        # Select features
-        features = ['age', 'income', 'savings', 'debt', 'employment_years', 
-                   'credit_score', 'num_dependents', 'property_value', 
-                   'savings_rate', 'debt_to_income']
+        # Select features (shared with the API server)
+        features = MODEL_FEATURES['investment_risk']
         
         X = df[features]
         y = df['investment_risk_score']
@@ -275,10 +276,8 @@ class FundN3xusMLTrainer:
         
         logger.info("Training Affordability Model...")
         
-        # Select features
-        features = ['age', 'income', 'expenses', 'savings', 'debt', 
-                   'employment_years', 'credit_score', 'num_dependents',
-                   'savings_rate', 'debt_to_income']
+        # Select features (shared with the API server)
+        features = MODEL_FEATURES['affordability']
         
         X = df[features]
         y = df['affordability_amount']
@@ -310,10 +309,8 @@ class FundN3xusMLTrainer:
         
         logger.info("Training Financial Health Score Model...")
         
-        # Select features
-        features = ['age', 'income', 'savings', 'debt', 'investment_amount',
-                   'employment_years', 'credit_score', 'savings_rate', 
-                   'debt_to_income', 'expense_ratio']
+        # Select features (shared with the API server)
+        features = MODEL_FEATURES['health_score']
         
         X = df[features]
         y = df['financial_health_score']
@@ -345,11 +342,8 @@ class FundN3xusMLTrainer:
         
         logger.info("Training Scenario Planner Model...")
         
-        # Select features
-        features = ['age', 'income', 'savings', 'debt', 'investment_amount',
-                   'employment_years', 'credit_score', 'num_dependents',
-                   'savings_rate', 'debt_to_income', 'financial_health_score',
-                   'investment_risk_score']
+        # Select features (shared with the API server)
+        features = MODEL_FEATURES['scenario_planner']
         
         X = df[features]
         y = df['scenario_category']
@@ -412,6 +406,9 @@ class FundN3xusMLTrainer:
             self.train_health_score_model(df)
             self.train_scenario_planner_model(df)
             
+            # Native XGBoost artifacts + manifest served by the API
+            manifest = export_models(self.models, self.models_dir)
+            
             # Training summary
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
@@ -426,6 +423,9 @@ class FundN3xusMLTrainer:
             logger.info("  - affordability_model.pkl") 
             logger.info("  - health_score_model.pkl")
             logger.info("  - scenario_planner_model.pkl")
+            logger.info("Model registry (served by server.py):")
+            for model_name, entry in manifest['models'].items():
+                logger.info(f"  - {entry['artifact']} (version {entry['version']})")
             logger.info("\nYour hackathon ML backend is ready! 🚀")
             
         except Exception as e:
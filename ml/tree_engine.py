@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Flattened Tree Engine
+
+Pure-NumPy inference for the XGBoost models. Every tree of a booster is
+exported into one set of flat node arrays (feature, threshold, left, right,
+leaf value) and all rows walk all trees together, one tree level per step.
+
+At small batch sizes this skips the sklearn wrapper and DMatrix overhead
+that dominate XGBoost's own predict(). Enable it per model with the
+TREE_ENGINE_MODELS environment variable on the API server.
+
+Only numerical splits and the reg:squarederror / multi:softprob objectives
+used by train_model.py are supported.
+"""
+
+import json
+from typing import Any, List
+
+import numpy as np
+
+SUPPORTED_OBJECTIVES = ('reg:squarederror', 'multi:softprob')
+
+
+def _parse_base_score(value: str) -> np.ndarray:
+    """Parse base_score, stored as '5E-1' or '[5E-1,5E-1]' depending on version"""
+    return np.array([float(v) for v in value.strip('[]').split(',')], dtype=np.float64)
+
+
+class FlatTreeEnsemble:
+    """XGBoost booster flattened into NumPy node arrays"""
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, left: np.ndarray,
+                 right: np.ndarray, default_left: np.ndarray, value: np.ndarray,
+                 roots: np.ndarray, tree_class: np.ndarray, base_score: np.ndarray,
+                 num_class: int, objective: str, max_depth: int):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.tree_class = tree_class
+        self.base_score = base_score
+        self.num_class = num_class
+        self.objective = objective
+        self.max_depth = max_depth
+        self.children = np.column_stack([right, left]).ravel()
+
+    @classmethod
+    def from_xgboost(cls, model: Any) -> 'FlatTreeEnsemble':
+        """Flatten an XGBRegressor/XGBClassifier (or raw Booster)"""
+
+        booster = model.get_booster() if hasattr(model, 'get_booster') else model
+        learner = json.loads(booster.save_raw('json'))['learner']
+
+        objective = learner['objective']['name']
+        if objective not in SUPPORTED_OBJECTIVES:
+            raise ValueError(f"Unsupported objective '{objective}'")
+
+        gbtree = learner['gradient_booster']['model']
+        if int(gbtree['gbtree_model_param']['num_parallel_tree']) != 1:
+            raise ValueError("Boosted random forests are not supported")
+
+        num_class = max(1, int(learner['learner_model_param']['num_class']))
+        base_score = np.broadcast_to(
+            _parse_base_score(learner['learner_model_param']['base_score']), (num_class,)
+        ).copy()
+
+        features, thresholds, lefts, rights, defaults, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for tree in gbtree['trees']:
+            if any(tree['split_type']):
+                raise ValueError("Categorical splits are not supported")
+
+            left = np.asarray(tree['left_children'], dtype=np.int32)
+            right = np.asarray(tree['right_children'], dtype=np.int32)
+            n_nodes = len(left)
+            is_leaf = left == -1
+            node_ids = np.arange(n_nodes, dtype=np.int32)
+
+            # Leaves point at themselves so every row can take the same
+            # number of steps; leaf values live in split_conditions
+            split_conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+            features.append(np.where(is_leaf, 0, tree['split_indices']).astype(np.int32))
+            thresholds.append(np.where(is_leaf, np.float32(np.inf), split_conditions))
+            lefts.append(np.where(is_leaf, node_ids, left) + offset)
+            rights.append(np.where(is_leaf, node_ids, right) + offset)
+            defaults.append(np.asarray(tree['default_left'], dtype=bool))
+            values.append(np.where(is_leaf, split_conditions, 0).astype(np.float32))
+            roots.append(offset)
+
+            # Depth of the deepest leaf bounds the traversal steps
+            depth = np.zeros(n_nodes, dtype=np.int32)
+            for node in range(n_nodes):
+                if not is_leaf[node]:
+                    depth[left[node]] = depth[right[node]] = depth[node] + 1
+            max_depth = max(max_depth, int(depth.max()))
+            offset += n_nodes
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts).astype(np.int32),
+            right=np.concatenate(rights).astype(np.int32),
+            default_left=np.concatenate(defaults),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.int32),
+            tree_class=np.asarray(gbtree['tree_info'], dtype=np.int32),
+            base_score=base_score,
+            num_class=num_class,
+            objective=objective,
+            max_depth=max_depth
+        )
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def leaf_indices(self, X: np.ndarray) -> np.ndarray:
+        """Global leaf node index reached by each row in each tree, shape (n_rows, n_trees)"""
+
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        row_offset = (np.arange(n_rows, dtype=np.int64) * n_features)[:, None]
+        node = np.broadcast_to(self.roots, (n_rows, self.n_trees)).copy()
+        has_missing = bool(np.isnan(flat_X).any())
+
+        for _ in range(self.max_depth):
+            x = flat_X[row_offset + self.feature[node]]
+            go_left = x < self.threshold[node]
+            if has_missing:
+                go_left = np.where(np.isnan(x), self.default_left[node], go_left)
+            # children holds (right, left) pairs, so go_left picks the slot
+            node = self.children[2 * node + go_left]
+        return node
+
+    def predict_margin(self, X: np.ndarray) -> np.ndarray:
+        """Raw margin per row and class, shape (n_rows, num_class)"""
+
+        leaf_values = self.value[self.leaf_indices(X)].astype(np.float64)
+        margin = np.empty((leaf_values.shape[0], self.num_class), dtype=np.float64)
+        for k in range(self.num_class):
+            margin[:, k] = leaf_values[:, self.tree_class == k].sum(axis=1)
+        return margin + self.base_score
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Regression output, or class index for classifiers (sklearn semantics)"""
+        if self.objective == 'multi:softprob':
+            return self.predict_proba(X).argmax(axis=1)
+        return self.predict_margin(X)[:, 0].astype(np.float32)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Class probabilities via softmax over the per-class margins"""
+        if self.objective != 'multi:softprob':
+            raise AttributeError("predict_proba is only available for classifiers")
+        margin = self.predict_margin(X)
+        margin -= margin.max(axis=1, keepdims=True)
+        proba = np.exp(margin)
+        proba /= proba.sum(axis=1, keepdims=True)
+        return proba.astype(np.float32)
+
+
+def parse_engine_models(value: str, available: List[str]) -> List[str]:
+    """Parse a TREE_ENGINE_MODELS setting ('all', '' or a comma list)"""
+    value = value.strip()
+    if value.lower() == 'all':
+        return list(available)
+    return [name.strip() for name in value.split(',') if name.strip()]
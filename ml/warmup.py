@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+FundN3xus Startup Warmup
+
+The first predictions a worker serves are several times slower than steady
+state: XGBoost allocates its prediction buffers and thread pool on first
+use, pandas and NumPy fill their caches, and lazily loaded models are read
+from disk. Warmup pays those costs before real traffic arrives by sending
+prediction requests through the app itself (middleware, validation,
+executor, models and serialization) over an in-process ASGI transport.
+
+Readiness tracks the warmup and answers /readyz: a worker is ready once
+warmup has finished and every required model is available. /livez only
+says the process is up and its event loop is responding.
+"""
+
+import time
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# (path, JSON body) of one warmup request
+WarmupRequest = Tuple[str, Any]
+
+# Warmup requests shed with 429/503 + Retry-After are retried this many
+# times, waiting SHED_RETRY_DELAY seconds longer each time
+SHED_RETRIES = 10
+SHED_RETRY_DELAY = 0.05
+
+
+def parse_required_models(value: str, available: List[str]) -> List[str]:
+    """Parse a REQUIRED_MODELS setting ('all', '' or a comma list)"""
+    value = value.strip()
+    if value.lower() == 'all':
+        return list(available)
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def warmup_plan(profiles: List[Dict[str, Any]], slugs: List[str], include_all: bool,
+                rounds: int, batch_rows: int = 256) -> List[List[WarmupRequest]]:
+    """
+    Warmup requests per round for the given model endpoints.
+
+    Each round sends one single-profile request and one explanation per
+    endpoint (a different profile every round, so the caches never answer
+    them), one row batch and one columnar batch. Batches repeat the
+    profiles up to batch_rows so they take the large-batch inference path.
+    """
+
+    batch = (profiles * -(-batch_rows // len(profiles)))[:batch_rows]
+    columns = {field: [p.get(field) for p in batch] for field in batch[0]}
+    plan = []
+    for i in range(rounds):
+        profile = profiles[i % len(profiles)]
+        requests: List[WarmupRequest] = []
+        for slug in slugs:
+            requests.append((f"/predict/{slug}", profile))
+            requests.append((f"/explain/{slug}", [profile]))
+            requests.append((f"/predict/batch/{slug}", batch))
+            requests.append((f"/predict/columnar/{slug}", columns))
+        if include_all:
+            requests.append(("/predict/all", profile))
+        plan.append(requests)
+    return plan
+
+
+async def run_warmup(app: Any, plan: List[List[WarmupRequest]]) -> Dict[str, Any]:
+    """
+    Send the plan through the app, round after round (requests within a
+    round run concurrently). Returns per-endpoint first and last latencies.
+    """
+
+    latencies: Dict[str, List[float]] = {}
+    failures: List[str] = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://warmup", timeout=None) as client:
+        async def send(path: str, body: Any) -> None:
+            start = time.perf_counter()
+            response = await client.post(path, json=body)
+            for attempt in range(SHED_RETRIES):
+                # Shed by admission control or a full executor: wait for a slot
+                if response.status_code not in (429, 503) or 'retry-after' not in response.headers:
+                    break
+                await asyncio.sleep(SHED_RETRY_DELAY * (attempt + 1))
+                response = await client.post(path, json=body)
+            latencies.setdefault(path, []).append(time.perf_counter() - start)
+            if response.status_code != 200:
+                failures.append(f"{path} returned {response.status_code}: {response.text[:200]}")
+
+        for requests in plan:
+            await asyncio.gather(*(send(path, body) for path, body in requests))
+
+    return {
+        "rounds": len(plan),
+        "requests": sum(len(requests) for requests in plan),
+        "failures": failures,
+        "endpoints": {
+            path: {"first_ms": round(times[0] * 1000, 2), "last_ms": round(times[-1] * 1000, 2)}
+            for path, times in latencies.items()
+        }
+    }
+
+
+class Readiness:
+    """Warmup progress and the readiness verdict for /readyz"""
+
+    def __init__(self, required_models: List[str]):
+        self.required_models = required_models
+        self.warmup: Dict[str, Any] = {"status": "pending"}
+        self._started: Optional[float] = None
+        self._attempt = 1
+
+    def start_warmup(self, attempt: int = 1) -> None:
+        self._started = time.perf_counter()
+        self._attempt = attempt
+        self.warmup = {"status": "running", "attempt": attempt}
+
+    def finish_warmup(self, report: Dict[str, Any]) -> None:
+        status = "failed" if report["failures"] else "done"
+        self.warmup = {"status": status, "attempt": self._attempt, "seconds": self._elapsed(), **report}
+
+    def fail_warmup(self, error: str) -> None:
+        self.warmup = {"status": "failed", "attempt": self._attempt, "seconds": self._elapsed(), "error": error}
+
+    def skip_warmup(self) -> None:
+        self.warmup = {"status": "disabled"}
+
+    def _elapsed(self) -> float:
+        return round(time.perf_counter() - self._started, 3) if self._started is not None else 0.0
+
+    def check(self, missing_models: List[str]) -> Tuple[bool, List[str]]:
+        """Ready flag and the reasons it is not, given the required models that are unavailable"""
+        reasons = []
+        if self.warmup["status"] not in ("done", "disabled"):
+            reasons.append(f"warmup {self.warmup['status']}")
+        if missing_models:
+            reasons.append(f"required models unavailable: {missing_models}")
+        return not reasons, reasons
@@ -1,6 +1,7 @@
 // File: src/app/api/ai/chat/route.ts
 import { NextRequest, NextResponse } from "next/server";
 import { askGroq } from "@/lib/groq";
+import { mlResponseHeaders } from "@/lib/ml-api";
 
 export const runtime = "nodejs";
 export const dynamic = "force-dynamic";
@@ -23,8 +24,9 @@ interface ChatResponse {
   models: MLPredictions;
 }
 
-// Helper function to call FastAPI endpoints
-async function callMLEndpoint(endpoint: string, data: any): Promise<any> {
+// Helper function to call FastAPI endpoints; headers are the ML response
+// headers worth passing through (Server-Timing, X-Model-Version)
+async function callMLEndpoint(endpoint: string, data: any): Promise<{ data: any; headers: Record<string, string> } | null> {
   const fastApiUrl = process.env.FASTAPI_URL || "http://localhost:8000";
   
   try {
@@ -41,7 +43,7 @@ async function callMLEndpoint(endpoint: string, data: any): Promise<any> {
       return null;
     }
 
-    return await response.json();
+    return { data: await response.json(), headers: mlResponseHeaders(response) };
   } catch (error) {
     console.warn(`ML endpoint ${endpoint} failed:`, error);
     return null;
@@ -101,72 +103,36 @@ export async function POST(req: NextRequest): Promise<NextResponse<ChatResponse
     // 4. Extract financial data for ML predictions
     const financialData = extractFinancialData(userContext);
 
-    // 5. Call ML endpoints to get predictions
-    const mlPredictions: MLPredictions = {};
-
+    // 5. Get all ML predictions in one call (features are built once server-side)
     console.log("📊 Fetching ML predictions...");
 
-    // Get investment risk prediction
-    mlPredictions.investment = await callMLEndpoint('/predict/investments', {
-      age: financialData.age,
-      income: financialData.income,
-      savings: financialData.savings,
-      debt: financialData.debt,
-      investment_amount: financialData.investment_amount,
-      employment_years: financialData.employment_years,
-      credit_score: financialData.credit_score
-    });
-
-    // Get affordability prediction
-    mlPredictions.affordability = await callMLEndpoint('/predict/affordability', {
-      age: financialData.age,
-      income: financialData.income,
-      expenses: financialData.expenses,
-      savings: financialData.savings,
-      debt: financialData.debt,
-      credit_score: financialData.credit_score,
-      num_dependents: financialData.num_dependents,
-      property_value: financialData.property_value
-    });
-
-    // Get financial health score
-    mlPredictions.score = await callMLEndpoint('/predict/score', {
-      age: financialData.age,
-      income: financialData.income,
-      expenses: financialData.expenses,
-      savings: financialData.savings,
-      debt: financialData.debt,
-      credit_score: financialData.credit_score,
-      investment_amount: financialData.investment_amount
-    });
-
-    // Get scenario planning
-    mlPredictions.scenario = await callMLEndpoint('/predict/scenario', {
-      age: financialData.age,
-      income: financialData.income,
-      savings: financialData.savings,
-      debt: financialData.debt,
-      credit_score: financialData.credit_score
-    });
+    const mlResult = await callMLEndpoint('/predict/all', financialData);
+    const allPredictions = mlResult?.data;
+    const mlPredictions: MLPredictions = {
+      investment: allPredictions?.investment_risk ?? undefined,
+      affordability: allPredictions?.affordability ?? undefined,
+      score: allPredictions?.financial_health ?? undefined,
+      scenario: allPredictions?.scenario ?? undefined,
+    };
 
     // 6. Build context string from ML predictions
     const mlContext = [];
 
-    if (mlPredictions.score?.prediction) {
-      mlContext.push(`Financial Health Score: ${Math.round(mlPredictions.score.prediction)}/100 (${mlPredictions.score.details?.health_level})`);
+    if (mlPredictions.score?.health_score !== undefined) {
+      mlContext.push(`Financial Health Score: ${Math.round(mlPredictions.score.health_score)}/100 (${mlPredictions.score.health_category})`);
     }
 
-    if (mlPredictions.investment?.prediction) {
-      mlContext.push(`Investment Risk Score: ${Math.round(mlPredictions.investment.prediction)}/100 (${mlPredictions.investment.details?.risk_level})`);
+    if (mlPredictions.investment?.risk_score !== undefined) {
+      mlContext.push(`Investment Risk Score: ${Math.round(mlPredictions.investment.risk_score)}/100 (${mlPredictions.investment.risk_category})`);
     }
 
-    if (mlPredictions.affordability?.prediction) {
-      const affordable = Math.round(mlPredictions.affordability.prediction);
+    if (mlPredictions.affordability?.affordability_amount !== undefined) {
+      const affordable = Math.round(mlPredictions.affordability.affordability_amount);
       mlContext.push(`Maximum Affordable Purchase: $${affordable.toLocaleString()}`);
     }
 
-    if (mlPredictions.scenario?.prediction) {
-      mlContext.push(`Recommended Financial Strategy: ${mlPredictions.scenario.prediction} approach`);
+    if (mlPredictions.scenario?.recommended_scenario) {
+      mlContext.push(`Recommended Financial Strategy: ${mlPredictions.scenario.recommended_scenario} approach`);
     }
 
     const contextString = mlContext.length > 0 
@@ -205,7 +171,7 @@ export async function POST(req: NextRequest): Promise<NextResponse<ChatResponse
     return NextResponse.json({
       answer: aiResponse,
       models: mlPredictions
-    }, { status: 200 });
+    }, { status: 200, headers: mlResult?.headers });
 
   } catch (unexpectedError: any) {
     console.error("❌ Unexpected error in chat endpoint:", unexpectedError);
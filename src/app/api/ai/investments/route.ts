@@ -1,5 +1,6 @@
 // File: src/app/api/ai/investments/route.ts
 import { NextRequest, NextResponse } from "next/server";
+import { mlResponseHeaders } from "@/lib/ml-api";
 
 export const runtime = "nodejs";
 export const dynamic = "force-dynamic";
@@ -75,7 +76,7 @@ export async function POST(req: NextRequest) {
       const mlResult = await response.json();
       console.log("✅ Investment prediction successful");
       
-      return NextResponse.json(mlResult, { status: 200 });
+      return NextResponse.json(mlResult, { status: 200, headers: mlResponseHeaders(response) });
 
     } catch (fetchError: any) {
       console.error("❌ FastAPI connection failed:", fetchError);
@@ -39,6 +39,11 @@ import {
 } from "@/components/ui/tooltip";
 import { AIResponseCard } from "../shared/ai-response-card";
 import { ragAPI } from "@/lib/rag-api";
+import {
+  convertUserProfileToMLFormat,
+  predictAffordabilityGrid,
+  type AffordabilityGridResponse,
+} from "@/lib/ml-api";
 import {
   Sparkles,
   Calculator,
@@ -79,6 +84,12 @@ const loanTermOptions = [
   { value: 360, label: "30 Years" },
 ];
 
+const bindingLabels: Record<string, string> = {
+  payment: "Monthly budget",
+  affordability: "Purchase price",
+  savings: "Down payment",
+};
+
 export function AffordabilityAnalyzer() {
   const [result, setResult] = useState<AffordabilityAnalysisOutput | null>(
     null
@@ -90,6 +101,9 @@ export function AffordabilityAnalyzer() {
   const [affordabilityScore, setAffordabilityScore] = useState<number>(0);
   const [ragInsights, setRagInsights] = useState<string | null>(null);
   const [isLoadingRag, setIsLoadingRag] = useState(false);
+  const [loanGrid, setLoanGrid] = useState<AffordabilityGridResponse | null>(
+    null
+  );
 
   const form = useForm<z.infer<typeof formSchema>>({
     resolver: zodResolver(formSchema),
@@ -164,6 +178,7 @@ export function AffordabilityAnalyzer() {
     setError(null);
     setResult(null);
     setRagInsights(null);
+    setLoanGrid(null);
 
     try {
       // Dynamic import to avoid SSR issues
@@ -173,8 +188,8 @@ export function AffordabilityAnalyzer() {
       const response = await analyzeAffordability(values);
       setResult(response);
 
-      // Fetch RAG insights after affordability analysis
-      await getRagInsights(values);
+      // Fetch RAG insights and loan options after affordability analysis
+      await Promise.all([getRagInsights(values), getLoanGrid(values)]);
     } catch (e) {
       setError(e instanceof Error ? e : new Error("An unknown error occurred"));
     } finally {
@@ -182,6 +197,29 @@ export function AffordabilityAnalyzer() {
     }
   }
 
+  // Every loan term at the chosen rate and down payment in one ML call,
+  // instead of recomputing the EMI for each term on the client
+  const getLoanGrid = async (values: z.infer<typeof formSchema>) => {
+    try {
+      const grid = await predictAffordabilityGrid({
+        profile: convertUserProfileToMLFormat({
+          annual_income: values.annualIncome,
+          monthly_expenses: values.monthlyExpenses,
+          savings: values.downPayment,
+        }),
+        rates: [values.interestRate / 100],
+        terms: loanTermOptions.map((option) => option.value),
+        down_payment_fractions: [
+          Math.min(values.downPayment / values.purchaseCost, 0.95),
+        ],
+      });
+      setLoanGrid(grid);
+    } catch (e) {
+      console.error("Failed to fetch loan options:", e);
+      setLoanGrid(null);
+    }
+  };
+
   const getRagInsights = async (values: z.infer<typeof formSchema>) => {
     setIsLoadingRag(true);
     try {
@@ -634,6 +672,87 @@ export function AffordabilityAnalyzer() {
           )}
         </AnimatePresence>
 
+        {/* Loan options across terms from the ML affordability grid */}
+        <AnimatePresence>
+          {loanGrid && (
+            <motion.div
+              initial={{ opacity: 0, y: 20 }}
+              animate={{ opacity: 1, y: 0 }}
+              exit={{ opacity: 0, y: -20 }}
+              transition={{ duration: 0.3 }}
+            >
+              <Card className="w-full max-w-5xl mx-auto shadow-lg">
+                <CardHeader>
+                  <CardTitle className="font-headline flex items-center gap-2">
+                    <Clock className="w-5 h-5 text-primary" />
+                    Loan Options by Term
+                  </CardTitle>
+                  <CardDescription>
+                    The largest loan you can carry at{" "}
+                    {(loanGrid.rates[0] * 100).toFixed(2)}% for each term,
+                    and what limits it
+                  </CardDescription>
+                </CardHeader>
+                <CardContent>
+                  <div className="overflow-x-auto">
+                    <table className="w-full text-sm">
+                      <thead>
+                        <tr className="text-left text-muted-foreground border-b">
+                          <th className="py-2 pr-4 font-medium">Term</th>
+                          <th className="py-2 pr-4 font-medium">Max loan</th>
+                          <th className="py-2 pr-4 font-medium">Monthly EMI</th>
+                          <th className="py-2 pr-4 font-medium">Total interest</th>
+                          <th className="py-2 font-medium">Limited by</th>
+                        </tr>
+                      </thead>
+                      <tbody>
+                        {loanGrid.terms.map((term, j) => (
+                          <tr key={term} className="border-b last:border-0">
+                            <td className="py-2 pr-4">
+                              {loanTermOptions.find((o) => o.value === term)
+                                ?.label ?? `${term} months`}
+                            </td>
+                            <td className="py-2 pr-4 font-semibold">
+                              ₹
+                              {loanGrid.max_principal[0][j][0].toLocaleString(
+                                "en-IN",
+                                { maximumFractionDigits: 0 }
+                              )}
+                            </td>
+                            <td className="py-2 pr-4">
+                              ₹
+                              {loanGrid.monthly_payment[0][j][0].toLocaleString(
+                                "en-IN",
+                                { maximumFractionDigits: 0 }
+                              )}
+                            </td>
+                            <td className="py-2 pr-4">
+                              ₹
+                              {loanGrid.total_interest[0][j][0].toLocaleString(
+                                "en-IN",
+                                { maximumFractionDigits: 0 }
+                              )}
+                            </td>
+                            <td className="py-2">
+                              <Badge variant="outline" className="text-xs">
+                                {bindingLabels[
+                                  loanGrid.constraints[
+                                    loanGrid.binding[0][j][0]
+                                  ]
+                                ]}
+                              </Badge>
+                            </td>
+                          </tr>
+                        ))}
+                      </tbody>
+                    </table>
+                  </div>
+                </CardContent>
+              </Card>
+            </motion.div>
+          )}
+        </AnimatePresence>
+
         {/* RAG Purchase Insights */}
         <AnimatePresence>
           {(ragInsights || isLoadingRag) && (
@@ -5,7 +5,8 @@ import { z } from 'zod';
 import { useForm } from 'react-hook-form';
 import { zodResolver } from '@hookform/resolvers/zod';
 import type { SimulateFinancialScenarioOutput } from '@/ai/flows/simulate-financial-scenarios';
-import { mockCurrentFinancialSituation } from '@/lib/mock-data';
+import { mockCurrentFinancialSituation, mockFinancialProfile } from '@/lib/mock-data';
+import { predictSweep, type SweepResponse } from '@/lib/ml-api';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
 import { Button } from '@/components/ui/button';
 import { Form, FormControl, FormDescription, FormField, FormItem, FormLabel, FormMessage } from '@/components/ui/form';
@@ -17,8 +18,12 @@ const formSchema = z.object({
   scenarioDescription: z.string().min(20, 'Please provide a detailed description of the scenario.'),
 });
 
+// Monthly expenses the what-if sweep covers, scored in one /predict/sweep call
+const expenseSweep = { field: 'expenses' as const, start: 2000, stop: 8000, steps: 7 };
+
 export function ScenarioSimulator() {
   const [result, setResult] = useState<SimulateFinancialScenarioOutput | null>(null);
+  const [sweep, setSweep] = useState<SweepResponse | null>(null);
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState<Error | null>(null);
 
@@ -33,6 +38,7 @@ export function ScenarioSimulator() {
     setIsLoading(true);
     setError(null);
     setResult(null);
+    setSweep(null);
 
     try {
       // Dynamic import to avoid SSR issues
@@ -42,6 +48,9 @@ export function ScenarioSimulator() {
         currentFinancialSituation: mockCurrentFinancialSituation,
       });
       setResult(response);
+      predictSweep({ profile: mockFinancialProfile, axes: [expenseSweep], models: ['financial-health'] })
+        .then(setSweep)
+        .catch((e) => console.error('Failed to fetch expense sweep:', e));
     } catch (e) {
       setError(e instanceof Error ? e : new Error('An unknown error occurred'));
     } finally {
@@ -101,6 +110,24 @@ export function ScenarioSimulator() {
                 { key: 'alternativeSuggestions', label: 'Alternative Suggestions', type: 'string', icon: 'rationale' },
               ]}
             />
+        )}
+        {result && sweep?.surfaces.financial_health && (
+          <Card className="mt-8">
+            <CardHeader>
+              <CardTitle className="font-headline">What If Your Expenses Change?</CardTitle>
+              <CardDescription>Financial health score at different monthly expenses</CardDescription>
+            </CardHeader>
+            <CardContent className="space-y-2">
+              {sweep.axes[0].values.map((expenses, i) => (
+                <div key={expenses} className="flex justify-between text-sm">
+                  <span className="text-muted-foreground">${expenses.toLocaleString()} / month</span>
+                  <span className="font-semibold">
+                    {(sweep.surfaces.financial_health!.health_score as number[])[i].toFixed(1)}
+                  </span>
+                </div>
+              ))}
+            </CardContent>
+          </Card>
         )}
          {!isLoading && !error && !result && (
             <Card className="h-full flex items-center justify-center">
@@ -46,6 +46,137 @@ export interface ScenarioResponse {
   rationale: string;
 }
 
+export interface AllPredictionsResponse {
+  investment_risk: InvestmentRiskResponse | null;
+  affordability: AffordabilityResponse | null;
+  financial_health: FinancialHealthResponse | null;
+  scenario: ScenarioResponse | null;
+  unavailable_models: string[];
+}
+
+export interface SweepAxis {
+  field: keyof FinancialProfile;
+  start: number;
+  stop: number;
+  steps: number;
+}
+
+export interface SweepRequest {
+  profile: FinancialProfile;
+  axes: SweepAxis[];
+  models?: Array<'investment-risk' | 'affordability' | 'financial-health' | 'scenario'>;
+}
+
+// Response fields as grids: one nesting level per axis
+type Surface<T> = { [K in keyof T]: T[K][] | T[K][][] };
+
+export interface SweepResponse {
+  shape: number[];
+  axes: { field: keyof FinancialProfile; values: number[] }[];
+  surfaces: {
+    investment_risk?: Surface<InvestmentRiskResponse>;
+    affordability?: Surface<AffordabilityResponse>;
+    financial_health?: Surface<FinancialHealthResponse>;
+    scenario?: Surface<ScenarioResponse>;
+  };
+  unavailable_models: string[];
+}
+
+export interface AffordabilityGridRequest {
+  profile: FinancialProfile;
+  // Annual fractions, e.g. 0.085 for 8.5%
+  rates?: number[];
+  // Months
+  terms?: number[];
+  down_payment_fractions?: number[];
+  max_expense_ratio?: number;
+}
+
+// Indexed [rate][term][down payment]
+type LoanGrid = number[][][];
+
+export interface AffordabilityGridResponse {
+  affordability_amount: number;
+  monthly_payment_budget: number;
+  rates: number[];
+  terms: number[];
+  down_payment_fractions: number[];
+  max_principal: LoanGrid;
+  monthly_payment: LoanGrid;
+  max_price: LoanGrid;
+  down_payment: LoanGrid;
+  total_interest: LoanGrid;
+  // Index into constraints of the limit on each cell's principal
+  binding: LoanGrid;
+  constraints: Array<'payment' | 'affordability' | 'savings'>;
+}
+
+export type ScenarioCategory = 'conservative' | 'low_risk' | 'moderate_risk' | 'high_risk';
+
+export interface ProjectionEconomy {
+  inflation_mean?: number;
+  inflation_volatility?: number;
+  wage_growth?: number;
+  shock_probability?: number;
+  shock_severity?: number;
+  cash_rate?: number;
+  debt_rate?: number;
+  debt_paydown_share?: number;
+}
+
+export interface ProjectionStrategy {
+  invest_share?: number;
+  mean_return?: number;
+  volatility?: number;
+}
+
+export interface ProjectionRequest {
+  profile: FinancialProfile;
+  years?: number;
+  paths?: number;
+  seed?: number;
+  real?: boolean;
+  percentiles?: number[];
+  scenarios?: ScenarioCategory[];
+  economy?: ProjectionEconomy;
+  strategies?: Partial<Record<ScenarioCategory, ProjectionStrategy>>;
+}
+
+// Percentile key ('p5', 'p50', ...) -> one value per year, year 0 first
+type PercentileBands = Record<string, number[]>;
+
+export interface ProjectionResponse {
+  years: number[];
+  paths: number;
+  seed: number;
+  real: boolean;
+  percentiles: number[];
+  scenarios: Partial<Record<ScenarioCategory, {
+    savings: PercentileBands;
+    investments: PercentileBands;
+    debt: PercentileBands;
+    net_worth: PercentileBands;
+  }>>;
+  recommended_scenario: ScenarioCategory | null;
+  economy: Required<ProjectionEconomy>;
+  strategies: Partial<Record<ScenarioCategory, Required<ProjectionStrategy>>>;
+}
+
+export interface Explanation {
+  output: number;
+  base_value: number;
+  // Largest absolute contribution first
+  contributions: Record<string, number>;
+  explained_class: string | null;
+}
+
+export interface ExplainResponse {
+  model: string;
+  method: 'exact' | 'approx';
+  output: string;
+  explanations: Explanation[];
+}
+
 export interface MLApiError {
   detail: string;
   status_code: number;
@@ -103,6 +234,11 @@ export async function predictAffordability(profile: FinancialProfile): Promise<A
   return apiCall('/predict/affordability', profile);
 }
 
+// Loan affordability grid - every rate x term x down payment in one call
+export async function predictAffordabilityGrid(request: AffordabilityGridRequest): Promise<AffordabilityGridResponse> {
+  return apiCall('/predict/affordability/grid', request);
+}
+
 // Financial health scoring
 export async function predictFinancialHealth(profile: FinancialProfile): Promise<FinancialHealthResponse> {
   return apiCall('/predict/financial-health', profile);
@@ -113,6 +249,30 @@ export async function predictScenario(profile: FinancialProfile): Promise<Scenar
   return apiCall('/predict/scenario', profile);
 }
 
+// All models in one call - features are built once on the server
+export async function predictAll(profile: FinancialProfile): Promise<AllPredictionsResponse> {
+  return apiCall('/predict/all', profile);
+}
+
+// What-if sweep - one or two fields varied over a grid, scored in one call
+export async function predictSweep(request: SweepRequest): Promise<SweepResponse> {
+  return apiCall('/predict/sweep', request);
+}
+
+// Monte Carlo projection - percentile bands per year for each scenario category
+export async function predictProjection(request: ProjectionRequest): Promise<ProjectionResponse> {
+  return apiCall('/predict/projection', request);
+}
+
+// Per-feature contributions behind a model's predictions
+export async function explainPredictions(
+  model: 'investment-risk' | 'affordability' | 'financial-health' | 'scenario',
+  profiles: FinancialProfile[],
+  method: 'exact' | 'approx' = 'exact'
+): Promise<ExplainResponse> {
+  return apiCall(`/explain/${model}?method=${method}`, profiles);
+}
+
 // Comprehensive analysis - calls all endpoints
 export async function getComprehensiveAnalysis(profile: FinancialProfile) {
   try {
@@ -157,6 +317,21 @@ export function convertUserProfileToMLFormat(userProfile: any): FinancialProfile
   };
 }
 
+// ML server response headers worth passing through API routes:
+// per-stage latency (Server-Timing) and the model versions that answered
+export const ML_PASSTHROUGH_HEADERS = ['server-timing', 'x-model-version'];
+
+export function mlResponseHeaders(response: Response): Record<string, string> {
+  const headers: Record<string, string> = {};
+  for (const name of ML_PASSTHROUGH_HEADERS) {
+    const value = response.headers.get(name);
+    if (value) {
+      headers[name] = value;
+    }
+  }
+  return headers;
+}
+
 // Development utilities
 export const mlApi = {
   health: checkMLServerHealth,
@@ -164,6 +339,7 @@ export const mlApi = {
   affordability: predictAffordability,
   financialHealth: predictFinancialHealth,
   scenario: predictScenario,
+  all: predictAll,
   comprehensive: getComprehensiveAnalysis,
   convertProfile: convertUserProfileToMLFormat,
 };
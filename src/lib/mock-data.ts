@@ -1,4 +1,5 @@
 import type { Transaction, Investment, NetWorthDataPoint } from './types';
+import type { FinancialProfile } from './ml-api';
 
 export const mockTransactions: Transaction[] = [
   { id: '1', date: '2024-07-26', description: 'Salary Deposit', amount: 5000, category: 'Income' },
@@ -37,3 +38,17 @@ export const mockCurrentFinancialSituation = `
     - Credit Card Debt: $2,000
     - Student Loans: $15,000
 `;
+
+// mockCurrentFinancialSituation as an ML profile
+export const mockFinancialProfile: FinancialProfile = {
+  age: 32,
+  income: 120000,
+  expenses: 4000,
+  savings: 25000,
+  debt: 17000,
+  employment_years: 8,
+  credit_score: 720,
+  num_dependents: 0,
+  investment_amount: 10250,
+  property_value: 0,
+};